@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Backfill the hourly sentiment rollups from the fact tables.
+
+Run once after applying the migration that creates ``sentiment_rollups``, or
+later to rebuild a range of hours (e.g. after deleting or rescoring
+articles). Rows in the range are replaced in a single transaction; prefer
+past ranges, or pause the sentiment workers while rebuilding the current hour.
+
+Usage:
+    python scripts/backfill_sentiment_rollups.py
+    python scripts/backfill_sentiment_rollups.py --start 2024-01-01 --end 2024-02-01
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timezone
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.common.app.db.rollups import backfill_rollups
+from services.common.app.db.session import create_db_session
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO date or datetime; naive values are taken as UTC."""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def main():
+    """Rebuild the rollups and report the number of rows written."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--start", type=parse_timestamp, help="First hour (inclusive)")
+    parser.add_argument("--end", type=parse_timestamp, help="Last hour (exclusive)")
+    args = parser.parse_args()
+
+    session = create_db_session()
+    try:
+        written = backfill_rollups(session, start=args.start, end=args.end)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"❌ Backfill failed: {e}")
+        sys.exit(1)
+    finally:
+        session.close()
+
+    print(f"✅ Wrote {written} sentiment rollup rows")
+
+
+if __name__ == "__main__":
+    main()
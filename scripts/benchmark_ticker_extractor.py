@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark the ticker extractor against the previous substring scan.
+
+The previous extractor tested every company name with a substring ``in`` on
+each text and ran five uncompiled regexes, so its cost grew with the size of
+the name map. The current one matches names with a token automaton built once
+(``TickerMatcher``). This script times both on the same texts while the map
+grows with synthetic company names, up to roughly the size of the US listing
+universe.
+
+Usage:
+    python scripts/benchmark_ticker_extractor.py
+    python scripts/benchmark_ticker_extractor.py --sizes 100 1000 8000 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.data_ingestor.app.tasks import COMPANY_TICKER_MAP, TickerExtractor
+
+# Headlines and summaries with zero, one or several company mentions
+SAMPLE_TEXTS = [
+    "Apple reported record quarterly revenue, beating analyst expectations.",
+    "Tesla shares plunged after the company missed delivery targets.",
+    "The Federal Reserve left interest rates unchanged at its meeting.",
+    "Microsoft and Nvidia announced a partnership on data center chips.",
+    "Oil prices were little changed in early trading on Tuesday as traders "
+    "weighed supply data against signs of slowing demand in Asia.",
+    "Shares of XYZ (XYZ) rose 4% after the company raised its guidance.",
+    "Retail sales fell unexpectedly, raising fears of a consumer slowdown.",
+    "Goldman Sachs and Morgan Stanley led a rally in bank stocks.",
+] * 25
+
+LEGACY_TICKER_PATTERNS = [
+    r"\$([A-Z]{1,5})",
+    r"\b([A-Z]{2,5})\b(?=\s+(?:stock|shares|ticker|symbol))",
+    r"\(([A-Z]{2,5})\)",
+    r"NYSE:\s*([A-Z]{2,5})",
+    r"NASDAQ:\s*([A-Z]{2,5})",
+]
+
+
+def legacy_extract_ticker(text: str, company_map: dict[str, str]) -> str | None:
+    """The previous extraction algorithm, kept here for comparison."""
+    text_lower = text.lower()
+    for company_name, ticker in company_map.items():
+        if company_name in text_lower:
+            return ticker
+    for pattern in LEGACY_TICKER_PATTERNS:
+        for match in re.findall(pattern, text, re.IGNORECASE):
+            ticker = match.upper()
+            if ticker not in set(TickerExtractor.FALSE_POSITIVES):
+                return ticker
+    return None
+
+
+def synthetic_company_map(size: int, seed: int = 42) -> dict[str, str]:
+    """Return ``COMPANY_TICKER_MAP`` padded with made-up names up to ``size``."""
+    rng = random.Random(seed)
+    suffixes = ["holdings", "group", "corp", "systems", "therapeutics", "energy"]
+    company_map = dict(COMPANY_TICKER_MAP)
+    while len(company_map) < size:
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9)))
+        name = f"{word} {rng.choice(suffixes)}" if rng.random() < 0.5 else word
+        company_map[name] = "".join(rng.choices(string.ascii_uppercase, k=4))
+    return company_map
+
+
+def time_per_text(extract, texts: list[str], repeat: int) -> float:
+    """Return the best mean time per text in microseconds over ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for text in texts:
+            extract(text)
+        best = min(best, time.perf_counter() - start_time)
+    return best / len(texts) * 1e6
+
+
+def main():
+    """Time both extractors for every map size and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 1000, 8000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'names':>6} {'build ms':>9} {'legacy us':>10} {'automaton us':>13} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        company_map = synthetic_company_map(size)
+
+        start_time = time.perf_counter()
+        extractor = TickerExtractor(company_map)
+        build_ms = (time.perf_counter() - start_time) * 1e3
+
+        legacy_us = time_per_text(
+            lambda text, names=company_map: legacy_extract_ticker(text, names),
+            SAMPLE_TEXTS,
+            args.repeat,
+        )
+        automaton_us = time_per_text(
+            extractor.extract_tickers_from_text, SAMPLE_TEXTS, args.repeat
+        )
+        print(
+            f"{len(company_map):>6} {build_ms:>9.1f} {legacy_us:>10.1f} "
+            f"{automaton_us:>13.1f} {legacy_us / automaton_us:>7.1f}x"
+        )
+
+    print("The legacy extractor stops at the first ticker; the automaton returns all.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""ONNX backend parity check for the Sentiment Processor.
+
+Exports FinBERT to ONNX (int8 by default), scores a set of financial texts with
+both the torch and onnx backends and fails if labels or scores diverge beyond
+the configured tolerance. Run it after changing the model, the export settings
+or the onnxruntime version, and before enabling SENTIMENT_INFERENCE_BACKEND=onnx.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.sentiment_processor.app.onnx_backend import check_backend_parity
+from services.sentiment_processor.app.worker import FinBERTBatchAnalyzer
+
+# Sample texts covering positive, negative and neutral financial news
+SAMPLE_TEXTS = [
+    "Apple reported record quarterly revenue, beating analyst expectations.",
+    "Tesla shares plunged after the company missed delivery targets.",
+    "The Federal Reserve left interest rates unchanged at its meeting.",
+    "Microsoft raised its full-year guidance on strong cloud demand.",
+    "The bank announced layoffs amid a sharp decline in trading income.",
+    "Oil prices were little changed in early trading on Tuesday.",
+    "Nvidia stock soared as data center sales more than doubled.",
+    "Boeing cut its production forecast following new quality issues.",
+    "The company will hold its annual shareholder meeting in May.",
+    "Amazon's operating margin improved for the third consecutive quarter.",
+    "Retail sales fell unexpectedly, raising fears of a consumer slowdown.",
+    "JPMorgan completed the acquisition as previously announced.",
+]
+
+
+def time_backend(analyzer: FinBERTBatchAnalyzer, texts: list[str]) -> float:
+    """Return throughput in texts per second for one predict_batch call."""
+    start_time = time.perf_counter()
+    analyzer.predict_batch(texts)
+    return len(texts) / (time.perf_counter() - start_time)
+
+
+def main():
+    """Run the parity check and exit non-zero on failure."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--score-tolerance", type=float, default=0.15)
+    parser.add_argument("--min-label-agreement", type=float, default=0.95)
+    parser.add_argument(
+        "--export-only",
+        action="store_true",
+        help="Only export (and quantize) the ONNX model, e.g. at image build time.",
+    )
+    args = parser.parse_args()
+
+    onnx_analyzer = FinBERTBatchAnalyzer(backend="onnx")
+    if onnx_analyzer.model is None:
+        print("❌ ONNX backend failed to load. Is onnxruntime installed?")
+        sys.exit(1)
+    if args.export_only:
+        print(f"✅ ONNX model ready: {onnx_analyzer.model.model_path}")
+        return
+
+    torch_analyzer = FinBERTBatchAnalyzer(backend="torch")
+    if torch_analyzer.model is None:
+        print("❌ Torch backend failed to load.")
+        sys.exit(1)
+
+    report = check_backend_parity(
+        torch_analyzer,
+        onnx_analyzer,
+        SAMPLE_TEXTS,
+        score_tolerance=args.score_tolerance,
+        min_label_agreement=args.min_label_agreement,
+    )
+
+    benchmark_texts = SAMPLE_TEXTS * 20
+    print(f"Texts compared:   {report['texts']}")
+    print(f"Label agreement:  {report['label_agreement']:.1%}")
+    print(f"Max score diff:   {report['max_score_diff']:.4f}")
+    print(f"Label mismatches: {report['label_mismatches']}")
+    print(
+        f"Torch throughput: {time_backend(torch_analyzer, benchmark_texts):.1f} texts/s"
+    )
+    print(f"ONNX throughput:  {time_backend(onnx_analyzer, benchmark_texts):.1f} texts/s")
+
+    if not report["passed"]:
+        print("❌ ONNX backend is NOT within tolerance of the torch backend.")
+        sys.exit(1)
+    print("✅ ONNX backend matches the torch backend within tolerance.")
+
+
+if __name__ == "__main__":
+    main()
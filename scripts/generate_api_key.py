@@ -136,6 +136,57 @@ def create_user_and_api_key(
         session.close()
 
 
+def revoke_api_key(api_key: str) -> bool:
+    """Deactivate an API key and drop it from the API's authentication cache.
+
+    The shared Redis tier (AUTH_CACHE_REDIS_URL) is cleared immediately; API
+    replicas drop their in-process copy within AUTH_CACHE_TTL_SECONDS.
+    Without AUTH_CACHE_REDIS_URL this script cannot reach the API's cache at
+    all, so the key keeps authenticating until its cached entry expires.
+
+    Returns:
+        bool: True if an active key was found and revoked.
+    """
+    key_hash = hash_api_key(api_key)
+    session = create_session()
+    try:
+        api_key_record = (
+            session.query(ApiKey)
+            .filter(ApiKey.key_hash == key_hash)
+            .filter(ApiKey.is_active.is_(True))
+            .first()
+        )
+        if not api_key_record:
+            return False
+
+        api_key_record.is_active = False
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+
+    invalidate_auth_cache(key_hash)
+    return True
+
+
+def invalidate_auth_cache(key_hash: str) -> None:
+    """Clear a revoked key from the shared auth cache, warning where it cannot."""
+    ttl = os.getenv("AUTH_CACHE_TTL_SECONDS", "60")
+    try:
+        from services.signals_api.app.auth_cache import invalidate_api_key
+    except ImportError as e:
+        print(f"⚠️  Could not load the API auth cache ({e}).")
+        print(f"   Running API processes may accept the key for up to {ttl}s.")
+        return
+
+    invalidate_api_key(key_hash)
+    if not os.getenv("AUTH_CACHE_REDIS_URL"):
+        print("⚠️  AUTH_CACHE_REDIS_URL is not set, so the API's in-process cache")
+        print(f"   cannot be cleared; the key may still authenticate for up to {ttl}s.")
+
+
 def get_user_by_email(session, email: str) -> User | None:
     return session.query(User).filter(User.email == email).first()
 
@@ -215,8 +266,17 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--revoke":
+        if revoke_api_key(sys.argv[2]):
+            print("✅ API key revoked")
+        else:
+            print("❌ No active API key found")
+            sys.exit(1)
+        sys.exit(0)
+
     if len(sys.argv) != 2:
         print("Usage: python generate_api_key.py <email>")
+        print("       python generate_api_key.py --revoke <api_key>")
         sys.exit(1)
 
     email = sys.argv[1]
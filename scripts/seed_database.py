@@ -84,12 +84,13 @@ def create_sample_article(article_data, published_offset_hours):
     )
 
 
-def create_sample_sentiment(article_id, sentiment_data):
+def create_sample_sentiment(article, sentiment_data):
     """Create a sample sentiment score for an article."""
     label, score = sentiment_data
 
     return SentimentScore(
-        article_id=article_id,
+        article_id=article.id,
+        published_at=article.published_at,
         model_version="placeholder-v1.0",
         sentiment_score=score,
         sentiment_label=label,
@@ -132,7 +133,7 @@ def seed_database():
         # Create sentiment scores
         print("📊 Creating sentiment scores...")
         for article, sentiment_data in articles:
-            sentiment = create_sample_sentiment(article.id, sentiment_data)
+            sentiment = create_sample_sentiment(article, sentiment_data)
             session.add(sentiment)
 
         session.commit()
@@ -0,0 +1,113 @@
+"""Add composite, partial and covering indexes for the hot query shapes.
+
+Revision ID: 5d9e0f6a2c18
+Revises: c47e2b915d03
+Create Date: 2026-10-17 13:41:05.127664
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d9e0f6a2c18"
+down_revision: str | None = "c47e2b915d03"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Must match the WHERE clause of the sentiment worker's pending-work scans
+PENDING_PREDICATE = sa.text("is_processed IS false AND has_error IS false")
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Indexes are built and dropped CONCURRENTLY, outside a transaction, so
+    ingestion and scoring keep writing to the tables during the upgrade.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_raw_articles_ticker_published_at",
+            "raw_articles",
+            ["ticker", sa.text("published_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_raw_articles_pending",
+            "raw_articles",
+            ["id"],
+            unique=False,
+            postgresql_where=PENDING_PREDICATE,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_sentiment_scores_article_id_covering",
+            "sentiment_scores",
+            ["article_id"],
+            unique=False,
+            postgresql_include=["sentiment_score", "sentiment_label"],
+            postgresql_concurrently=True,
+        )
+
+        # Superseded by the indexes above: a prefix of the composite index, a
+        # boolean index the planner skips, and a subset of the covering index
+        op.drop_index(
+            "ix_raw_articles_ticker",
+            table_name="raw_articles",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_raw_articles_is_processed",
+            table_name="raw_articles",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_sentiment_scores_article_id",
+            table_name="sentiment_scores",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_sentiment_scores_article_id",
+            "sentiment_scores",
+            ["article_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_raw_articles_is_processed",
+            "raw_articles",
+            ["is_processed"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_raw_articles_ticker",
+            "raw_articles",
+            ["ticker"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+        op.drop_index(
+            "ix_sentiment_scores_article_id_covering",
+            table_name="sentiment_scores",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_raw_articles_pending",
+            table_name="raw_articles",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_raw_articles_ticker_published_at",
+            table_name="raw_articles",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,54 @@
+"""Add sentiment_rollups table.
+
+Revision ID: 8a1f3c2d9b47
+Revises: 4e5930ee5acb
+Create Date: 2026-10-17 09:12:40.218311
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a1f3c2d9b47"
+down_revision: str | None = "4e5930ee5acb"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Existing scores are not rolled up here; run
+    ``scripts/backfill_sentiment_rollups.py`` once after upgrading.
+    """
+    op.create_table(
+        "sentiment_rollups",
+        sa.Column("ticker", sa.String(), nullable=False),
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("hour", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("model_version", sa.String(), nullable=False),
+        sa.Column("score_sum", sa.Float(), nullable=False),
+        sa.Column("score_count", sa.Integer(), nullable=False),
+        sa.Column("positive_count", sa.Integer(), nullable=False),
+        sa.Column("negative_count", sa.Integer(), nullable=False),
+        sa.Column("neutral_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("ticker", "source", "hour", "model_version"),
+    )
+    op.create_index(
+        "ix_sentiment_rollups_hour", "sentiment_rollups", ["hour"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sentiment_rollups_hour", table_name="sentiment_rollups")
+    op.drop_table("sentiment_rollups")
@@ -0,0 +1,83 @@
+"""Add article_tickers table.
+
+Revision ID: b3e7f1a9c642
+Revises: a9d2c4e7f813
+Create Date: 2026-10-17 20:41:09.517263
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e7f1a9c642"
+down_revision: str | None = "a9d2c4e7f813"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    ``article_tickers`` is partitioned like ``raw_articles``: one partition
+    per attached article partition, with the same bounds. Existing articles
+    get a row for their single ticker, with weight 1.
+    """
+    op.execute(
+        """
+        CREATE TABLE article_tickers (
+            article_id integer NOT NULL,
+            ticker varchar NOT NULL,
+            published_at timestamptz NOT NULL,
+            weight double precision NOT NULL
+        ) PARTITION BY RANGE (published_at)
+        """
+    )
+    article_partitions = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+                "FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = to_regclass('raw_articles')"
+            )
+        )
+        .all()
+    )
+    for name, bound in article_partitions:
+        suffix = name.removeprefix("raw_articles")
+        op.execute(
+            f"CREATE TABLE article_tickers{suffix} PARTITION OF article_tickers {bound}"
+        )
+
+    # Load before building constraints and indexes, which is much faster
+    op.execute(
+        "INSERT INTO article_tickers (article_id, ticker, published_at, weight) "
+        "SELECT id, ticker, published_at, 1.0 FROM raw_articles "
+        "WHERE ticker IS NOT NULL"
+    )
+
+    op.execute(
+        "ALTER TABLE article_tickers ADD PRIMARY KEY (article_id, ticker, published_at)"
+    )
+    op.execute(
+        "ALTER TABLE article_tickers ADD CONSTRAINT article_tickers_article_fkey "
+        "FOREIGN KEY (article_id, published_at) "
+        "REFERENCES raw_articles (id, published_at)"
+    )
+    op.create_index(
+        "ix_article_tickers_ticker_published_at",
+        "article_tickers",
+        ["ticker", sa.text("published_at DESC"), sa.text("article_id DESC")],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Partitions detached by the maintenance task are left in place.
+    """
+    op.execute("DROP TABLE article_tickers CASCADE")
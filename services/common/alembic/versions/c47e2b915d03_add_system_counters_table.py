@@ -0,0 +1,49 @@
+"""Add system_counters table.
+
+Revision ID: c47e2b915d03
+Revises: 8a1f3c2d9b47
+Create Date: 2026-10-17 11:03:27.540912
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c47e2b915d03"
+down_revision: str | None = "8a1f3c2d9b47"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema and seed the counters from the existing articles."""
+    op.create_table(
+        "system_counters",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.execute(
+        """
+        INSERT INTO system_counters (name, value)
+        SELECT 'total_articles', count(*) FROM raw_articles
+        UNION ALL
+        SELECT 'processed_articles', count(*) FROM raw_articles WHERE is_processed
+        UNION ALL
+        SELECT 'error_articles', count(*) FROM raw_articles WHERE has_error
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("system_counters")
@@ -0,0 +1,41 @@
+"""Add article_urls table.
+
+Revision ID: d72a5c1e9f30
+Revises: b3e7f1a9c642
+Create Date: 2026-10-17 22:05:37.184502
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d72a5c1e9f30"
+down_revision: str | None = "b3e7f1a9c642"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    The partitioned ``raw_articles`` can only keep ``article_url`` unique
+    together with ``published_at``. ``article_urls`` is not partitioned and
+    keeps every URL unique; it is filled with the URLs already stored.
+    """
+    op.create_table(
+        "article_urls",
+        sa.Column("article_url", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("article_url"),
+    )
+    op.execute(
+        "INSERT INTO article_urls (article_url) "
+        "SELECT DISTINCT article_url FROM raw_articles"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("article_urls")
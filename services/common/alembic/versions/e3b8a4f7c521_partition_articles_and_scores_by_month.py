@@ -0,0 +1,283 @@
+"""Partition raw_articles and sentiment_scores by month on published_at.
+
+Revision ID: e3b8a4f7c521
+Revises: 5d9e0f6a2c18
+Create Date: 2026-10-17 15:26:48.903417
+
+"""
+
+from collections.abc import Sequence
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b8a4f7c521"
+down_revision: str | None = "5d9e0f6a2c18"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Months of partitions created past the current month; later months are
+# created by the partition maintenance task
+MONTHS_AHEAD = 3
+# Older articles than this go to the DEFAULT partition instead of one
+# partition per month
+MAX_MONTHS_BACK = 120
+
+ARTICLE_COLUMNS = (
+    "id, source, ticker, article_url, headline, article_text, published_at, "
+    "is_processed, has_error, created_at, updated_at"
+)
+SCORE_COLUMNS = (
+    "id, article_id, model_version, sentiment_score, sentiment_label, processed_at"
+)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _create_partitions(table: str, first_month: datetime, last_month: datetime) -> None:
+    month = first_month
+    while month <= last_month:
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Both tables are rebuilt: rows are copied into the partitioned tables and
+    the old tables dropped, under exclusive locks. Stop the ingestor and the
+    sentiment workers while this runs.
+
+    On a partitioned table every unique constraint includes the partition
+    key, so the primary keys become (id, published_at) and the article URL is
+    unique per (article_url, published_at). The ingestor still checks URLs
+    before inserting.
+    """
+    now = datetime.now(timezone.utc)
+    current_month = datetime(now.year, now.month, 1, tzinfo=timezone.utc)
+
+    # Keep the id sequences alive when the old tables are dropped
+    op.execute("ALTER SEQUENCE raw_articles_id_seq OWNED BY NONE")
+    op.execute("ALTER SEQUENCE sentiment_scores_id_seq OWNED BY NONE")
+    op.rename_table("sentiment_scores", "sentiment_scores_unpartitioned")
+    op.rename_table("raw_articles", "raw_articles_unpartitioned")
+
+    op.execute(
+        """
+        CREATE TABLE raw_articles (
+            id integer NOT NULL DEFAULT nextval('raw_articles_id_seq'),
+            source varchar NOT NULL,
+            ticker varchar,
+            article_url varchar NOT NULL,
+            headline text NOT NULL,
+            article_text text NOT NULL,
+            published_at timestamptz NOT NULL,
+            is_processed boolean NOT NULL,
+            has_error boolean NOT NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            updated_at timestamptz NOT NULL DEFAULT now()
+        ) PARTITION BY RANGE (published_at)
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE sentiment_scores (
+            id integer NOT NULL DEFAULT nextval('sentiment_scores_id_seq'),
+            article_id integer NOT NULL,
+            published_at timestamptz NOT NULL,
+            model_version varchar NOT NULL,
+            sentiment_score double precision NOT NULL,
+            sentiment_label varchar NOT NULL,
+            processed_at timestamptz NOT NULL DEFAULT now()
+        ) PARTITION BY RANGE (published_at)
+        """
+    )
+
+    oldest = (
+        op.get_bind()
+        .execute(sa.text("SELECT min(published_at) FROM raw_articles_unpartitioned"))
+        .scalar()
+    )
+    first_month = current_month
+    if oldest is not None:
+        oldest = oldest.astimezone(timezone.utc)
+        first_month = max(
+            min(
+                datetime(oldest.year, oldest.month, 1, tzinfo=timezone.utc), current_month
+            ),
+            _add_months(current_month, -MAX_MONTHS_BACK),
+        )
+    last_month = _add_months(current_month, MONTHS_AHEAD)
+    for table in ("raw_articles", "sentiment_scores"):
+        _create_partitions(table, first_month, last_month)
+
+    # Load before building constraints and indexes, which is much faster
+    op.execute(
+        f"INSERT INTO raw_articles ({ARTICLE_COLUMNS}) "
+        f"SELECT {ARTICLE_COLUMNS} FROM raw_articles_unpartitioned"
+    )
+    # Scores take the partition key from their article
+    op.execute(
+        f"INSERT INTO sentiment_scores ({SCORE_COLUMNS}, published_at) "
+        "SELECT s.id, s.article_id, s.model_version, s.sentiment_score, "
+        "s.sentiment_label, s.processed_at, a.published_at "
+        "FROM sentiment_scores_unpartitioned s "
+        "JOIN raw_articles_unpartitioned a ON a.id = s.article_id"
+    )
+    op.drop_table("sentiment_scores_unpartitioned")
+    op.drop_table("raw_articles_unpartitioned")
+
+    op.execute("ALTER TABLE raw_articles ADD PRIMARY KEY (id, published_at)")
+    op.execute("ALTER TABLE sentiment_scores ADD PRIMARY KEY (id, published_at)")
+    op.execute(
+        "ALTER TABLE sentiment_scores ADD CONSTRAINT sentiment_scores_article_fkey "
+        "FOREIGN KEY (article_id, published_at) "
+        "REFERENCES raw_articles (id, published_at)"
+    )
+    op.execute("ALTER SEQUENCE raw_articles_id_seq OWNED BY raw_articles.id")
+    op.execute("ALTER SEQUENCE sentiment_scores_id_seq OWNED BY sentiment_scores.id")
+
+    op.create_index(
+        "ix_raw_articles_article_url",
+        "raw_articles",
+        ["article_url", "published_at"],
+        unique=True,
+    )
+    op.create_index("ix_raw_articles_source", "raw_articles", ["source"])
+    op.create_index("ix_raw_articles_published_at", "raw_articles", ["published_at"])
+    op.create_index(
+        "ix_raw_articles_ticker_published_at",
+        "raw_articles",
+        ["ticker", sa.text("published_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_raw_articles_pending",
+        "raw_articles",
+        ["id"],
+        postgresql_where=sa.text("is_processed IS false AND has_error IS false"),
+    )
+    op.create_index(
+        "ix_sentiment_scores_article_id_covering",
+        "sentiment_scores",
+        ["article_id"],
+        postgresql_include=["sentiment_score", "sentiment_label"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Copies the attached partitions back into plain tables. Partitions
+    detached by the maintenance task are left in place and not copied.
+    """
+    op.execute("ALTER SEQUENCE raw_articles_id_seq OWNED BY NONE")
+    op.execute("ALTER SEQUENCE sentiment_scores_id_seq OWNED BY NONE")
+    op.rename_table("sentiment_scores", "sentiment_scores_partitioned")
+    op.rename_table("raw_articles", "raw_articles_partitioned")
+
+    op.create_table(
+        "raw_articles",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('raw_articles_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("ticker", sa.String(), nullable=True),
+        sa.Column("article_url", sa.String(), nullable=False),
+        sa.Column("headline", sa.Text(), nullable=False),
+        sa.Column("article_text", sa.Text(), nullable=False),
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("is_processed", sa.Boolean(), nullable=False),
+        sa.Column("has_error", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.create_table(
+        "sentiment_scores",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('sentiment_scores_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("model_version", sa.String(), nullable=False),
+        sa.Column("sentiment_score", sa.Float(), nullable=False),
+        sa.Column("sentiment_label", sa.String(), nullable=False),
+        sa.Column(
+            "processed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+    op.execute(
+        f"INSERT INTO raw_articles ({ARTICLE_COLUMNS}) "
+        f"SELECT {ARTICLE_COLUMNS} FROM raw_articles_partitioned"
+    )
+    op.execute(
+        f"INSERT INTO sentiment_scores ({SCORE_COLUMNS}) "
+        f"SELECT {SCORE_COLUMNS} FROM sentiment_scores_partitioned"
+    )
+    op.execute("DROP TABLE sentiment_scores_partitioned CASCADE")
+    op.execute("DROP TABLE raw_articles_partitioned CASCADE")
+
+    op.create_primary_key("raw_articles_pkey", "raw_articles", ["id"])
+    op.create_primary_key("sentiment_scores_pkey", "sentiment_scores", ["id"])
+    op.create_foreign_key(
+        "sentiment_scores_article_id_fkey",
+        "sentiment_scores",
+        "raw_articles",
+        ["article_id"],
+        ["id"],
+    )
+    op.execute("ALTER SEQUENCE raw_articles_id_seq OWNED BY raw_articles.id")
+    op.execute("ALTER SEQUENCE sentiment_scores_id_seq OWNED BY sentiment_scores.id")
+
+    op.create_index("ix_raw_articles_id", "raw_articles", ["id"])
+    op.create_index(
+        "ix_raw_articles_article_url", "raw_articles", ["article_url"], unique=True
+    )
+    op.create_index("ix_raw_articles_source", "raw_articles", ["source"])
+    op.create_index("ix_raw_articles_published_at", "raw_articles", ["published_at"])
+    op.create_index(
+        "ix_raw_articles_ticker_published_at",
+        "raw_articles",
+        ["ticker", sa.text("published_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_raw_articles_pending",
+        "raw_articles",
+        ["id"],
+        postgresql_where=sa.text("is_processed IS false AND has_error IS false"),
+    )
+    op.create_index("ix_sentiment_scores_id", "sentiment_scores", ["id"])
+    op.create_index(
+        "ix_sentiment_scores_article_id_covering",
+        "sentiment_scores",
+        ["article_id"],
+        postgresql_include=["sentiment_score", "sentiment_label"],
+    )
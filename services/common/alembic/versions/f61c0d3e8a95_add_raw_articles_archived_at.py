@@ -0,0 +1,34 @@
+"""Add raw_articles.archived_at.
+
+Revision ID: f61c0d3e8a95
+Revises: e3b8a4f7c521
+Create Date: 2026-10-17 17:08:52.661034
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f61c0d3e8a95"
+down_revision: str | None = "e3b8a4f7c521"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "raw_articles",
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Articles archived to Parquet keep their cleared headline and text.
+    """
+    op.drop_column("raw_articles", "archived_at")
@@ -0,0 +1,353 @@
+"""Cold-storage archival of old articles to Parquet.
+
+Articles published before the archive horizon (``ARCHIVE_AFTER_DAYS`` ago,
+rounded down to a month start) are written, joined with their tickers and
+scores, to Parquet files partitioned by month under ``ARCHIVE_URI``::
+
+    {ARCHIVE_URI}/signals/month=2024-01/part-20240501T031500.parquet
+
+``ARCHIVE_URI`` is anything ``pyarrow.fs`` understands, e.g. a local path,
+``file:///...`` or ``s3://bucket/prefix``; leaving it empty disables archival.
+PostgreSQL keeps slim rows: ``headline`` and ``article_text`` are cleared and
+``archived_at`` is set, while IDs, tickers, timestamps and the scores stay, so
+rollups and aggregates are unaffected. Signals readers merge
+``iter_archived_signals`` into their results for the months of a request
+that lie before the horizon.
+"""
+
+import os
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta, timezone
+from typing import NamedTuple
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.sql import func
+
+from services.common.app.db.models import (
+    ARTICLE_SCORE_JOIN,
+    ARTICLE_TICKER_JOIN,
+    ArticleTicker,
+    RawArticle,
+    SentimentScore,
+)
+from services.common.app.db.partitions import add_months, month_start
+from services.common.app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+
+    ARCHIVE_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"pyarrow not available: {e}. Article archival is disabled.")
+    ARCHIVE_AVAILABLE = False
+
+ARCHIVE_URI = os.getenv("ARCHIVE_URI", "")
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "10000"))
+
+ARCHIVE_COLUMNS = [
+    "id",
+    "source",
+    "ticker",
+    "article_url",
+    "headline",
+    "article_text",
+    "published_at",
+    "has_error",
+    "model_version",
+    "sentiment_score",
+    "sentiment_label",
+]
+
+
+class ArchivedSignal(NamedTuple):
+    """A signals row read back from the archive, shaped like a database row."""
+
+    id: int
+    ticker: str | None
+    article_url: str
+    headline: str
+    published_at: datetime
+    sentiment_score: float
+    sentiment_label: str
+
+
+def archive_schema() -> "pa.Schema":
+    """Arrow schema of the archived Parquet files."""
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("source", pa.string()),
+            ("ticker", pa.string()),
+            ("article_url", pa.string()),
+            ("headline", pa.string()),
+            ("article_text", pa.string()),
+            ("published_at", pa.timestamp("us", tz="UTC")),
+            ("has_error", pa.bool_()),
+            ("model_version", pa.string()),
+            ("sentiment_score", pa.float64()),
+            ("sentiment_label", pa.string()),
+        ]
+    )
+
+
+def archive_enabled(uri: str | None = None) -> bool:
+    """Whether archives can be written and read."""
+    return ARCHIVE_AVAILABLE and bool(uri if uri is not None else ARCHIVE_URI)
+
+
+def archive_horizon(now: datetime | None = None) -> datetime:
+    """Start of the oldest month kept entirely in PostgreSQL."""
+    now = now or datetime.now(timezone.utc)
+    return month_start(now - timedelta(days=ARCHIVE_AFTER_DAYS))
+
+
+def as_utc(value: date) -> datetime:
+    """Aware UTC datetime for a date, naive datetime (UTC) or aware datetime."""
+    if not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _month_dir(uri: str, month: datetime) -> tuple["pafs.FileSystem", str]:
+    filesystem, root = pafs.FileSystem.from_uri(uri)
+    return filesystem, f"{root.rstrip('/')}/signals/month={month:%Y-%m}"
+
+
+def archive_month(session, month: datetime, uri: str | None = None) -> int:
+    """Archive the finished articles of one month that are still in PostgreSQL.
+
+    Articles that are processed or errored are streamed into a new Parquet
+    part file of the month, one row per ticker and score (articles without
+    tickers get one row with a null ticker), then slimmed in the database.
+    Pending articles are left alone until a later run. If the run fails
+    after the file was written, the next run writes the rows again; readers
+    drop the duplicates.
+
+    Args:
+        session: Active SQLAlchemy session. The caller commits.
+        month: Start of the month to archive.
+        uri: Archive root; defaults to ``ARCHIVE_URI``.
+
+    Returns:
+        int: Number of articles archived.
+    """
+    uri = uri or ARCHIVE_URI
+    month_end = add_months(month, 1)
+    in_month = and_(
+        RawArticle.published_at >= month,
+        RawArticle.published_at < month_end,
+        RawArticle.archived_at.is_(None),
+    )
+    query = (
+        select(
+            RawArticle.id,
+            RawArticle.source,
+            ArticleTicker.ticker,
+            RawArticle.article_url,
+            RawArticle.headline,
+            RawArticle.article_text,
+            RawArticle.published_at,
+            RawArticle.has_error,
+            SentimentScore.model_version,
+            SentimentScore.sentiment_score,
+            SentimentScore.sentiment_label,
+        )
+        .outerjoin(ArticleTicker, ARTICLE_TICKER_JOIN)
+        .outerjoin(SentimentScore, ARTICLE_SCORE_JOIN)
+        .where(
+            and_(
+                in_month,
+                or_(RawArticle.is_processed.is_(True), RawArticle.has_error.is_(True)),
+            )
+        )
+        .order_by(RawArticle.published_at, RawArticle.id)
+        .execution_options(yield_per=ARCHIVE_BATCH_SIZE)
+    )
+
+    schema = archive_schema()
+    filesystem, directory = _month_dir(uri, month)
+    path = f"{directory}/part-{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}.parquet"
+    archived_ids: set[int] = set()
+    writer = None
+    try:
+        for partition in session.execute(query).partitions():
+            if writer is None:
+                filesystem.create_dir(directory, recursive=True)
+                writer = pq.ParquetWriter(
+                    path, schema, filesystem=filesystem, compression="zstd"
+                )
+            columns = {
+                name: [getattr(row, name) for row in partition]
+                for name in ARCHIVE_COLUMNS
+            }
+            columns["published_at"] = [as_utc(value) for value in columns["published_at"]]
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            archived_ids.update(columns["id"])
+    finally:
+        if writer is not None:
+            writer.close()
+
+    ids = sorted(archived_ids)
+    for start in range(0, len(ids), ARCHIVE_BATCH_SIZE):
+        session.execute(
+            update(RawArticle)
+            .where(
+                and_(in_month, RawArticle.id.in_(ids[start : start + ARCHIVE_BATCH_SIZE]))
+            )
+            .values(headline="", article_text="", archived_at=func.now())
+        )
+
+    if ids:
+        logger.info(f"Archived {len(ids)} articles of {month:%Y-%m} to {path}")
+    return len(ids)
+
+
+def archive_old_articles(
+    session, now: datetime | None = None, uri: str | None = None
+) -> dict[str, int]:
+    """Archive every month before the horizon that still has unarchived articles.
+
+    Commits after each month, so a long first run makes steady progress.
+    Cleared columns free their space once PostgreSQL vacuums the tables.
+
+    Returns:
+        dict: Number of articles archived per month (``YYYY-MM``).
+    """
+    if not archive_enabled(uri):
+        return {}
+
+    horizon = archive_horizon(now)
+    oldest = session.execute(
+        select(func.min(RawArticle.published_at)).where(
+            and_(RawArticle.archived_at.is_(None), RawArticle.published_at < horizon)
+        )
+    ).scalar()
+    if oldest is None:
+        return {}
+
+    archived = {}
+    month = month_start(as_utc(oldest))
+    while month < horizon:
+        count = archive_month(session, month, uri)
+        session.commit()
+        if count:
+            archived[f"{month:%Y-%m}"] = count
+        month = add_months(month, 1)
+    return archived
+
+
+def _signals_filter(tickers: list[str], start: datetime, end: datetime, cursor):
+    """Dataset filter mirroring the signals query of the API."""
+    timestamp = pa.timestamp("us", tz="UTC")
+    published_at = ds.field("published_at")
+    expression = (
+        ds.field("ticker").isin(tickers)
+        & (published_at >= pa.scalar(start, type=timestamp))
+        & (published_at <= pa.scalar(end, type=timestamp))
+        & ~ds.field("has_error")
+        & ds.field("sentiment_score").is_valid()
+    )
+    if cursor is not None:
+        cursor_published_at, article_id, ticker = cursor
+        cursor_published_at = pa.scalar(as_utc(cursor_published_at), type=timestamp)
+        same_time = published_at == cursor_published_at
+        expression &= (
+            (published_at < cursor_published_at)
+            | (same_time & (ds.field("id") < article_id))
+            | (same_time & (ds.field("id") == article_id) & (ds.field("ticker") < ticker))
+        )
+    return expression
+
+
+def iter_archived_signals(
+    tickers: list[str],
+    start_date: date,
+    end_date: date,
+    cursor: tuple[datetime, int, str] | None = None,
+    now: datetime | None = None,
+    uri: str | None = None,
+) -> Iterator[ArchivedSignal]:
+    """Yield archived signals of a request, newest first.
+
+    Only months before the archive horizon are read, one month (and one
+    Parquet scan) at a time, so callers that stop early read little.
+
+    Args:
+        tickers: Ticker symbols to include.
+        start_date: Inclusive lower bound on ``published_at``.
+        end_date: Inclusive upper bound on ``published_at``, compared like
+            the database query does.
+        cursor: Decoded ``(published_at, id, ticker)`` keyset cursor to
+            continue after.
+        now: Reference time of the horizon; defaults to now.
+        uri: Archive root; defaults to ``ARCHIVE_URI``.
+    """
+    if not archive_enabled(uri):
+        return
+    uri = uri or ARCHIVE_URI
+
+    start, end = as_utc(start_date), as_utc(end_date)
+    horizon = archive_horizon(now)
+    if start >= horizon:
+        return
+
+    expression = _signals_filter(tickers, start, end, cursor)
+    columns = list(ArchivedSignal._fields)
+    month = month_start(min(end, horizon - timedelta(days=1)))
+    first_month = month_start(start)
+    while month >= first_month:
+        filesystem, directory = _month_dir(uri, month)
+        month = add_months(month, -1)
+        if filesystem.get_file_info(directory).type == pafs.FileType.NotFound:
+            continue
+
+        table = ds.dataset(directory, filesystem=filesystem, format="parquet").to_table(
+            columns=columns, filter=expression
+        )
+        if table.num_rows == 0:
+            continue
+        order = pc.sort_indices(
+            table,
+            sort_keys=[
+                ("published_at", "descending"),
+                ("id", "descending"),
+                ("ticker", "descending"),
+            ],
+        )
+        seen = set()
+        for record in table.take(order).to_pylist():
+            row = ArchivedSignal(**record)
+            if _row_key(row) not in seen:  # Rows written twice by an interrupted run
+                seen.add(_row_key(row))
+                yield row
+
+
+def _row_key(row) -> tuple:
+    return (row.id, row.ticker, row.sentiment_score, row.sentiment_label)
+
+
+def merge_newest_first(*row_lists, limit: int) -> list:
+    """Merge signals rows by ``(published_at, id, ticker)`` desc.
+
+    A row present in more than one source (archived by a run that failed
+    before committing) is kept once.
+    """
+    rows = {}
+    for source_rows in row_lists:
+        for row in source_rows:
+            rows.setdefault(_row_key(row), row)
+    ordered = sorted(
+        rows.values(),
+        key=lambda row: (as_utc(row.published_at), row.id, row.ticker or ""),
+        reverse=True,
+    )
+    return ordered[:limit]
@@ -0,0 +1,110 @@
+"""Async database session management for asyncio services.
+
+The Signals API runs its queries through these ``AsyncSession`` helpers so that
+database I/O does not block the uvicorn event loop. The database URL is shared
+with the sync helpers in ``session.py``; only the driver is swapped for its
+asyncio counterpart.
+"""
+
+import os
+import threading
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from services.common.app.config import DATABASE_URL
+from services.common.app.db.session import pool_options, pool_stats
+from services.common.app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# asyncio driver used for each database backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# Process-wide registries, mirroring the sync engine registry
+_async_engines: dict[tuple[str, str], AsyncEngine] = {}
+_async_session_factories: dict[AsyncEngine, async_sessionmaker] = {}
+_registry_lock = threading.Lock()
+
+
+def to_async_url(database_url):
+    """Return the database URL with its driver replaced by the asyncio driver.
+
+    Raises:
+        ValueError: If no asyncio driver is known for the database backend.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for database backend: {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def get_async_engine(database_url=None, **kwargs) -> AsyncEngine:
+    """Return the shared async engine for a database URL, creating it on first use."""
+    if database_url is None:
+        database_url = DATABASE_URL
+    async_url = to_async_url(database_url)
+    cache_key = (async_url.render_as_string(), repr(sorted(kwargs.items())))
+
+    with _registry_lock:
+        engine = _async_engines.get(cache_key)
+        if engine is None:
+            engine = create_async_engine(
+                async_url, **{**pool_options(async_url), **kwargs}
+            )
+            _async_engines[cache_key] = engine
+            logger.info(f"Created async database engine for {engine.url!r}")
+    return engine
+
+
+def get_async_session_factory(engine=None) -> async_sessionmaker:
+    """Return the async sessionmaker bound to the given (or default) engine."""
+    if engine is None:
+        engine = get_async_engine()
+    with _registry_lock:
+        factory = _async_session_factories.get(engine)
+        if factory is None:
+            factory = async_sessionmaker(
+                bind=engine, autoflush=False, expire_on_commit=False
+            )
+            _async_session_factories[engine] = factory
+    return factory
+
+
+async def get_async_db(SessionLocal=None):
+    """Dependency function for FastAPI to get an async database session."""
+    if SessionLocal is None:
+        SessionLocal = get_async_session_factory()
+    async with SessionLocal() as db:
+        yield db
+
+
+def get_async_db_factory() -> async_sessionmaker:
+    """Dependency function for FastAPI to get the default async session factory.
+
+    Streaming responses outlive the request's dependencies, so they open (and
+    close) their own session from this factory instead of using get_async_db.
+    """
+    return get_async_session_factory()
+
+
+def get_async_pool_metrics() -> dict[str, dict]:
+    """Return connection pool statistics for every cached async engine."""
+    return {
+        engine.url.render_as_string(hide_password=True): pool_stats(engine.sync_engine)
+        for engine in list(_async_engines.values())
+    }
+
+
+def _dispose_async_engines_in_child() -> None:
+    # Drop pools inherited through fork without closing the parent's connections
+    for engine in list(_async_engines.values()):
+        engine.sync_engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_async_engines_in_child)
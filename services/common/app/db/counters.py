@@ -0,0 +1,108 @@
+"""Cached system counters.
+
+``system_counters`` holds running totals of the article tables so that
+``/v1/stats`` and the dashboard read a handful of rows instead of counting
+``raw_articles`` on every request. Writers call ``increment_counters`` in the
+transaction that inserts or flags the counted rows; ``reconcile_counters``
+overwrites the totals with exact counts and runs periodically to repair any
+drift (rows written by tools that do not maintain the counters, deletes).
+"""
+
+from typing import Any
+
+from sqlalchemy import func, select
+
+from services.common.app.db.dialects import upsert_insert
+from services.common.app.db.models import RawArticle, SystemCounter
+from services.common.app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TOTAL_ARTICLES = "total_articles"
+PROCESSED_ARTICLES = "processed_articles"
+ERROR_ARTICLES = "error_articles"
+
+ARTICLE_COUNTERS = (TOTAL_ARTICLES, PROCESSED_ARTICLES, ERROR_ARTICLES)
+
+
+def _upsert_counters(session, values: dict[str, int], add: bool) -> None:
+    """Insert counters, adding to or replacing the value of existing rows."""
+    # Sorted, so concurrent writers lock the counter rows in the same order
+    rows = [{"name": name, "value": values[name]} for name in sorted(values)]
+    if not rows:
+        return
+
+    table = SystemCounter.__table__
+    statement = upsert_insert(session.get_bind().dialect.name)(table)
+    new_value = statement.excluded.value
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.name],
+        set_={
+            "value": table.c.value + new_value if add else new_value,
+            "updated_at": func.now(),
+        },
+    )
+    session.execute(statement, rows)
+
+
+def increment_counters(session, deltas: dict[str, int]) -> None:
+    """Add deltas to counters, creating missing counters.
+
+    Runs in the caller's transaction, so the counters change exactly when the
+    counted rows do. The counter row stays locked until the caller commits;
+    keep the transaction short.
+
+    Args:
+        session: Active SQLAlchemy session. The caller commits.
+        deltas: Amount to add per counter name. Zero deltas are skipped.
+    """
+    _upsert_counters(
+        session, {name: delta for name, delta in deltas.items() if delta}, add=True
+    )
+
+
+def counters_query(names=ARTICLE_COUNTERS):
+    """Select ``(name, value)`` for the given counters.
+
+    Works with both sync and async sessions; missing counters are not
+    returned, use ``counter_values`` to default them to zero.
+    """
+    return select(SystemCounter.name, SystemCounter.value).where(
+        SystemCounter.name.in_(names)
+    )
+
+
+def counter_values(rows, names=ARTICLE_COUNTERS) -> dict[str, int]:
+    """Map rows of ``counters_query`` to a dict holding every name."""
+    values = dict.fromkeys(names, 0)
+    values.update({row.name: row.value for row in rows})
+    return values
+
+
+def reconcile_counters(session) -> dict[str, Any]:
+    """Overwrite the article counters with exact counts.
+
+    One scan of ``raw_articles`` computes all totals. Increments committed
+    while the scan runs may be lost until the next reconciliation.
+
+    Args:
+        session: Active SQLAlchemy session. The caller commits.
+
+    Returns:
+        dict: The reconciled value of every article counter.
+    """
+    total, processed, errors = session.execute(
+        select(
+            func.count(RawArticle.id),
+            func.count(RawArticle.id).filter(RawArticle.is_processed.is_(True)),
+            func.count(RawArticle.id).filter(RawArticle.has_error.is_(True)),
+        )
+    ).one()
+    values = {
+        TOTAL_ARTICLES: total,
+        PROCESSED_ARTICLES: processed,
+        ERROR_ARTICLES: errors,
+    }
+    _upsert_counters(session, values, add=False)
+    logger.info(f"Reconciled system counters: {values}")
+    return values
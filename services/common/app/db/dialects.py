@@ -0,0 +1,16 @@
+"""Dialect-specific SQL constructs shared by the database helpers."""
+
+
+def upsert_insert(dialect_name: str):
+    """Return the ``insert`` construct supporting ``on_conflict_do_update``.
+
+    Raises:
+        NotImplementedError: The dialect has no ON CONFLICT support here.
+    """
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect_name}")
+    return insert
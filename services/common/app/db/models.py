@@ -1,12 +1,16 @@
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    PrimaryKeyConstraint,
     String,
     Text,
+    and_,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -16,17 +20,30 @@ Base = declarative_base()
 
 
 class RawArticle(Base):
+    """A collected article.
+
+    On PostgreSQL ``raw_articles`` and ``sentiment_scores`` are range
+    partitioned by month on ``published_at`` (see
+    ``services/common/app/db/partitions.py``). There the primary keys and the
+    ``article_url`` unique constraint include ``published_at``, so URLs are
+    kept unique by ``article_urls`` instead; the ORM maps the logical schema,
+    which is what SQLite creates in tests.
+    """
+
     __tablename__ = "raw_articles"
 
     id = Column(Integer, primary_key=True, index=True)
     source = Column(String, nullable=False, index=True)
-    ticker = Column(String, nullable=True, index=True)
+    # Most relevant ticker; every ticker of the article is in article_tickers
+    ticker = Column(String, nullable=True)  # Indexed with published_at, see below
     article_url = Column(String, unique=True, nullable=False, index=True)
     headline = Column(Text, nullable=False)
     article_text = Column(Text, nullable=False)
     published_at = Column(DateTime(timezone=True), nullable=False, index=True)
-    is_processed = Column(Boolean, default=False, nullable=False, index=True)
+    is_processed = Column(Boolean, default=False, nullable=False)
     has_error = Column(Boolean, default=False, nullable=False)
+    # Set once headline and text moved to the Parquet archive (services/common/app/archive.py)
+    archived_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -45,12 +62,18 @@ class RawArticle(Base):
 
 
 class SentimentScore(Base):
+    """Model output for an article.
+
+    ``published_at`` is copied from the article: it is the partition key
+    shared with ``raw_articles``, so score partitions line up with article
+    partitions.
+    """
+
     __tablename__ = "sentiment_scores"
 
     id = Column(Integer, primary_key=True, index=True)
-    article_id = Column(
-        Integer, ForeignKey("raw_articles.id"), nullable=False, index=True
-    )
+    article_id = Column(Integer, ForeignKey("raw_articles.id"), nullable=False)
+    published_at = Column(DateTime(timezone=True), nullable=False)
     model_version = Column(String, nullable=False, default="placeholder-v1.0")
     sentiment_score = Column(Float, nullable=False)
     sentiment_label = Column(String, nullable=False)
@@ -65,6 +88,176 @@ class SentimentScore(Base):
         return f"<SentimentScore(id={self.id}, article_id={self.article_id}, score={self.sentiment_score}, label='{self.sentiment_label}')>"
 
 
+class ArticleUrl(Base):
+    """URL of a stored article, unique across all article partitions.
+
+    The ingestor inserts the URL here in the same transaction as the article
+    and only stores articles whose URL was new, so an article fetched again
+    with another ``published_at`` is not stored twice. Rows are kept when
+    articles are archived.
+    """
+
+    __tablename__ = "article_urls"
+
+    article_url = Column(String, primary_key=True)
+
+    def __repr__(self):
+        return f"<ArticleUrl(article_url='{self.article_url}')>"
+
+
+class ArticleTicker(Base):
+    """A ticker an article is about, with its relevance weight.
+
+    One row per ticker found in an article; the weights of an article sum to
+    1. ``published_at`` is copied from the article, like for scores: it is
+    the partition key shared with ``raw_articles`` and lets per-ticker
+    queries range scan this table alone.
+    """
+
+    __tablename__ = "article_tickers"
+    __table_args__ = (PrimaryKeyConstraint("article_id", "ticker"),)
+
+    article_id = Column(Integer, ForeignKey("raw_articles.id"), nullable=False)
+    ticker = Column(String, nullable=False)
+    published_at = Column(DateTime(timezone=True), nullable=False)
+    weight = Column(Float, nullable=False, default=1.0)
+
+    def __repr__(self):
+        return f"<ArticleTicker(article_id={self.article_id}, ticker='{self.ticker}', weight={self.weight})>"
+
+
+# Join condition of articles and their scores. Matching on the partition key
+# as well lets PostgreSQL prune score partitions along with article partitions.
+ARTICLE_SCORE_JOIN = and_(
+    RawArticle.id == SentimentScore.article_id,
+    RawArticle.published_at == SentimentScore.published_at,
+)
+
+# Join condition of articles and their tickers, on the partition key as well
+ARTICLE_TICKER_JOIN = and_(
+    RawArticle.id == ArticleTicker.article_id,
+    RawArticle.published_at == ArticleTicker.published_at,
+)
+
+# Primary-ticker queries: equality on ticker, range and ORDER BY on
+# (published_at, id)
+Index(
+    "ix_raw_articles_ticker_published_at",
+    RawArticle.ticker,
+    RawArticle.published_at.desc(),
+    RawArticle.id.desc(),
+)
+
+# Signals queries, which go through article_tickers, in the same shape
+Index(
+    "ix_article_tickers_ticker_published_at",
+    ArticleTicker.ticker,
+    ArticleTicker.published_at.desc(),
+    ArticleTicker.article_id.desc(),
+)
+
+# Pending-work scans of the sentiment worker; the predicate matches their
+# WHERE clause verbatim so the planner can prove the index applies
+_PENDING_ARTICLES = and_(
+    RawArticle.is_processed.is_(False), RawArticle.has_error.is_(False)
+)
+Index(
+    "ix_raw_articles_pending",
+    RawArticle.id,
+    postgresql_where=_PENDING_ARTICLES,
+    sqlite_where=_PENDING_ARTICLES,
+)
+
+# Covers the score columns, so joining scores to articles reads no heap pages
+Index(
+    "ix_sentiment_scores_article_id_covering",
+    SentimentScore.article_id,
+    postgresql_include=["sentiment_score", "sentiment_label"],
+)
+
+
+class SentimentRollup(Base):
+    """Hourly sentiment aggregates, maintained by the sentiment worker.
+
+    One row per (ticker, source, hour, model_version). Articles without a
+    ticker are rolled up under the empty string, since primary key columns
+    cannot be NULL.
+    """
+
+    __tablename__ = "sentiment_rollups"
+    __table_args__ = (
+        PrimaryKeyConstraint("ticker", "source", "hour", "model_version"),
+        Index("ix_sentiment_rollups_hour", "hour"),
+    )
+
+    ticker = Column(String, nullable=False)
+    source = Column(String, nullable=False)
+    hour = Column(DateTime(timezone=True), nullable=False)
+    model_version = Column(String, nullable=False)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_count = Column(Integer, nullable=False, default=0)
+    positive_count = Column(Integer, nullable=False, default=0)
+    negative_count = Column(Integer, nullable=False, default=0)
+    neutral_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"<SentimentRollup(ticker='{self.ticker}', hour={self.hour}, count={self.score_count})>"
+
+
+class SystemCounter(Base):
+    """Running totals for system statistics, e.g. the number of articles.
+
+    Writers increment the counters in the transaction that changes the
+    counted rows, and a periodic job reconciles them with exact counts, so
+    reading statistics never scans the article tables.
+    """
+
+    __tablename__ = "system_counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"<SystemCounter(name='{self.name}', value={self.value})>"
+
+
+class FeedState(Base):
+    """HTTP validators of the last ingested version of a feed.
+
+    The ingestor sends them back as ``If-None-Match`` / ``If-Modified-Since``
+    and skips a feed that answers 304 or whose body hashes to
+    ``content_hash``, before parsing it or touching ``raw_articles``.
+    """
+
+    __tablename__ = "feed_states"
+
+    feed_url = Column(String, primary_key=True)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the body, hex
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"<FeedState(feed_url='{self.feed_url}', etag='{self.etag}')>"
+
+
 # User and API Key models for Phase 2
 class User(Base):
     __tablename__ = "users"
@@ -0,0 +1,196 @@
+"""Monthly partition maintenance for PostgreSQL.
+
+``raw_articles``, ``sentiment_scores`` and ``article_tickers`` are range
+partitioned by month on ``published_at``, with identical bounds, plus a
+DEFAULT partition catching rows outside the created months.
+``maintain_partitions`` runs from Celery Beat: it creates the partitions of
+the coming months before rows arrive for them and, with a retention set,
+detaches partitions that fell out of it. Detached partitions stay in the
+database as plain tables, to be archived or dropped.
+
+On other dialects (SQLite in tests) ``maintain_partitions`` does nothing.
+"""
+
+import os
+import re
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+
+from services.common.app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Months of partitions kept ready ahead of the current month
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+# Months kept attached before the current one; 0 never detaches
+PARTITION_RETENTION_MONTHS = int(os.getenv("PARTITION_RETENTION_MONTHS", "0"))
+
+# Referenced table first; detaching goes in reverse order
+PARTITIONED_TABLES = ("raw_articles", "sentiment_scores", "article_tickers")
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(value: date) -> datetime:
+    """Return midnight UTC on the first day of the month containing ``value``."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months (negative to go back)."""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """Name of the monthly partition, e.g. ``raw_articles_p2024_01``."""
+    return f"{table}_p{month:%Y_%m}"
+
+
+def partition_month(name: str) -> datetime | None:
+    """Parse the month back out of a partition name; None for other tables."""
+    match = _PARTITION_SUFFIX.search(name)
+    if match is None:
+        return None
+    return datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)
+
+
+def create_partition_sql(table: str, month: datetime) -> str:
+    """DDL creating the monthly partition of ``table`` if it does not exist."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+        f"PARTITION OF {table} FOR VALUES FROM ('{month.isoformat()}') "
+        f"TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def is_partitioned(session) -> bool:
+    """Whether ``raw_articles`` is a partitioned PostgreSQL table."""
+    if session.get_bind().dialect.name != "postgresql":
+        return False
+    relkind = session.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass('raw_articles')")
+    ).scalar()
+    return relkind == "p"
+
+
+def list_partitions(session, table: str) -> dict[datetime, str]:
+    """Monthly partitions currently attached to ``table``, by month."""
+    names = session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table)"
+        ),
+        {"table": table},
+    ).scalars()
+    partitions = {}
+    for name in names:
+        month = partition_month(name)
+        if month is not None:
+            partitions[month] = name
+    return partitions
+
+
+def default_holds_month(session, table: str, month: datetime) -> bool:
+    """Whether the DEFAULT partition of ``table`` has rows of ``month``."""
+    default = f"{table}_default"
+    if session.execute(text("SELECT to_regclass(:name)"), {"name": default}).scalar():
+        return bool(
+            session.execute(
+                text(
+                    f"SELECT EXISTS (SELECT 1 FROM {default} "
+                    "WHERE published_at >= :start AND published_at < :end)"
+                ),
+                {"start": month, "end": add_months(month, 1)},
+            ).scalar()
+        )
+    return False
+
+
+def ensure_partitions(
+    session, months_ahead: int = PARTITION_MONTHS_AHEAD, now: datetime | None = None
+) -> list[str]:
+    """Create the partitions from the current month to ``months_ahead`` ahead.
+
+    A month must be created before rows for it arrive: once the DEFAULT
+    partition holds rows of a month, PostgreSQL refuses to create that
+    month's partition. Such a month is logged and skipped, so the other
+    partitions are still created; its rows have to be moved out of the
+    DEFAULT partition by hand before the next run can create it.
+
+    Returns:
+        list[str]: Names of the partitions created.
+    """
+    current = month_start(now or datetime.now(timezone.utc))
+    created = []
+    for table in PARTITIONED_TABLES:
+        existing = list_partitions(session, table)
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if month in existing:
+                continue
+            name = partition_name(table, month)
+            if default_holds_month(session, table, month):
+                logger.error(
+                    f"Cannot create partition {name}: {table}_default already "
+                    f"holds rows of {month:%Y-%m}. Move them out of the DEFAULT "
+                    "partition so the month can be partitioned."
+                )
+                continue
+            session.execute(text(create_partition_sql(table, month)))
+            created.append(name)
+    return created
+
+
+def detach_partitions(
+    session,
+    retention_months: int = PARTITION_RETENTION_MONTHS,
+    now: datetime | None = None,
+) -> list[str]:
+    """Detach partitions of months older than the retention window.
+
+    Score and ticker partitions are detached before the article partitions
+    they reference, and the foreign keys PostgreSQL leaves on them are
+    dropped so the matching article partition can follow.
+
+    Returns:
+        list[str]: Names of the partitions detached.
+    """
+    if retention_months <= 0:
+        return []
+
+    cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -retention_months)
+    detached = []
+    for table in reversed(PARTITIONED_TABLES):
+        for month, name in sorted(list_partitions(session, table).items()):
+            if month >= cutoff:
+                continue
+            session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            foreign_keys = session.execute(
+                text(
+                    "SELECT conname FROM pg_constraint "
+                    "WHERE conrelid = to_regclass(:name) AND contype = 'f'"
+                ),
+                {"name": name},
+            ).scalars()
+            for constraint in list(foreign_keys):
+                session.execute(
+                    text(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"')
+                )
+            detached.append(name)
+    return detached
+
+
+def maintain_partitions(session) -> dict[str, list[str]]:
+    """Create upcoming partitions and detach expired ones. The caller commits."""
+    if not is_partitioned(session):
+        return {"created": [], "detached": []}
+
+    created = ensure_partitions(session)
+    detached = detach_partitions(session)
+    logger.info(f"Partition maintenance created {created}, detached {detached}")
+    return {"created": created, "detached": detached}
@@ -0,0 +1,284 @@
+"""Hourly sentiment rollups.
+
+``sentiment_rollups`` keeps one row per (ticker, source, hour, model_version)
+with the score sum, the score count and the count per label. Tickers come
+from ``article_tickers``, like the ``/v1/signals`` query, so an article
+about several tickers counts once under each of them; an article without
+``article_tickers`` rows falls back to ``raw_articles.ticker``. Rows under
+``ALL_TICKERS`` count every article exactly once, for totals across tickers
+such as the dashboard's label distribution and trend. The sentiment
+worker adds to it in the same transaction that inserts the scores, so trend
+queries read a few hundred rollup rows instead of joining and grouping the
+fact tables. ``backfill_rollups`` rebuilds it from the fact tables, e.g. after
+the table was first created.
+"""
+
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import case, delete, func, insert, literal, literal_column, select
+
+from services.common.app.db.dialects import upsert_insert
+from services.common.app.db.models import (
+    ARTICLE_SCORE_JOIN,
+    ARTICLE_TICKER_JOIN,
+    ArticleTicker,
+    RawArticle,
+    SentimentRollup,
+    SentimentScore,
+)
+from services.common.app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Rollup key used for articles without a ticker
+UNTAGGED_TICKER = ""
+# Rollup key of the totals over all articles, each counted once; "*" is not
+# a valid ticker symbol
+ALL_TICKERS = "*"
+
+SENTIMENT_LABELS = ("positive", "negative", "neutral")
+
+KEY_COLUMNS = ("ticker", "source", "hour", "model_version")
+SUM_COLUMNS = (
+    "score_sum",
+    "score_count",
+    "positive_count",
+    "negative_count",
+    "neutral_count",
+)
+
+
+def hour_start(published_at: datetime) -> datetime:
+    """Truncate a timestamp to the start of its UTC hour.
+
+    Naive timestamps (SQLite) are taken to be UTC already.
+    """
+    if published_at.tzinfo is None:
+        published_at = published_at.replace(tzinfo=timezone.utc)
+    return published_at.astimezone(timezone.utc).replace(
+        minute=0, second=0, microsecond=0
+    )
+
+
+def load_article_tickers(session, articles: Mapping[int, Any]) -> dict[int, list[str]]:
+    """Return the ``article_tickers`` tickers of the given articles.
+
+    Args:
+        session: Active SQLAlchemy session.
+        articles: Article (or any object with ``published_at``) per article ID.
+            The published range bounds the lookup to the matching partitions.
+
+    Returns:
+        dict[int, list[str]]: Tickers per article ID; articles without
+            ``article_tickers`` rows are missing.
+    """
+    if not articles:
+        return {}
+
+    published = [article.published_at for article in articles.values()]
+    rows = session.execute(
+        select(ArticleTicker.article_id, ArticleTicker.ticker).where(
+            ArticleTicker.article_id.in_(list(articles)),
+            ArticleTicker.published_at.between(min(published), max(published)),
+        )
+    )
+    tickers: dict[int, list[str]] = {}
+    for article_id, ticker in rows:
+        tickers.setdefault(article_id, []).append(ticker)
+    return tickers
+
+
+def rollup_deltas(
+    rows: list[dict[str, Any]],
+    articles: Mapping[int, Any],
+    article_tickers: Mapping[int, list[str]] | None = None,
+) -> list[dict[str, Any]]:
+    """Aggregate newly written score rows into rollup increments.
+
+    Args:
+        rows: Score row dicts with ``article_id``, ``model_version``,
+            ``sentiment_score`` and ``sentiment_label``.
+        articles: Article (or any object with ``ticker``, ``source`` and
+            ``published_at``) per article ID.
+        article_tickers: Tickers per article ID, see ``load_article_tickers``.
+            A row is counted once under each ticker of its article; articles
+            missing here count under their ``ticker``. Every row is also
+            counted once under ``ALL_TICKERS``.
+
+    Returns:
+        list[dict]: One increment per rollup key, sorted by key so that
+            concurrent workers lock rollup rows in the same order.
+    """
+    article_tickers = article_tickers or {}
+    deltas: dict[tuple, dict[str, Any]] = {}
+    for row in rows:
+        article = articles[row["article_id"]]
+        tickers = article_tickers.get(row["article_id"]) or [
+            article.ticker or UNTAGGED_TICKER
+        ]
+        for ticker in (ALL_TICKERS, *tickers):
+            key = (
+                ticker,
+                article.source,
+                hour_start(article.published_at),
+                row["model_version"],
+            )
+            _add_to_delta(deltas, key, row)
+
+    return [deltas[key] for key in sorted(deltas)]
+
+
+def _add_to_delta(deltas: dict[tuple, dict[str, Any]], key: tuple, row: dict) -> None:
+    """Add one score row to the increment of a rollup key."""
+    delta = deltas.get(key)
+    if delta is None:
+        delta = dict(zip(KEY_COLUMNS, key, strict=True))
+        delta.update(dict.fromkeys(SUM_COLUMNS, 0))
+        delta["score_sum"] = 0.0
+        deltas[key] = delta
+
+    delta["score_sum"] += row["sentiment_score"]
+    delta["score_count"] += 1
+    label_column = f"{row['sentiment_label']}_count"
+    if label_column in delta:
+        delta[label_column] += 1
+
+
+def upsert_rollups(session, deltas: list[dict[str, Any]]) -> None:
+    """Add rollup increments with INSERT ... ON CONFLICT DO UPDATE.
+
+    Runs in the caller's transaction; the caller commits.
+    """
+    if not deltas:
+        return
+
+    table = SentimentRollup.__table__
+    statement = upsert_insert(session.get_bind().dialect.name)(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c[column] for column in KEY_COLUMNS],
+        set_={
+            **{
+                column: table.c[column] + statement.excluded[column]
+                for column in SUM_COLUMNS
+            },
+            "updated_at": func.now(),
+        },
+    )
+    session.execute(statement, deltas)
+
+
+def _hour_expression(column, dialect_name: str):
+    """SQL expression for ``hour_start``, stored the way the ORM stores it."""
+    if dialect_name == "postgresql":
+        utc = literal_column("'UTC'")
+        return func.timezone(
+            utc, func.date_trunc(literal_column("'hour'"), func.timezone(utc, column))
+        )
+    return func.strftime(literal_column("'%Y-%m-%d %H:00:00.000000'"), column)
+
+
+def backfill_rollups(
+    session, start: datetime | None = None, end: datetime | None = None
+) -> int:
+    """Rebuild rollups from the fact tables for the hours in ``[start, end)``.
+
+    Existing rollup rows in the range are replaced in one transaction. Scores
+    written by a running worker during the rebuild may be counted twice or
+    not at all, so backfill past ranges or pause the workers.
+
+    Args:
+        session: Active SQLAlchemy session. The caller commits.
+        start: First hour to rebuild (truncated to the hour); None for all.
+        end: Exclusive end (truncated to the hour); None for all.
+
+    Returns:
+        int: Number of rollup rows written.
+    """
+    dialect_name = session.get_bind().dialect.name
+    hour = _hour_expression(RawArticle.published_at, dialect_name)
+
+    def label_count(label: str):
+        return func.sum(case((SentimentScore.sentiment_label == label, 1), else_=0))
+
+    def source_query(ticker):
+        return (
+            select(
+                ticker,
+                RawArticle.source,
+                hour,
+                SentimentScore.model_version,
+                func.sum(SentimentScore.sentiment_score),
+                func.count(SentimentScore.id),
+                *(label_count(label) for label in SENTIMENT_LABELS),
+            )
+            .join(SentimentScore, ARTICLE_SCORE_JOIN)
+            .group_by(ticker, RawArticle.source, hour, SentimentScore.model_version)
+        )
+
+    per_ticker = func.coalesce(ArticleTicker.ticker, RawArticle.ticker, UNTAGGED_TICKER)
+    source_queries = [
+        source_query(per_ticker).outerjoin(ArticleTicker, ARTICLE_TICKER_JOIN),
+        source_query(literal(ALL_TICKERS)),
+    ]
+    clear_query = delete(SentimentRollup)
+
+    if start is not None:
+        start = hour_start(start)
+        source_queries = [
+            q.where(RawArticle.published_at >= start) for q in source_queries
+        ]
+        clear_query = clear_query.where(SentimentRollup.hour >= start)
+    if end is not None:
+        end = hour_start(end)
+        source_queries = [q.where(RawArticle.published_at < end) for q in source_queries]
+        clear_query = clear_query.where(SentimentRollup.hour < end)
+
+    session.execute(clear_query)
+    written = 0
+    for query in source_queries:
+        result = session.execute(
+            insert(SentimentRollup).from_select([*KEY_COLUMNS, *SUM_COLUMNS], query)
+        )
+        written += result.rowcount
+    logger.info(f"Backfilled {written} sentiment rollup rows")
+    return written
+
+
+def _label_sum(label: str):
+    return func.sum(getattr(SentimentRollup, f"{label}_count")).label(f"{label}_count")
+
+
+def label_totals_query():
+    """Select the number of scores per label, each article counted once.
+
+    Returns one row with ``positive_count``, ``negative_count`` and
+    ``neutral_count``; they are None while no article has been scored.
+    """
+    return select(*(_label_sum(label) for label in SENTIMENT_LABELS)).where(
+        SentimentRollup.ticker == ALL_TICKERS
+    )
+
+
+def hourly_totals_query(start: datetime, end: datetime):
+    """Select the per-hour totals over all articles, each counted once.
+
+    Returns ``hour``, ``score_sum``, ``score_count`` and the count per label
+    for the hours in ``[start, end]``, oldest first.
+    """
+    return (
+        select(
+            SentimentRollup.hour,
+            func.sum(SentimentRollup.score_sum).label("score_sum"),
+            func.sum(SentimentRollup.score_count).label("score_count"),
+            *(_label_sum(label) for label in SENTIMENT_LABELS),
+        )
+        .where(
+            SentimentRollup.ticker == ALL_TICKERS,
+            SentimentRollup.hour >= start,
+            SentimentRollup.hour <= end,
+        )
+        .group_by(SentimentRollup.hour)
+        .order_by(SentimentRollup.hour)
+    )
@@ -1,29 +1,118 @@
 """Database session management utilities."""
 
+import os
+import threading
 
-from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
-from services.common.app.config import DATABASE_URL
+from services.common.app.config import (
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+)
 from services.common.app.logging_config import get_logger
 
 logger = get_logger(__name__)
 
-# Load environment variables
-load_dotenv()
-
 # --- Database Engine and Session Management ---
 
+# Process-wide registries: one engine (and connection pool) per database URL and
+# engine options, one session factory per engine
+_engines: dict[tuple[str, str], Engine] = {}
+_session_factories: dict[Engine, sessionmaker] = {}
+_registry_lock = threading.Lock()
+
+
+def pool_options(database_url) -> dict:
+    """Return the configured pool options for a database URL."""
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
 def get_engine(database_url=None, **kwargs):
-    """Create and return a new SQLAlchemy engine."""
+    """Return the shared SQLAlchemy engine for a database URL.
+
+    The engine is created on first use and cached for the lifetime of the
+    process, so every session reuses the same connection pool instead of
+    paying a new connection handshake per request or task.
+    """
     if database_url is None:
         database_url = DATABASE_URL
-    return create_engine(database_url, **kwargs)
+    cache_key = (str(database_url), repr(sorted(kwargs.items())))
+
+    with _registry_lock:
+        engine = _engines.get(cache_key)
+        if engine is None:
+            engine = create_engine(
+                database_url, **{**pool_options(database_url), **kwargs}
+            )
+            _engines[cache_key] = engine
+            logger.info(f"Created database engine for {engine.url!r}")
+    return engine
+
 
 def get_session_factory(engine):
-    """Create and return a new sessionmaker factory bound to the given engine."""
-    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    """Return the sessionmaker factory bound to the given engine."""
+    with _registry_lock:
+        factory = _session_factories.get(engine)
+        if factory is None:
+            factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            _session_factories[engine] = factory
+    return factory
+
+
+def dispose_engines(close: bool = True) -> None:
+    """Dispose the connection pools of all cached engines.
+
+    Args:
+        close: Close the pooled connections. Forked children pass False so that
+            they drop the inherited connections without closing the sockets
+            that still belong to the parent process.
+    """
+    for engine in list(_engines.values()):
+        engine.dispose(close=close)
+
+
+# Celery prefork children (and any other fork) must not share the parent's
+# pooled connections; give them fresh pools on first use
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: dispose_engines(close=False))
+
+
+def pool_stats(engine) -> dict:
+    """Return connection pool statistics for a single engine."""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return stats
+
+
+def get_pool_metrics() -> dict[str, dict]:
+    """Return connection pool statistics for every cached engine."""
+    return {
+        engine.url.render_as_string(hide_password=True): pool_stats(engine)
+        for engine in list(_engines.values())
+    }
+
 
 def get_db(SessionLocal=None):
     """Dependency function for FastAPI to get a database session."""
@@ -36,6 +125,7 @@ def get_db(SessionLocal=None):
     finally:
         db.close()
 
+
 def create_db_session(SessionLocal=None):
     """Create a database session for use outside of the FastAPI context.
 
@@ -46,10 +136,12 @@ def create_db_session(SessionLocal=None):
         SessionLocal = get_session_factory(engine)
     return SessionLocal()
 
+
 def get_db_engine():
     """Get the database engine for direct access."""
     return get_engine()
 
+
 def create_session(SessionLocal=None):
     """Create a database session for scripts and utilities.
 
@@ -1,15 +1,70 @@
 from datetime import date, datetime
+from typing import Literal
 
-from pydantic import BaseModel, EmailStr, Field
-
+from pydantic import BaseModel, EmailStr, Field, model_validator
 
 # Request schemas
+# Maximum number of tickers in one batch signals request
+MAX_TICKERS_PER_REQUEST = 200
+
+
 class SignalsRequest(BaseModel):
-    ticker: str = Field(..., description="Stock ticker symbol (e.g., 'AAPL')")
+    ticker: str | None = Field(None, description="Stock ticker symbol (e.g., 'AAPL')")
+    tickers: list[str] | None = Field(
+        None,
+        min_length=1,
+        max_length=MAX_TICKERS_PER_REQUEST,
+        description="Several ticker symbols; results are grouped per ticker",
+    )
+    start_date: date = Field(
+        ..., description="Start date for analysis in YYYY-MM-DD format"
+    )
+    end_date: date = Field(..., description="End date for analysis in YYYY-MM-DD format")
+    limit: int = Field(
+        1000,
+        ge=1,
+        le=5000,
+        description="Maximum number of records per page; when more match, the "
+        "response has has_more set and a next_cursor to continue from",
+    )
+    cursor: str | None = Field(
+        None, description="Opaque cursor from a previous response's next_cursor"
+    )
+
+    @model_validator(mode="after")
+    def check_ticker_or_tickers(self) -> "SignalsRequest":
+        """Require exactly one of ``ticker`` and ``tickers``."""
+        if self.ticker is None and self.tickers is None:
+            raise ValueError("Provide either 'ticker' or 'tickers'")
+        if self.ticker is not None and self.tickers is not None:
+            raise ValueError("Provide 'ticker' or 'tickers', not both")
+        return self
+
+    @property
+    def ticker_list(self) -> list[str]:
+        """Requested tickers, deduplicated and in request order."""
+        if self.tickers is not None:
+            return list(dict.fromkeys(self.tickers))
+        return [self.ticker]
+
+
+class AggregateRequest(BaseModel):
+    tickers: list[str] = Field(
+        ..., min_length=1, max_length=50, description="Stock ticker symbols"
+    )
+    bucket: Literal["5m", "1h", "1d"] = Field("1h", description="Time bucket width")
     start_date: date = Field(
         ..., description="Start date for analysis in YYYY-MM-DD format"
     )
     end_date: date = Field(..., description="End date for analysis in YYYY-MM-DD format")
+    decay_half_life: float | None = Field(
+        None,
+        gt=0,
+        description="Half-life in buckets of the exponentially decayed score; omit to skip",
+    )
+    model_version: str | None = Field(
+        None, description="Model version of the scores; defaults to the current model"
+    )
 
 
 class SentimentAnalysisRequest(BaseModel):
@@ -27,6 +82,7 @@ class SentimentAnalysisResponse(BaseModel):
 
 
 class SentimentData(BaseModel):
+    ticker: str | None = None
     article_url: str
     headline: str
     published_at: datetime
@@ -45,7 +101,46 @@ class SentimentData(BaseModel):
 
 class SignalsResponse(BaseModel):
     data: list[SentimentData]
-    total_count: int = Field(..., description="Total number of sentiment records")
+    total_count: int = Field(..., description="Number of sentiment records in this page")
+    has_more: bool = Field(
+        False, description="Whether more records match than this page holds"
+    )
+    next_cursor: str | None = Field(
+        None, description="Cursor for the next page, null on the last page"
+    )
+
+
+class GroupedSignalsResponse(BaseModel):
+    data: dict[str, list[SentimentData]] = Field(
+        ..., description="Sentiment records per requested ticker, newest first"
+    )
+    total_count: int = Field(..., description="Number of sentiment records in this page")
+    has_more: bool = Field(
+        False, description="Whether more records match than this page holds"
+    )
+    next_cursor: str | None = Field(
+        None, description="Cursor for the next page, null on the last page"
+    )
+
+
+class SentimentBucket(BaseModel):
+    bucket_start: datetime = Field(..., description="Start of the time bucket (UTC)")
+    mean_score: float = Field(..., description="Mean sentiment score in the bucket")
+    count: int = Field(..., description="Number of scored articles in the bucket")
+    positive_count: int
+    negative_count: int
+    neutral_count: int
+    decayed_score: float | None = Field(
+        None, description="Exponentially decayed mean score, if requested"
+    )
+
+
+class AggregateResponse(BaseModel):
+    bucket: str = Field(..., description="Time bucket width")
+    model_version: str = Field(..., description="Model version of the aggregated scores")
+    series: dict[str, list[SentimentBucket]] = Field(
+        ..., description="Buckets per ticker, oldest first"
+    )
 
 
 # Health check schema
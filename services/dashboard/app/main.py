@@ -6,12 +6,29 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
-from sqlalchemy import and_, desc, func
+from sqlalchemy import desc, func
 
 # Add common module to path
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../../"))
 
-from services.common.app.db.models import RawArticle, SentimentScore
+from services.common.app.db.counters import (
+    ERROR_ARTICLES,
+    PROCESSED_ARTICLES,
+    TOTAL_ARTICLES,
+    counter_values,
+    counters_query,
+)
+from services.common.app.db.models import (
+    ARTICLE_SCORE_JOIN,
+    RawArticle,
+    SentimentScore,
+)
+from services.common.app.db.rollups import (
+    SENTIMENT_LABELS,
+    hour_start,
+    hourly_totals_query,
+    label_totals_query,
+)
 from services.common.app.db.session import create_db_session
 from services.common.app.logging_config import configure_logging, get_logger
 
@@ -77,15 +94,14 @@ def get_database_stats() -> dict:
     try:
         db = create_db_session()
 
-        total_articles = db.query(RawArticle).count()
-        processed_articles = db.query(RawArticle).filter(RawArticle.is_processed).count()
-        error_articles = db.query(RawArticle).filter(RawArticle.has_error).count()
+        # Cached counters, kept current by the ingestor and the sentiment worker
+        counters = counter_values(db.execute(counters_query()).all())
+        total_articles = counters[TOTAL_ARTICLES]
+        processed_articles = counters[PROCESSED_ARTICLES]
+        error_articles = counters[ERROR_ARTICLES]
 
-        # Get latest article
-        latest_article = (
-            db.query(RawArticle).order_by(desc(RawArticle.published_at)).first()
-        )
-        latest_date = latest_article.published_at if latest_article else None
+        # Get latest article date from the end of the published_at index
+        latest_date = db.query(func.max(RawArticle.published_at)).scalar()
 
         # Ensure latest_date is timezone-aware
         if latest_date is not None:
@@ -97,15 +113,13 @@ def get_database_stats() -> dict:
                 f"Database latest_date: {latest_date} (type: {type(latest_date)}, tzinfo: {latest_date.tzinfo})"
             )
 
-        # Get sentiment distribution
-        sentiment_dist = (
-            db.query(
-                SentimentScore.sentiment_label,
-                func.count(SentimentScore.id).label("count"),
-            )
-            .group_by(SentimentScore.sentiment_label)
-            .all()
-        )
+        # Get sentiment distribution from the hourly rollups, each article once
+        label_totals = db.execute(label_totals_query()).one()
+        sentiment_dist = [
+            (label, count)
+            for label, count in zip(SENTIMENT_LABELS, label_totals, strict=True)
+            if count
+        ]
 
         # Get articles by source
         source_dist = (
@@ -144,32 +158,19 @@ def get_database_stats() -> dict:
 
 @st.cache_data(ttl=300)
 def get_sentiment_trend_data(hours: int = 24) -> pd.DataFrame:
-    """Get sentiment trend data for specified hours."""
+    """Get sentiment trend data for specified hours.
+
+    Reads the hourly ``sentiment_rollups`` maintained by the sentiment worker
+    instead of grouping the full article and score tables.
+    """
     try:
         db = create_db_session()
 
         end_time = datetime.now(timezone.utc)
-        start_time = end_time - timedelta(hours=hours)
-
-        # Query sentiment scores grouped by hour
-        sentiment_data = (
-            db.query(
-                func.date_trunc("hour", RawArticle.published_at).label("hour"),
-                func.avg(SentimentScore.sentiment_score).label("avg_sentiment"),
-                func.count(SentimentScore.id).label("article_count"),
-                SentimentScore.sentiment_label,
-            )
-            .join(SentimentScore, RawArticle.id == SentimentScore.article_id)
-            .filter(
-                and_(
-                    RawArticle.published_at >= start_time,
-                    RawArticle.published_at <= end_time,
-                )
-            )
-            .group_by("hour", SentimentScore.sentiment_label)
-            .order_by("hour")
-            .all()
-        )
+        start_time = hour_start(end_time - timedelta(hours=hours))
+
+        # Sum the per-source totals of each hour, counting each article once
+        sentiment_data = db.execute(hourly_totals_query(start_time, end_time)).all()
 
         db.close()
 
@@ -178,11 +179,14 @@ def get_sentiment_trend_data(hours: int = 24) -> pd.DataFrame:
             [
                 {
                     "hour": item.hour,
-                    "avg_sentiment": float(item.avg_sentiment),
-                    "article_count": item.article_count,
-                    "sentiment_label": item.sentiment_label,
+                    "avg_sentiment": float(item.score_sum) / item.score_count,
+                    "article_count": item.score_count,
+                    "positive_count": item.positive_count,
+                    "negative_count": item.negative_count,
+                    "neutral_count": item.neutral_count,
                 }
                 for item in sentiment_data
+                if item.score_count
             ]
         )
 
@@ -201,7 +205,7 @@ def get_recent_articles(limit: int = 20) -> list[dict]:
 
         articles = (
             db.query(RawArticle, SentimentScore)
-            .join(SentimentScore, RawArticle.id == SentimentScore.article_id)
+            .join(SentimentScore, ARTICLE_SCORE_JOIN)
             .order_by(desc(RawArticle.published_at))
             .limit(limit)
             .all()
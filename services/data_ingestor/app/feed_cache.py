@@ -0,0 +1,65 @@
+"""Per-feed HTTP validators for conditional feed downloads.
+
+After a feed has been ingested, its ``ETag``, ``Last-Modified`` and a SHA-256
+hash of its body are stored in ``feed_states``. The next cycle sends the
+validators as ``If-None-Match`` / ``If-Modified-Since``; a feed that answers
+``304 Not Modified``, or whose body hashes the same (servers without
+validators), is skipped before it is parsed or checked against the database.
+"""
+
+import hashlib
+
+from sqlalchemy import func, select
+
+from services.common.app.db.dialects import upsert_insert
+from services.common.app.db.models import FeedState
+
+
+def content_hash(content: bytes) -> str:
+    """Hex SHA-256 of a feed body."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def load_feed_states(session, feed_urls: list[str]) -> dict[str, FeedState]:
+    """Stored states of the given feeds, by URL, in one query."""
+    states = session.execute(
+        select(FeedState).where(FeedState.feed_url.in_(feed_urls))
+    ).scalars()
+    return {state.feed_url: state for state in states}
+
+
+def conditional_headers(state: FeedState | None) -> dict[str, str]:
+    """Request headers asking the server to answer 304 if the feed is unchanged."""
+    headers = {}
+    if state is not None and state.etag:
+        headers["If-None-Match"] = state.etag
+    if state is not None and state.last_modified:
+        headers["If-Modified-Since"] = state.last_modified
+    return headers
+
+
+def save_feed_state(
+    session,
+    feed_url: str,
+    etag: str | None,
+    last_modified: str | None,
+    content_hash: str | None,
+) -> None:
+    """Insert or replace the state of a feed. The caller commits."""
+    table = FeedState.__table__
+    statement = upsert_insert(session.get_bind().dialect.name)(table).values(
+        feed_url=feed_url,
+        etag=etag,
+        last_modified=last_modified,
+        content_hash=content_hash,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.feed_url],
+        set_={
+            "etag": statement.excluded.etag,
+            "last_modified": statement.excluded.last_modified,
+            "content_hash": statement.excluded.content_hash,
+            "updated_at": func.now(),
+        },
+    )
+    session.execute(statement)
@@ -0,0 +1,92 @@
+"""In-memory cache of article URLs the ingestor has already stored.
+
+Most entries of a feed were already ingested in earlier cycles. The ingestor
+checks each entry's link against a bounded LRU set of known URLs before any
+HTML cleanup, ticker extraction or database lookup, so the work per cycle
+grows with new content only.
+
+The cache lives in the worker process and is warm-started from the newest
+``SEEN_URL_CACHE_SIZE`` rows of ``raw_articles`` on first use, so a restarted
+worker does not re-process a full cycle of old entries. The database stays
+the source of truth: a URL missing from the cache is still deduplicated by
+``DataIngestor.save_articles``.
+"""
+
+import os
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from sqlalchemy import select
+
+from services.common.app.db.models import RawArticle
+from services.common.app.logging_config import get_logger
+
+logger = get_logger("data_ingestor_seen_urls")
+
+# Maximum number of URLs kept in memory; 0 disables the cache
+SEEN_URL_CACHE_SIZE = int(os.getenv("SEEN_URL_CACHE_SIZE", "50000"))
+
+
+class SeenUrlCache:
+    """Bounded LRU set of article URLs.
+
+    Looking up or adding a URL marks it as recently used; once full, the
+    least recently used URL is evicted.
+    """
+
+    def __init__(self, max_size: int = SEEN_URL_CACHE_SIZE):
+        self.max_size = max_size
+        self._urls: OrderedDict[str, None] = OrderedDict()
+
+    def __contains__(self, url: str) -> bool:
+        if url not in self._urls:
+            return False
+        self._urls.move_to_end(url)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def add(self, url: str) -> None:
+        """Add a URL, evicting the least recently used one if full."""
+        if self.max_size <= 0:
+            return
+        self._urls[url] = None
+        self._urls.move_to_end(url)
+        if len(self._urls) > self.max_size:
+            self._urls.popitem(last=False)
+
+    def update(self, urls: Iterable[str]) -> None:
+        """Add several URLs, the last one ending up most recently used."""
+        for url in urls:
+            self.add(url)
+
+    def hydrate(self, session) -> int:
+        """Load the URLs of the most recently published articles.
+
+        Returns:
+            int: Number of URLs loaded.
+        """
+        if self.max_size <= 0:
+            return 0
+        urls = session.scalars(
+            select(RawArticle.article_url)
+            .order_by(RawArticle.published_at.desc())
+            .limit(self.max_size)
+        ).all()
+        self.update(reversed(urls))  # Newest last, so they are evicted last
+        logger.info(f"Warm-started the seen URL cache with {len(urls)} URLs")
+        return len(urls)
+
+
+_seen_url_cache: SeenUrlCache | None = None
+
+
+def get_seen_url_cache(session) -> SeenUrlCache:
+    """Return the process-wide cache, warm-starting it on first use."""
+    global _seen_url_cache
+    if _seen_url_cache is None:
+        cache = SeenUrlCache()
+        cache.hydrate(session)
+        _seen_url_cache = cache
+    return _seen_url_cache
@@ -3,25 +3,64 @@
 import os
 import re
 import sys
+from collections import Counter
 from datetime import datetime
 from typing import Any
 
 import feedparser
 from bs4 import BeautifulSoup
 from celery import Celery
-from tenacity import retry, stop_after_attempt, wait_exponential
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
 
 # Add project root to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 
-from services.common.app.db.models import RawArticle
+from services.common.app.db.counters import TOTAL_ARTICLES, increment_counters
+from services.common.app.db.dialects import upsert_insert
+from services.common.app.db.models import (
+    ArticleTicker,
+    ArticleUrl,
+    FeedState,
+    RawArticle,
+)
 from services.common.app.db.session import create_db_session
 from services.common.app.logging_config import configure_logging, get_logger
+from services.data_ingestor.app.feed_cache import (
+    conditional_headers,
+    content_hash,
+    load_feed_states,
+    save_feed_state,
+)
+from services.data_ingestor.app.feed_fetcher import FeedFetch, fetch_feeds
+from services.data_ingestor.app.seen_urls import SeenUrlCache, get_seen_url_cache
+from services.data_ingestor.app.ticker_matcher import TickerMatcher
 
 # Configure logging
 configure_logging(service_name="data_ingestor_scheduler")
 logger = get_logger("data_ingestor_scheduler")
 
+# Sentiment work mode: "push" sends ID lists to the worker, "pull" only wakes
+# workers up and lets them claim pending rows from raw_articles themselves
+SENTIMENT_WORK_MODE = os.getenv("SENTIMENT_WORK_MODE", "push").lower()
+SENTIMENT_PULL_FANOUT = int(os.getenv("SENTIMENT_PULL_FANOUT", "1"))
+
+# Interval of the job resetting the cached /v1/stats counters to exact counts
+COUNTERS_RECONCILE_SECONDS = float(os.getenv("COUNTERS_RECONCILE_SECONDS", "3600"))
+# Interval of the job creating upcoming monthly partitions and detaching old ones
+PARTITION_MAINTENANCE_SECONDS = float(os.getenv("PARTITION_MAINTENANCE_SECONDS", "86400"))
+# Interval of the job moving articles past the archive horizon to Parquet
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "86400"))
+# Interval of the job scoring articles whose sentiment task or flush was lost
+SENTIMENT_SWEEP_SECONDS = float(os.getenv("SENTIMENT_SWEEP_SECONDS", "300"))
+
+# Article fields that must be present before an article is inserted
+REQUIRED_ARTICLE_FIELDS = ("source", "article_url", "headline", "published_at")
+# URLs per query when looking up which articles are already stored
+URL_LOOKUP_CHUNK_SIZE = 1000
+# Relevance of a ticker mention in the headline relative to one in the text
+HEADLINE_MENTION_WEIGHT = float(os.getenv("HEADLINE_MENTION_WEIGHT", "3"))
+
 # RSS Feed sources
 RSS_FEEDS = [
     {
@@ -99,51 +138,25 @@ COMPANY_TICKER_MAP = {
 
 
 class TickerExtractor:
-    """Extracts ticker symbols from financial news articles."""
-
-    def __init__(self):
-        """Initialize the ticker extractor with regex patterns."""
-        # Regex patterns for ticker extraction
-        self.ticker_patterns = [
-            r"\$([A-Z]{1,5})",  # Pattern like $AAPL
-            r"\b([A-Z]{2,5})\b(?=\s+(?:stock|shares|ticker|symbol))",  # AAPL stock
-            r"\(([A-Z]{2,5})\)",  # Company (AAPL) format
-            r"NYSE:\s*([A-Z]{2,5})",  # NYSE: AAPL
-            r"NASDAQ:\s*([A-Z]{2,5})",  # NASDAQ: AAPL
-        ]
-
-    def extract_ticker_from_text(self, text: str) -> str | None:
-        """Extract ticker symbol from headline and article text."""
-        if not text:
-            return None
-
-        text_lower = text.lower()
-
-        # First, check company name mapping
-        for company_name, ticker in COMPANY_TICKER_MAP.items():
-            if company_name in text_lower:
-                logger.debug(f"Found company '{company_name}' -> ticker '{ticker}'")
-                return ticker
-
-        # Then try regex patterns
-        for pattern in self.ticker_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                ticker = match.upper()
-                if self._is_valid_ticker(ticker):
-                    logger.debug(f"Found ticker '{ticker}' using regex pattern")
-                    return ticker
-
-        return None
-
-    def _is_valid_ticker(self, ticker: str) -> bool:
-        """Validate if extracted ticker is likely a real ticker symbol."""
-        # Basic validation rules
-        if len(ticker) < 1 or len(ticker) > 5:
-            return False
+    """Extracts ticker symbols from financial news articles.
+
+    Company names are matched with a ``TickerMatcher`` automaton and explicit
+    symbols ("$AAPL", "(AAPL)", "NASDAQ: AAPL", ...) with one combined regex,
+    both compiled once per extractor, so each text is scanned once per kind.
+    """
+
+    # Regex patterns for explicit ticker mentions
+    TICKER_PATTERNS = (
+        r"\$([A-Z]{1,5})",  # Pattern like $AAPL
+        r"\b([A-Z]{2,5})\b(?=\s+(?:stock|shares|ticker|symbol))",  # AAPL stock
+        r"\(([A-Z]{2,5})\)",  # Company (AAPL) format
+        r"NYSE:\s*([A-Z]{2,5})",  # NYSE: AAPL
+        r"NASDAQ:\s*([A-Z]{2,5})",  # NASDAQ: AAPL
+    )
 
-        # Exclude common false positives
-        false_positives = {
+    # Common words that look like ticker symbols
+    FALSE_POSITIVES = frozenset(
+        {
             "THE",
             "AND",
             "FOR",
@@ -186,21 +199,101 @@ class TickerExtractor:
             "A",
             "I",
         }
+    )
 
-        return ticker not in false_positives
+    def __init__(self, company_map: dict[str, str] | None = None):
+        """Compile the company name automaton and the symbol patterns.
+
+        Args:
+            company_map: Company name or alias to ticker; defaults to
+                ``COMPANY_TICKER_MAP``.
+        """
+        self.company_matcher = TickerMatcher(
+            COMPANY_TICKER_MAP if company_map is None else company_map
+        )
+        self.ticker_pattern = re.compile("|".join(self.TICKER_PATTERNS), re.IGNORECASE)
+
+    def _mentions(self, text: str) -> list[str]:
+        """Every ticker mention in a text, company names first, with repeats."""
+        if not text:
+            return []
+
+        mentions = [ticker for _, ticker in self.company_matcher.find(text)]
+        for match in self.ticker_pattern.finditer(text):
+            ticker = next(group for group in match.groups() if group).upper()
+            if self._is_valid_ticker(ticker):
+                mentions.append(ticker)
+        return mentions
+
+    def extract_tickers_from_text(self, text: str) -> list[str]:
+        """Extract every ticker mentioned in the headline and article text.
+
+        Returns:
+            list[str]: Tickers without repeats, those found by company name
+                first, each group in order of first mention.
+        """
+        return list(dict.fromkeys(self._mentions(text)))
+
+    def extract_weighted_tickers(
+        self, headline: str, article_text: str = ""
+    ) -> dict[str, float]:
+        """Extract every ticker of an article with its relevance weight.
+
+        A ticker's weight is its share of the article's ticker mentions, a
+        mention in the headline counting ``HEADLINE_MENTION_WEIGHT`` times.
+
+        Returns:
+            dict[str, float]: Weights summing to 1, most relevant ticker
+                first; ties keep the order of first mention.
+        """
+        scores = Counter()
+        for ticker in self._mentions(headline):
+            scores[ticker] += HEADLINE_MENTION_WEIGHT
+        for ticker in self._mentions(article_text):
+            scores[ticker] += 1.0
+
+        total = sum(scores.values())
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return {ticker: score / total for ticker, score in ranked}
+
+    def extract_ticker_from_text(self, text: str) -> str | None:
+        """Extract the main ticker symbol from headline and article text.
+
+        The first company mentioned by name wins over explicit symbols.
+        """
+        tickers = self.extract_tickers_from_text(text)
+        if tickers:
+            logger.debug(f"Found tickers {tickers} in text")
+            return tickers[0]
+        return None
+
+    def _is_valid_ticker(self, ticker: str) -> bool:
+        """Validate if extracted ticker is likely a real ticker symbol."""
+        # Basic validation rules
+        if len(ticker) < 1 or len(ticker) > 5:
+            return False
+
+        # Exclude common false positives
+        return ticker not in self.FALSE_POSITIVES
 
 
 class DataIngestor:
     """A class to handle fetching, parsing, and storing articles from RSS feeds."""
 
-    def __init__(self):
+    def __init__(self, seen_urls: SeenUrlCache | None = None):
         """Initializes the DataIngestor with a database session and stats."""
         self.session = create_db_session()
         self.ticker_extractor = TickerExtractor()
+        # Shared by every ingestor of the process unless one is passed in
+        self.seen_urls = (
+            seen_urls if seen_urls is not None else get_seen_url_cache(self.session)
+        )
         self.stats = {
             "total_fetched": 0,
             "total_saved": 0,
             "with_ticker": 0,
+            "unchanged_feeds": 0,
+            "already_seen": 0,
             "errors": 0,
             "start_time": datetime.utcnow(),
         }
@@ -210,27 +303,35 @@ class DataIngestor:
         if hasattr(self, "session"):
             self.session.close()
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def fetch_rss_feed(self, feed_config: dict[str, str]) -> list[dict[str, Any]]:
-        """Fetch articles from an RSS feed with retry logic."""
+    def parse_rss_feed(
+        self, feed_config: dict[str, str], content: bytes
+    ) -> list[dict[str, Any]]:
+        """Parse articles from the downloaded body of an RSS feed."""
         try:
-            logger.info(f"Fetching RSS feed: {feed_config['name']}")
-            feed = feedparser.parse(feed_config["url"])
+            feed = feedparser.parse(content)
             if feed.bozo:
                 logger.warning(f"RSS feed {feed_config['name']} has parsing issues")
             articles = []
+            already_seen = 0
             for entry in feed.entries:
+                # Known articles skip HTML cleanup, ticker extraction and the DB
+                if entry.get("link") in self.seen_urls:
+                    already_seen += 1
+                    continue
                 try:
                     article_text = self.extract_article_content(entry)
                     published_at = self.parse_published_date(entry)
 
-                    # Extract ticker from headline and content
-                    full_text = f"{entry.title} {article_text}"
-                    ticker = self.ticker_extractor.extract_ticker_from_text(full_text)
+                    # Extract every ticker from headline and content
+                    tickers = self.ticker_extractor.extract_weighted_tickers(
+                        entry.title, article_text
+                    )
+                    ticker = next(iter(tickers), None)
 
                     article_data = {
                         "source": feed_config["source"],
                         "ticker": ticker,
+                        "tickers": tickers,
                         "article_url": entry.link,
                         "headline": entry.title,
                         "article_text": article_text,
@@ -238,9 +339,9 @@ class DataIngestor:
                     }
                     articles.append(article_data)
 
-                    if ticker:
+                    if tickers:
                         logger.debug(
-                            f"Extracted ticker '{ticker}' from article: {entry.title[:50]}..."
+                            f"Extracted tickers {list(tickers)} from article: {entry.title[:50]}..."
                         )
 
                 except Exception as e:
@@ -250,15 +351,16 @@ class DataIngestor:
                     self.stats["errors"] += 1
                     continue
             self.stats["total_fetched"] += len(articles)
+            self.stats["already_seen"] += already_seen
             ticker_count = sum(1 for article in articles if article.get("ticker"))
             self.stats["with_ticker"] += ticker_count
             logger.info(
-                f"Successfully fetched {len(articles)} articles from {feed_config['name']} "
-                f"({ticker_count} with tickers)"
+                f"Successfully parsed {len(articles)} articles from {feed_config['name']} "
+                f"({ticker_count} with tickers, {already_seen} already seen)"
             )
             return articles
         except Exception as e:
-            logger.error(f"Error fetching RSS feed {feed_config['name']}: {e!s}")
+            logger.error(f"Error parsing RSS feed {feed_config['name']}: {e!s}")
             self.stats["errors"] += 1
             raise
 
@@ -285,49 +387,190 @@ class DataIngestor:
         else:
             return datetime.utcnow()
 
-    def save_articles(self, articles: list[dict[str, Any]]) -> list[int]:
-        """Save articles to db, avoid duplicates, and return new article IDs."""
-        saved_count = 0
-        new_article_ids = []
-        articles_to_add = []
-
-        for article_data in articles:
-            try:
-                existing = (
-                    self.session.query(RawArticle.id)
-                    .filter(RawArticle.article_url == article_data["article_url"])
-                    .first()
-                )
-                if existing:
-                    logger.debug(f"Article already exists: {article_data['article_url']}")
-                    continue
-                article = RawArticle(**article_data)
-                articles_to_add.append(article)
-                saved_count += 1
-            except Exception as e:
-                logger.error(
-                    f"Error preparing article {article_data.get('article_url', 'unknown')} for saving: {e!s}"
-                )
-                self.stats["errors"] += 1
+    def ingest_feed(self, fetched: FeedFetch, state: FeedState | None) -> list[int]:
+        """Parse and save a downloaded feed unless it is unchanged since last time.
+
+        Args:
+            fetched: The downloaded feed.
+            state: Validators stored when the feed was last ingested, if any.
+
+        Returns:
+            list[int]: IDs of the new articles.
+        """
+        feed_config = fetched.feed_config
+        body_hash = None if fetched.not_modified else content_hash(fetched.content)
+        if fetched.not_modified or (
+            state is not None and state.content_hash == body_hash
+        ):
+            logger.info(f"RSS feed {feed_config['name']} is unchanged, skipping it")
+            self.stats["unchanged_feeds"] += 1
+            return []
 
-        if not articles_to_add:
+        articles = self.parse_rss_feed(feed_config, fetched.content)
+        feed_state = {
+            "feed_url": feed_config["url"],
+            "etag": fetched.etag,
+            "last_modified": fetched.last_modified,
+            "content_hash": body_hash,
+        }
+        return self.save_articles(articles, feed_state=feed_state)
+
+    def save_articles(
+        self, articles: list[dict[str, Any]], feed_state: dict[str, Any] | None = None
+    ) -> list[int]:
+        """Save articles to db, avoid duplicates, and return new article IDs.
+
+        Already stored URLs are found with one ``IN`` probe per chunk. The
+        remaining URLs are claimed in ``article_urls`` with one ``INSERT ...
+        ON CONFLICT DO NOTHING RETURNING``, which also skips articles another
+        ingestor stored in the meantime or stored under another
+        ``published_at``, and the articles whose URL was claimed are inserted
+        in one more statement. The ``tickers`` of the inserted articles
+        (ticker to weight) go to ``article_tickers`` in one more statement.
+        If the batch fails, the articles are inserted one by one, so a bad
+        article is only skipped itself.
+
+        ``feed_state``, the validators of the feed the articles came from, is
+        saved in the same transaction, so a feed is only skipped in later
+        cycles once its articles are stored.
+        """
+        new_articles = self._new_articles(articles)
+        if not new_articles and feed_state is None:
             return []
 
+        new_article_ids, failed_urls = [], set()
         try:
-            self.session.add_all(articles_to_add)
-            self.session.flush()
-            new_article_ids = [article.id for article in articles_to_add if article.id]
+            if new_articles:
+                new_article_ids, failed_urls = self._insert_articles(new_articles)
+                increment_counters(self.session, {TOTAL_ARTICLES: len(new_article_ids)})
+            if feed_state is not None:
+                save_feed_state(self.session, **feed_state)
             self.session.commit()
-            self.stats["total_saved"] += saved_count
-            logger.info(f"Saved {saved_count} new articles to database.")
+            # Only once committed, or a rolled back article would never be retried
+            self.seen_urls.update(
+                article_data["article_url"]
+                for article_data in new_articles
+                if article_data["article_url"] not in failed_urls
+            )
+            self.stats["total_saved"] += len(new_article_ids)
+            logger.info(f"Saved {len(new_article_ids)} new articles to database.")
         except Exception as e:
             self.session.rollback()
             logger.error(f"Error committing new articles to database: {e!s}")
-            self.stats["errors"] += len(articles_to_add)
+            self.stats["errors"] += len(new_articles)
             return []
 
         return new_article_ids
 
+    def _new_articles(self, articles: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Drop incomplete articles, repeated URLs and URLs already stored."""
+        by_url = {}
+        for article_data in articles:
+            missing = [
+                field for field in REQUIRED_ARTICLE_FIELDS if not article_data.get(field)
+            ]
+            if missing:
+                logger.error(
+                    f"Skipping article {article_data.get('article_url', 'unknown')} "
+                    f"without {', '.join(missing)}"
+                )
+                self.stats["errors"] += 1
+                continue
+            by_url.setdefault(article_data["article_url"], article_data)
+
+        urls = list(by_url)
+        for start in range(0, len(urls), URL_LOOKUP_CHUNK_SIZE):
+            existing = self.session.scalars(
+                select(RawArticle.article_url).where(
+                    RawArticle.article_url.in_(
+                        urls[start : start + URL_LOOKUP_CHUNK_SIZE]
+                    )
+                )
+            )
+            for url in existing:
+                logger.debug(f"Article already exists: {url}")
+                by_url.pop(url, None)
+                self.seen_urls.add(url)
+        return list(by_url.values())
+
+    def _insert_articles(
+        self, articles: list[dict[str, Any]]
+    ) -> tuple[list[int], set[str]]:
+        """Insert articles and their tickers, skipping conflicts.
+
+        Returns:
+            tuple[list[int], set[str]]: IDs of the new articles, and URLs of
+                the articles that failed to insert.
+        """
+        statement = (
+            upsert_insert(self.session.get_bind().dialect.name)(RawArticle)
+            .on_conflict_do_nothing()
+            .returning(RawArticle.id, RawArticle.article_url, RawArticle.published_at)
+        )
+        try:
+            with self.session.begin_nested():
+                return self._insert_batch(statement, articles), set()
+        except SQLAlchemyError as e:
+            logger.warning(f"Batch insert failed, inserting articles one by one: {e!s}")
+
+        new_article_ids, failed_urls = [], set()
+        for article_data in articles:
+            try:
+                with self.session.begin_nested():
+                    new_article_ids.extend(self._insert_batch(statement, [article_data]))
+            except SQLAlchemyError as e:
+                logger.error(f"Error saving article {article_data['article_url']}: {e!s}")
+                self.stats["errors"] += 1
+                failed_urls.add(article_data["article_url"])
+        return new_article_ids, failed_urls
+
+    def _insert_batch(self, statement, articles: list[dict[str, Any]]) -> list[int]:
+        """Claim the URLs, then insert the articles that got theirs and their tickers.
+
+        Partitioned ``raw_articles`` only rejects a URL stored with the same
+        ``published_at``, so the claim in ``article_urls`` is what keeps URLs
+        unique. Articles without a ``tickers`` mapping get their ``ticker``,
+        if any, with weight 1.
+
+        Returns:
+            list[int]: IDs of the inserted articles.
+        """
+        tickers_by_url, rows = {}, []
+        for article_data in articles:
+            row = dict(article_data)
+            tickers = row.pop("tickers", None)
+            if tickers is None:
+                tickers = {row["ticker"]: 1.0} if row.get("ticker") else {}
+            tickers_by_url[row["article_url"]] = tickers
+            rows.append(row)
+
+        claimed = set(
+            self.session.scalars(
+                upsert_insert(self.session.get_bind().dialect.name)(ArticleUrl)
+                .on_conflict_do_nothing()
+                .returning(ArticleUrl.article_url),
+                [{"article_url": url} for url in tickers_by_url],
+            )
+        )
+        rows = [row for row in rows if row["article_url"] in claimed]
+        if not rows:
+            return []
+
+        inserted = self.session.execute(statement, rows).all()
+        ticker_rows = [
+            {
+                "article_id": article.id,
+                "ticker": ticker,
+                "published_at": article.published_at,
+                "weight": weight,
+            }
+            for article in inserted
+            for ticker, weight in tickers_by_url[article.article_url].items()
+        ]
+        if ticker_rows:
+            self.session.execute(insert(ArticleTicker), ticker_rows)
+        return [article.id for article in inserted]
+
 
 # Initialize Celery
 celery_app = Celery("data_ingestor")
@@ -339,6 +582,26 @@ celery_app.conf.update(
             "task": "services.data_ingestor.app.tasks.collect_and_send_batch",
             "schedule": 300.0,
         },
+        "reconcile-system-counters": {
+            "task": "services.sentiment_processor.app.worker.reconcile_system_counters",
+            "schedule": COUNTERS_RECONCILE_SECONDS,
+            "options": {"queue": "sentiment_batch_queue"},
+        },
+        "maintain-table-partitions": {
+            "task": "services.sentiment_processor.app.worker.maintain_table_partitions",
+            "schedule": PARTITION_MAINTENANCE_SECONDS,
+            "options": {"queue": "sentiment_batch_queue"},
+        },
+        "archive-old-articles": {
+            "task": "services.sentiment_processor.app.worker.archive_articles",
+            "schedule": ARCHIVE_INTERVAL_SECONDS,
+            "options": {"queue": "sentiment_batch_queue"},
+        },
+        "sweep-sentiment-buffer": {
+            "task": "services.sentiment_processor.app.worker.sweep_sentiment_buffer",
+            "schedule": SENTIMENT_SWEEP_SECONDS,
+            "options": {"queue": "sentiment_batch_queue"},
+        },
     },
     timezone="UTC",
 )
@@ -353,21 +616,36 @@ def collect_and_send_batch(self):
     try:
         ingestor = DataIngestor()
         total_new_article_ids = []
-        for feed_config in RSS_FEEDS:
+        feed_states = load_feed_states(
+            ingestor.session, [feed_config["url"] for feed_config in RSS_FEEDS]
+        )
+        request_headers = {
+            url: conditional_headers(state) for url, state in feed_states.items()
+        }
+        # Download all feeds in parallel, then parse and save them in turn
+        for fetched in fetch_feeds(RSS_FEEDS, request_headers=request_headers):
+            feed_config = fetched.feed_config
+            if fetched.error is not None:
+                ingestor.stats["errors"] += 1
+                continue
             try:
-                articles = ingestor.fetch_rss_feed(feed_config)
-                if articles:
-                    saved_ids = ingestor.save_articles(articles)
-                    if saved_ids:
-                        total_new_article_ids.extend(saved_ids)
-                        logger.info(
-                            f"Collected {len(saved_ids)} new article IDs from {feed_config['name']}."
-                        )
+                saved_ids = ingestor.ingest_feed(
+                    fetched, feed_states.get(feed_config["url"])
+                )
+                if saved_ids:
+                    total_new_article_ids.extend(saved_ids)
+                    logger.info(
+                        f"Collected {len(saved_ids)} new article IDs from {feed_config['name']}."
+                    )
             except Exception as e:
                 logger.error(f"Error processing feed {feed_config['name']}: {e}")
                 continue
 
-        if total_new_article_ids:
+        if SENTIMENT_WORK_MODE == "pull":
+            # Also wakes workers for rows left pending by earlier cycles
+            logger.info(f"Total new articles to process: {len(total_new_article_ids)}")
+            send_drain_tasks(SENTIMENT_PULL_FANOUT)
+        elif total_new_article_ids:
             logger.info(f"Total new articles to process: {len(total_new_article_ids)}")
             send_batch_processing_task(total_new_article_ids)
         else:
@@ -409,6 +687,19 @@ def send_batch_processing_task(article_ids: list[int]):
         )
 
 
+def send_drain_tasks(fanout: int):
+    """Sends ID-less drain tasks that let pull-mode workers claim pending rows."""
+    try:
+        for _ in range(fanout):
+            celery_app.send_task(
+                "services.sentiment_processor.app.worker.drain_pending_articles",
+                queue="sentiment_batch_queue",
+            )
+        logger.info(f"Sent {fanout} drain task(s) to pull-mode sentiment workers.")
+    except Exception as e:
+        logger.error(f"Error sending drain tasks: {e}")
+
+
 if __name__ == "__main__":
     logger.info(
         "This script defines Celery Beat tasks and is not meant for direct execution."
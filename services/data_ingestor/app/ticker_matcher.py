@@ -0,0 +1,91 @@
+"""Multi-pattern company name matching for ticker extraction.
+
+Company names are found with an Aho-Corasick automaton built over word tokens
+instead of characters. Matching whole tokens gives word-boundary semantics
+("meta" does not match "metal") and keeps the automaton small, and a single
+pass over the tokens of a text finds every name in it, whether the map holds
+fifty names or the full listing universe.
+"""
+
+import re
+from collections import deque
+
+# Words, and a possessive "'s" or an ampersand as tokens of their own, so that
+# "Amazon's" contains "amazon" and "Johnson & Johnson" keeps its "&"
+_TOKEN = re.compile(r"[a-z0-9]+|'s\b|&")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into the lowercase tokens names are matched on."""
+    return _TOKEN.findall(text.lower().replace("\u2019", "'"))  # Typographic apostrophe
+
+
+class TickerMatcher:
+    """Aho-Corasick automaton mapping token sequences (names) to tickers.
+
+    Build it once per name map; ``find`` is then linear in the number of
+    tokens of the text plus the number of matches.
+    """
+
+    def __init__(self, names: dict[str, str]):
+        """Compile the automaton.
+
+        Args:
+            names: Company name or alias to ticker, e.g. ``{"apple": "AAPL"}``.
+        """
+        # Node 0 is the root; nodes are indexes into the three lists
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[tuple[int, str]]] = [[]]  # (name length, ticker)
+        for name, ticker in names.items():
+            self._add(tokenize(name), ticker)
+        self._link()
+
+    def _add(self, tokens: list[str], ticker: str) -> None:
+        if not tokens:
+            return
+        node = 0
+        for token in tokens:
+            child = self._goto[node].get(token)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][token] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = child
+        self._output[node].append((len(tokens), ticker))
+
+    def _link(self) -> None:
+        """Set failure links breadth first and merge the outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                self._output[child] = (
+                    self._output[child] + self._output[self._fail[child]]
+                )
+
+    def find(self, text: str) -> list[tuple[int, str]]:
+        """Find every name in a text.
+
+        Returns:
+            list[tuple[int, str]]: ``(token position, ticker)`` per match,
+                ordered by where the name starts. Overlapping names (e.g.
+                "bank of america" and "america") are all returned.
+        """
+        matches = []
+        node = 0
+        for index, token in enumerate(tokenize(text)):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            for length, ticker in self._output[node]:
+                matches.append((index - length + 1, ticker))
+        matches.sort(key=lambda match: match[0])
+        return matches
@@ -0,0 +1,118 @@
+"""Cross-task micro-batching for the sentiment worker.
+
+Producers often enqueue ``process_sentiment_batch`` tasks carrying only a few
+article IDs, and each of them would otherwise run its own tiny forward pass.
+Small tasks instead append their IDs to a shared Redis buffer. The buffer is
+drained into one model pass once it holds ``max_articles`` IDs, or when the
+delayed flush task scheduled by the first task of a window fires.
+
+The window marker expires after ``MICRO_BATCH_WINDOW_TTL_FACTOR`` times the
+maximum wait, so a lost delayed flush (worker crash, dropped countdown task,
+failing flush) only stalls the buffer until the marker expires and the next
+add opens a new window. The periodic ``sweep_sentiment_buffer`` task drains
+whatever is left in the meantime.
+"""
+
+import math
+import os
+import time
+
+from services.common.app.logging_config import get_logger
+
+logger = get_logger("sentiment_micro_batching")
+
+# Configuration
+MICRO_BATCH_ENABLED = (
+    os.getenv("SENTIMENT_MICRO_BATCH_ENABLED", "false").lower() == "true"
+)
+MICRO_BATCH_MAX_ARTICLES = int(os.getenv("SENTIMENT_MICRO_BATCH_MAX_ARTICLES", "64"))
+MICRO_BATCH_MAX_WAIT_SECONDS = float(os.getenv("SENTIMENT_MICRO_BATCH_MAX_WAIT", "2.0"))
+# Lifetime of the window marker, in multiples of the maximum wait
+MICRO_BATCH_WINDOW_TTL_FACTOR = float(
+    os.getenv("SENTIMENT_MICRO_BATCH_WINDOW_TTL_FACTOR", "5")
+)
+MICRO_BATCH_KEY = "sentilyzer:sentiment:pending_ids"
+
+
+class MicroBatchBuffer:
+    """Redis-backed buffer that aggregates article IDs across Celery tasks.
+
+    All mutations run inside MULTI/EXEC, so IDs are never lost or drained twice
+    when several worker processes add and drain concurrently.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        key: str = MICRO_BATCH_KEY,
+        max_articles: int = MICRO_BATCH_MAX_ARTICLES,
+        max_wait_seconds: float = MICRO_BATCH_MAX_WAIT_SECONDS,
+    ):
+        self.redis = redis_client
+        self.key = key
+        self.window_key = f"{key}:window"
+        self.max_articles = max_articles
+        self.max_wait_seconds = max_wait_seconds
+        self.window_ttl_ms = max(
+            1, math.ceil(max_wait_seconds * MICRO_BATCH_WINDOW_TTL_FACTOR * 1000)
+        )
+
+    def add(self, article_ids: list[int]) -> bool:
+        """Append article IDs to the buffer.
+
+        Returns:
+            bool: True if these IDs opened a new window, in which case the
+                caller is responsible for scheduling the delayed flush.
+        """
+        pipeline = self.redis.pipeline(transaction=True)
+        pipeline.rpush(self.key, *article_ids)
+        pipeline.set(self.window_key, time.time(), nx=True, px=self.window_ttl_ms)
+        _, opened = pipeline.execute()
+        return bool(opened)
+
+    def open_window(self) -> bool:
+        """Open a new window if none is open. Returns True if one was opened."""
+        return bool(
+            self.redis.set(self.window_key, time.time(), nx=True, px=self.window_ttl_ms)
+        )
+
+    def is_full(self) -> bool:
+        """Return True once the buffer holds enough IDs for a full batch."""
+        return self.redis.llen(self.key) >= self.max_articles
+
+    def drain(self) -> tuple[list[int], int]:
+        """Atomically take up to ``max_articles`` IDs and close the window.
+
+        Returns:
+            tuple[list[int], int]: The drained IDs and the number still buffered.
+        """
+        pipeline = self.redis.pipeline(transaction=True)
+        pipeline.lrange(self.key, 0, self.max_articles - 1)
+        pipeline.ltrim(self.key, self.max_articles, -1)
+        pipeline.delete(self.window_key)
+        pipeline.llen(self.key)
+        raw_ids, _, _, remaining = pipeline.execute()
+
+        # Keep first-seen order and drop IDs that were enqueued more than once
+        article_ids = list(dict.fromkeys(int(raw_id) for raw_id in raw_ids))
+        return article_ids, remaining
+
+
+def build_micro_batch_buffer(redis_url: str) -> MicroBatchBuffer | None:
+    """Create the micro-batch buffer, or return None when it is disabled or unusable.
+
+    The client connects lazily, so the server is pinged here to fall back to
+    direct scoring when Redis is unreachable at startup.
+    """
+    if not MICRO_BATCH_ENABLED:
+        return None
+
+    try:
+        import redis
+
+        client = redis.Redis.from_url(redis_url)
+        client.ping()
+        return MicroBatchBuffer(client)
+    except Exception as e:
+        logger.warning(f"Micro-batching disabled, Redis unavailable: {e!s}")
+        return None
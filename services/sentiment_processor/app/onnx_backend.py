@@ -0,0 +1,178 @@
+"""ONNX Runtime inference backend for FinBERT.
+
+Exports the PyTorch FinBERT model to ONNX once, applies dynamic int8
+quantization and serves logits through onnxruntime. The exported files are
+cached on disk, so the export cost is paid only on the first start (or at
+image build time via ``scripts/check_onnx_parity.py --export-only``).
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from services.common.app.config import ONNX_QUANTIZE
+from services.common.app.logging_config import get_logger
+
+logger = get_logger("sentiment_onnx_backend")
+
+try:
+    import numpy as np
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    ONNX_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"ONNX Runtime not available: {e}. The onnx backend is disabled.")
+    ONNX_AVAILABLE = False
+
+# Configuration
+ONNX_MODEL_DIR = os.getenv(
+    "SENTIMENT_ONNX_MODEL_DIR", os.path.expanduser("~/.cache/sentilyzer/onnx")
+)
+ONNX_NUM_THREADS = int(os.getenv("SENTIMENT_ONNX_NUM_THREADS", "0"))  # 0 = ORT default
+ONNX_OPSET = 17
+
+MODEL_INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+
+class OnnxFinBERTModel:
+    """FinBERT sequence classifier served through ONNX Runtime.
+
+    The model is exported from the Hugging Face PyTorch checkpoint with dynamic
+    batch and sequence axes, then optionally quantized to int8 weights.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        model_dir: str | None = None,
+        quantize: bool = ONNX_QUANTIZE,
+        num_threads: int = ONNX_NUM_THREADS,
+    ):
+        self.model_name = model_name
+        self.quantize = quantize
+        self.num_threads = num_threads
+        self.model_dir = Path(model_dir or ONNX_MODEL_DIR) / model_name.replace("/", "__")
+        self.fp32_path = self.model_dir / "model.onnx"
+        self.int8_path = self.model_dir / "model.int8.onnx"
+        self.session = None
+        self.input_names: list[str] = []
+
+    @property
+    def model_path(self) -> Path:
+        """Path of the ONNX file that will be served."""
+        return self.int8_path if self.quantize else self.fp32_path
+
+    def is_exported(self) -> bool:
+        """Return True if the served ONNX file already exists on disk."""
+        return self.model_path.exists()
+
+    def export(self, torch_model, tokenizer) -> None:
+        """Export a PyTorch FinBERT model to ONNX and quantize it if enabled.
+
+        Args:
+            torch_model: Loaded ``AutoModelForSequenceClassification`` instance.
+            tokenizer: The matching tokenizer, used to build the dummy input.
+        """
+        import torch
+
+        start_time = time.time()
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+
+        torch_model = torch_model.to("cpu").eval()
+        dummy = tokenizer(
+            ["Export sample for FinBERT."], return_tensors="pt", padding=True
+        )
+        input_names = [name for name in MODEL_INPUT_NAMES if name in dummy]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+
+        logger.info(f"Exporting {self.model_name} to ONNX: {self.fp32_path}")
+        with torch.no_grad():
+            torch.onnx.export(
+                torch_model,
+                tuple(dummy[name] for name in input_names),
+                str(self.fp32_path),
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=ONNX_OPSET,
+                do_constant_folding=True,
+            )
+
+        if self.quantize:
+            logger.info(f"Applying dynamic int8 quantization: {self.int8_path}")
+            quantize_dynamic(
+                str(self.fp32_path), str(self.int8_path), weight_type=QuantType.QInt8
+            )
+
+        logger.info(f"ONNX export finished in {time.time() - start_time:.2f} seconds")
+
+    def load(self) -> None:
+        """Create the ONNX Runtime inference session for the exported model."""
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.num_threads > 0:
+            options.intra_op_num_threads = self.num_threads
+
+        self.session = ort.InferenceSession(
+            str(self.model_path), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+        logger.info(f"ONNX Runtime session ready: {self.model_path}")
+
+    def predict_logits(self, inputs: dict[str, Any]):
+        """Run a tokenized batch (numpy arrays) and return the logits array."""
+        feed = {
+            name: np.asarray(inputs[name], dtype=np.int64) for name in self.input_names
+        }
+        (logits,) = self.session.run(["logits"], feed)
+        return logits
+
+
+def check_backend_parity(
+    reference,
+    candidate,
+    texts: list[str],
+    score_tolerance: float = 0.15,
+    min_label_agreement: float = 0.95,
+) -> dict[str, Any]:
+    """Compare two analyzers' predictions on the same texts.
+
+    Args:
+        reference: Analyzer used as ground truth (normally the torch backend).
+        candidate: Analyzer under test (normally the onnx backend).
+        texts: Texts to score with both analyzers.
+        score_tolerance: Maximum allowed absolute score difference on texts
+            where both analyzers agree on the label.
+        min_label_agreement: Minimum fraction of texts with identical labels.
+
+    Returns:
+        dict: Parity report with ``passed``, ``label_agreement``,
+            ``max_score_diff`` and the indices of mismatching texts.
+    """
+    reference_results = reference.predict_batch(texts)
+    candidate_results = candidate.predict_batch(texts)
+
+    label_mismatches = []
+    score_diffs = []
+    for idx, ((ref_score, ref_label), (cand_score, cand_label)) in enumerate(
+        zip(reference_results, candidate_results, strict=True)
+    ):
+        if ref_label != cand_label:
+            label_mismatches.append(idx)
+        else:
+            score_diffs.append(abs(ref_score - cand_score))
+
+    label_agreement = 1.0 - len(label_mismatches) / max(len(texts), 1)
+    max_score_diff = max(score_diffs, default=0.0)
+
+    return {
+        "passed": label_agreement >= min_label_agreement
+        and max_score_diff <= score_tolerance,
+        "texts": len(texts),
+        "label_agreement": label_agreement,
+        "max_score_diff": max_score_diff,
+        "label_mismatches": label_mismatches,
+    }
@@ -0,0 +1,82 @@
+"""Bulk persistence of sentiment scores.
+
+Writes a scored batch without the ORM unit of work: score rows go out as
+multi-row INSERTs and the processed flag is set in the same round trip. The
+hourly sentiment rollups and the processed-articles counter are updated in the
+same transaction.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+from sqlalchemy import insert, select, update
+
+from services.common.app.db.counters import PROCESSED_ARTICLES, increment_counters
+from services.common.app.db.models import RawArticle, SentimentScore
+from services.common.app.db.rollups import (
+    load_article_tickers,
+    rollup_deltas,
+    upsert_rollups,
+)
+
+# Rows per INSERT statement, keeps bind parameters well below PostgreSQL's limit
+INSERT_CHUNK_SIZE = 5000
+
+
+def save_sentiment_scores(
+    session, rows: list[dict[str, Any]], articles: Mapping[int, Any] | None = None
+) -> int:
+    """Insert sentiment score rows and flag their articles as processed.
+
+    On PostgreSQL each chunk is a single statement: a data-modifying CTE
+    inserts the scores with one multi-row INSERT and the outer UPDATE flags
+    exactly the articles it returned. Other dialects (SQLite in tests) use an
+    executemany INSERT followed by one UPDATE. The processed-articles counter
+    grows by the number of articles newly flagged, and when ``articles`` is
+    given the matching ``sentiment_rollups`` rows are incremented as well,
+    once per ticker of each article in ``article_tickers``. The caller commits.
+
+    Args:
+        session: Active SQLAlchemy session.
+        rows: Dicts with ``article_id``, ``published_at`` (the article's),
+            ``model_version``, ``sentiment_score`` and ``sentiment_label``.
+        articles: Scored articles by ID, providing ``ticker``, ``source`` and
+            ``published_at`` for the rollups. None skips the rollup update.
+
+    Returns:
+        int: Number of score rows written.
+    """
+    scores = SentimentScore.__table__
+    raw_articles = RawArticle.__table__
+    use_cte = session.get_bind().dialect.name == "postgresql"
+    newly_processed = 0
+
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = rows[start : start + INSERT_CHUNK_SIZE]
+
+        if use_cte:
+            inserted = (insert(scores).values(chunk).returning(scores.c.article_id)).cte(
+                "inserted_scores"
+            )
+            result = session.execute(
+                update(raw_articles)
+                .where(raw_articles.c.id.in_(select(inserted.c.article_id)))
+                .where(raw_articles.c.is_processed.is_(False))
+                .values(is_processed=True)
+            )
+        else:
+            session.execute(insert(scores), chunk)
+            result = session.execute(
+                update(raw_articles)
+                .where(raw_articles.c.id.in_([row["article_id"] for row in chunk]))
+                .where(raw_articles.c.is_processed.is_(False))
+                .values(is_processed=True)
+            )
+        newly_processed += result.rowcount
+
+    increment_counters(session, {PROCESSED_ARTICLES: newly_processed})
+    if articles is not None:
+        article_tickers = load_article_tickers(session, articles)
+        upsert_rollups(session, rollup_deltas(rows, articles, article_tickers))
+
+    return len(rows)
@@ -0,0 +1,139 @@
+"""Content-hash result cache for sentiment predictions.
+
+Wire services syndicate the same story under different URLs, so identical
+texts reach the worker many times. Results are cached under
+``(model_version, sha256(normalized text))`` in two tiers: an in-process LRU
+and an optional Redis tier shared by all workers.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from services.common.app.logging_config import get_logger
+
+logger = get_logger("sentiment_result_cache")
+
+# Configuration
+CACHE_ENABLED = os.getenv("SENTIMENT_CACHE_ENABLED", "true").lower() == "true"
+CACHE_LRU_SIZE = int(os.getenv("SENTIMENT_CACHE_LRU_SIZE", "50000"))
+CACHE_REDIS_URL = os.getenv("SENTIMENT_CACHE_REDIS_URL")  # Unset disables Redis tier
+CACHE_TTL_SECONDS = int(os.getenv("SENTIMENT_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+CACHE_KEY_PREFIX = "sentilyzer:sentiment:"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different copies share a cache entry.
+
+    FinBERT uses an uncased vocabulary, so lowercasing does not change the
+    model input; whitespace runs are collapsed for the same reason.
+    """
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+def result_cache_key(model_version: str, text: str) -> str:
+    """Build the cache key for a text scored by a given model version."""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model_version}:{digest}"
+
+
+class SentimentResultCache:
+    """Two-tier (in-process LRU + optional Redis) cache of sentiment results."""
+
+    def __init__(
+        self,
+        max_size: int = CACHE_LRU_SIZE,
+        redis_client=None,
+        ttl_seconds: int = CACHE_TTL_SECONDS,
+    ):
+        self.max_size = max_size
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self._local: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    def get_many(self, keys: list[str]) -> dict[str, tuple[float, str]]:
+        """Return cached results for the given keys, skipping the misses."""
+        found: dict[str, tuple[float, str]] = {}
+
+        with self._lock:
+            for key in keys:
+                if key in self._local:
+                    self._local.move_to_end(key)
+                    found[key] = self._local[key]
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing and self.redis is not None:
+            try:
+                values = self.redis.mget([CACHE_KEY_PREFIX + key for key in missing])
+                for key, raw in zip(missing, values, strict=True):
+                    if raw is not None:
+                        score, label = json.loads(raw)
+                        found[key] = (float(score), label)
+                        self._store_local(key, found[key])
+            except Exception as e:
+                logger.warning(f"Redis result cache lookup failed: {e!s}")
+
+        hit_count = sum(1 for key in keys if key in found)
+        self.hits += hit_count
+        self.misses += len(keys) - hit_count
+        return found
+
+    def set_many(self, results: dict[str, tuple[float, str]]) -> None:
+        """Store results in both tiers."""
+        if not results:
+            return
+
+        for key, result in results.items():
+            self._store_local(key, result)
+
+        if self.redis is not None:
+            try:
+                pipeline = self.redis.pipeline(transaction=False)
+                for key, (score, label) in results.items():
+                    pipeline.setex(
+                        CACHE_KEY_PREFIX + key,
+                        self.ttl_seconds,
+                        json.dumps([score, label]),
+                    )
+                pipeline.execute()
+            except Exception as e:
+                logger.warning(f"Redis result cache write failed: {e!s}")
+
+    def _store_local(self, key: str, result: tuple[float, str]) -> None:
+        with self._lock:
+            self._local[key] = result
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_size:
+                self._local.popitem(last=False)
+
+
+def build_result_cache() -> SentimentResultCache | None:
+    """Create the result cache from environment configuration.
+
+    Returns:
+        SentimentResultCache | None: The cache, or None when caching is disabled.
+    """
+    if not CACHE_ENABLED:
+        return None
+
+    redis_client = None
+    if CACHE_REDIS_URL:
+        try:
+            import redis
+
+            redis_client = redis.Redis.from_url(CACHE_REDIS_URL)
+        except Exception as e:
+            logger.warning(f"Redis result cache unavailable, using local LRU only: {e!s}")
+
+    return SentimentResultCache(redis_client=redis_client)
@@ -1,6 +1,7 @@
 import os
 import sys
 import time
+from datetime import datetime, timedelta, timezone
 
 # Redis and Celery imports
 from celery import Celery, Task
@@ -10,9 +11,31 @@ from sqlalchemy import and_
 # Add project root to path for imports for consistency
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 
-from services.common.app.db.models import RawArticle, SentimentScore
+from services.common.app.archive import archive_old_articles
+from services.common.app.config import (
+    INFERENCE_BACKEND,
+    ONNX_QUANTIZE,
+    model_version_name,
+)
+from services.common.app.db.counters import (
+    ERROR_ARTICLES,
+    increment_counters,
+    reconcile_counters,
+)
+from services.common.app.db.models import RawArticle
+from services.common.app.db.partitions import maintain_partitions
 from services.common.app.db.session import create_db_session
 from services.common.app.logging_config import configure_logging, get_logger
+from services.sentiment_processor.app.micro_batching import build_micro_batch_buffer
+from services.sentiment_processor.app.onnx_backend import (
+    ONNX_AVAILABLE,
+    OnnxFinBERTModel,
+)
+from services.sentiment_processor.app.persistence import save_sentiment_scores
+from services.sentiment_processor.app.result_cache import (
+    build_result_cache,
+    result_cache_key,
+)
 
 # Configure logging
 configure_logging(service_name="sentiment_worker")
@@ -28,11 +51,26 @@ celery_app = Celery("sentiment_worker", broker=REDIS_URL, backend=REDIS_URL)
 # Global model instance (loaded once at startup)
 sentiment_analyzer = None
 
+# Cross-task micro-batching buffer (None when disabled)
+micro_batch_buffer = build_micro_batch_buffer(REDIS_URL)
+
+# Work mode: "push" scores ID lists sent by the ingestor, "pull" claims pending
+# rows straight from raw_articles with SELECT ... FOR UPDATE SKIP LOCKED
+PULL_BATCH_SIZE = int(os.getenv("SENTIMENT_PULL_BATCH_SIZE", "64"))
+PULL_MAX_BATCHES = int(os.getenv("SENTIMENT_PULL_MAX_BATCHES", "50"))
+# Age after which the periodic sweep scores an article nobody scored yet
+PENDING_GRACE_SECONDS = float(os.getenv("SENTIMENT_PENDING_GRACE_SECONDS", "600"))
+
 # Constants for sentiment analysis
 BATCH_SIZE = 10
 MAX_RETRIES = 3
 RETRY_DELAY = 60
 
+# Length-aware batching: texts are grouped by token length and each model
+# batch is filled up to a padded-token budget instead of a fixed text count.
+LENGTH_BUCKETING = os.getenv("SENTIMENT_LENGTH_BUCKETING", "true").lower() == "true"
+MAX_BATCH_TOKENS = int(os.getenv("SENTIMENT_MAX_BATCH_TOKENS", "8192"))
+
 # Initialize ML model
 try:
     import torch
@@ -44,20 +82,67 @@ except ImportError as e:
     MODEL_AVAILABLE = False
 
 
+def build_token_budget_batches(
+    lengths: list[int], max_batch_tokens: int
+) -> list[list[int]]:
+    """Group text indices into batches whose padded size fits a token budget.
+
+    Indices are ordered by token length so that every batch pads to a similar
+    length. A batch is closed once adding the next text would push
+    ``len(batch) * longest_in_batch`` past ``max_batch_tokens``; a text that
+    alone exceeds the budget still gets a batch of its own.
+
+    Args:
+        lengths: Token length of each text, in the original order.
+        max_batch_tokens: Upper bound on padded tokens per batch.
+
+    Returns:
+        list[list[int]]: Batches of indices into ``lengths``.
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+
+    for idx in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+        # Sorted ascending, so the newest text is always the longest in the batch
+        if current and lengths[idx] * (len(current) + 1) > max_batch_tokens:
+            batches.append(current)
+            current = []
+        current.append(idx)
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
 class FinBERTBatchAnalyzer:
     """Production-ready FinBERT sentiment analyzer optimized for batch processing.
 
     Model is loaded once and kept in memory for efficient batch processing.
+    The ``backend`` selects eager PyTorch ("torch") or an ONNX Runtime export
+    of the same checkpoint ("onnx"); both share tokenization and batching.
+    ``quantize`` picks the int8 or fp32 ONNX model (default
+    ``SENTIMENT_ONNX_QUANTIZE``).
     """
 
-    def __init__(self, model_name: str = "ProsusAI/finbert"):
+    def __init__(
+        self,
+        model_name: str = "ProsusAI/finbert",
+        backend: str | None = None,
+        quantize: bool | None = None,
+    ):
         self.model_name = model_name
-        self.model_version = "finbert-v1.0"
+        self.backend = (backend or INFERENCE_BACKEND).lower()
+        self.quantize = ONNX_QUANTIZE if quantize is None else quantize
+        self.model_version = model_version_name(self.backend, self.quantize)
         self.tokenizer = None
         self.model = None
         self.device = None
         self.max_length = 512
         self.batch_size = 16  # Optimized for batch processing
+        self.length_bucketing = LENGTH_BUCKETING
+        self.max_batch_tokens = MAX_BATCH_TOKENS
+        self.result_cache = build_result_cache()
 
         # Label mapping
         self.label_map = {0: "positive", 1: "negative", 2: "neutral"}
@@ -84,11 +169,14 @@ class FinBERTBatchAnalyzer:
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
 
             # Load model
-            self.model = AutoModelForSequenceClassification.from_pretrained(
-                self.model_name
-            )
-            self.model.to(self.device)
-            self.model.eval()  # Set to evaluation mode
+            if self.backend == "onnx":
+                self.model = self._load_onnx_model()
+            else:
+                self.model = AutoModelForSequenceClassification.from_pretrained(
+                    self.model_name
+                )
+                self.model.to(self.device)
+                self.model.eval()  # Set to evaluation mode
 
             # Test inference to warm up the model
             test_text = "The market is showing positive trends."
@@ -103,6 +191,25 @@ class FinBERTBatchAnalyzer:
             self.model = None
             self.tokenizer = None
 
+    def _load_onnx_model(self) -> OnnxFinBERTModel:
+        """Load the ONNX Runtime model, exporting it from PyTorch on first use."""
+        if not ONNX_AVAILABLE:
+            raise RuntimeError("onnxruntime is not installed")
+
+        onnx_model = OnnxFinBERTModel(self.model_name, quantize=self.quantize)
+        if not onnx_model.is_exported():
+            torch_model = AutoModelForSequenceClassification.from_pretrained(
+                self.model_name
+            )
+            onnx_model.export(torch_model, self.tokenizer)
+        onnx_model.load()
+        return onnx_model
+
+    @property
+    def _tensor_type(self) -> str:
+        """Tensor type the tokenizer should return for the active backend."""
+        return "np" if self.backend == "onnx" else "pt"
+
     def _predict_single(self, text: str) -> tuple[float, str]:
         """Single text prediction using FinBERT."""
         if not self.model or not self.tokenizer:
@@ -112,31 +219,14 @@ class FinBERTBatchAnalyzer:
             # Tokenize
             inputs = self.tokenizer(
                 text,
-                return_tensors="pt",
+                return_tensors=self._tensor_type,
                 truncation=True,
                 padding=True,
                 max_length=self.max_length,
             )
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
 
             # Predict
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits = outputs.logits
-                confidence, predicted = torch.max(logits, 1)
-
-                confidence_score = confidence.item()
-                predicted_label = self.label_map[int(predicted.item())]
-
-                # Convert to sentiment score (-1 to 1 range)
-                if predicted_label == "positive":
-                    sentiment_score = confidence_score
-                elif predicted_label == "negative":
-                    sentiment_score = -confidence_score
-                else:  # neutral
-                    sentiment_score = 0.0
-
-                return sentiment_score, predicted_label
+            return self._run_model(inputs)[0]
 
         except Exception as e:
             logger.error(f"Error in FinBERT prediction: {e!s}")
@@ -153,12 +243,10 @@ class FinBERTBatchAnalyzer:
         try:
             logger.info(f"Processing batch of {len(texts)} texts")
 
-            # Process in chunks if batch is too large
-            results = []
-            for i in range(0, len(texts), self.batch_size):
-                chunk = texts[i : i + self.batch_size]
-                chunk_results = self._process_chunk(chunk)
-                results.extend(chunk_results)
+            if self.result_cache is not None:
+                results = self._predict_cached(texts)
+            else:
+                results = self._predict_with_model(texts)
 
             logger.info(f"Successfully processed batch of {len(texts)} texts")
             return results
@@ -167,6 +255,70 @@ class FinBERTBatchAnalyzer:
             logger.error(f"Error in batch prediction: {e!s}")
             return [self._fallback_sentiment(text) for text in texts]
 
+    def _predict_cached(self, texts: list[str]) -> list[tuple[float, str]]:
+        """Serve texts from the result cache and send only misses to the model.
+
+        Each distinct uncached text is scored once, even when it appears several
+        times in the batch. Fallback results are never cached.
+        """
+        keys = [result_cache_key(self.model_version, text) for text in texts]
+        cached = self.result_cache.get_many(keys)
+
+        pending: dict[str, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key not in cached and key not in pending:
+                pending[key] = text
+
+        logger.info(
+            f"Result cache: {len(texts) - len(pending)} of {len(texts)} texts "
+            f"served without inference"
+        )
+
+        if pending:
+            scored = self._predict_with_model(list(pending.values()))
+            new_results = dict(zip(pending.keys(), scored, strict=True))
+            self.result_cache.set_many(new_results)
+            cached.update(new_results)
+
+        return [cached[key] for key in keys]
+
+    def _predict_with_model(self, texts: list[str]) -> list[tuple[float, str]]:
+        """Run texts through the model, raising on inference errors."""
+        if self.length_bucketing:
+            return self._process_length_bucketed(texts)
+
+        # Process in fixed-size chunks, in arrival order
+        results = []
+        for i in range(0, len(texts), self.batch_size):
+            chunk = texts[i : i + self.batch_size]
+            chunk_results = self._process_chunk(chunk)
+            results.extend(chunk_results)
+        return results
+
+    def _process_length_bucketed(self, texts: list[str]) -> list[tuple[float, str]]:
+        """Process texts in token-budget batches of similar length.
+
+        Texts are tokenized once without padding, grouped by token length and
+        padded per batch, so short headlines never pay for a long article's
+        attention cost. Results are returned in the original order.
+        """
+        encodings = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        lengths = [len(input_ids) for input_ids in encodings["input_ids"]]
+
+        results: list[tuple[float, str]] = [(0.0, "neutral")] * len(texts)
+        for batch_indices in build_token_budget_batches(lengths, self.max_batch_tokens):
+            features = [
+                {key: encodings[key][idx] for key in encodings} for idx in batch_indices
+            ]
+            inputs = self.tokenizer.pad(
+                features, padding=True, return_tensors=self._tensor_type
+            )
+            batch_results = self._run_model(inputs)
+            for idx, result in zip(batch_indices, batch_results, strict=True):
+                results[idx] = result
+
+        return results
+
     def _process_chunk(self, texts: list[str]) -> list[tuple[float, str]]:
         """Process a chunk of texts through the model."""
         if not self.model or not self.tokenizer:
@@ -175,11 +327,24 @@ class FinBERTBatchAnalyzer:
         # Tokenize batch
         inputs = self.tokenizer(
             texts,
-            return_tensors="pt",
+            return_tensors=self._tensor_type,
             truncation=True,
             padding=True,
             max_length=self.max_length,
         )
+        return self._run_model(inputs)
+
+    def _run_model(self, inputs) -> list[tuple[float, str]]:
+        """Run one padded batch through the model and map logits to results."""
+        if self.backend == "onnx":
+            logits = self.model.predict_logits(inputs)
+            return [
+                self._to_sentiment(float(conf), int(pred))
+                for conf, pred in zip(
+                    logits.max(axis=1), logits.argmax(axis=1), strict=True
+                )
+            ]
+
         inputs = {k: v.to(self.device) for k, v in inputs.items()}
 
         # Predict batch
@@ -188,22 +353,26 @@ class FinBERTBatchAnalyzer:
             logits = outputs.logits
             confidences, predicted_labels = torch.max(logits, 1)
 
-            results = []
-            for conf, pred in zip(confidences, predicted_labels, strict=False):
-                confidence_score = conf.item()
-                predicted_label = self.label_map[int(pred.item())]
+            return [
+                self._to_sentiment(conf.item(), int(pred.item()))
+                for conf, pred in zip(confidences, predicted_labels, strict=True)
+            ]
 
-                # Convert to sentiment score
-                if predicted_label == "positive":
-                    sentiment_score = confidence_score
-                elif predicted_label == "negative":
-                    sentiment_score = -confidence_score
-                else:  # neutral
-                    sentiment_score = 0.0
+    def _to_sentiment(
+        self, confidence_score: float, label_index: int
+    ) -> tuple[float, str]:
+        """Convert a model confidence and label index to a (score, label) pair."""
+        predicted_label = self.label_map[label_index]
 
-                results.append((sentiment_score, predicted_label))
+        # Convert to sentiment score (-1 to 1 range)
+        if predicted_label == "positive":
+            sentiment_score = confidence_score
+        elif predicted_label == "negative":
+            sentiment_score = -confidence_score
+        else:  # neutral
+            sentiment_score = 0.0
 
-            return results
+        return sentiment_score, predicted_label
 
     def _fallback_sentiment(self, text: str) -> tuple[float, str]:
         """Fallback keyword-based sentiment analysis when FinBERT is not available."""
@@ -285,20 +454,84 @@ def worker_ready_handler(sender, **kwargs):
 def process_sentiment_batch(self: Task, article_ids: list[int]):
     """Celery task to process a batch of articles for sentiment analysis.
 
+    When micro-batching is enabled, batches smaller than the buffer size are
+    added to the shared buffer and scored together with other small tasks.
+
     Args:
         self (Task): The Celery Task instance.
         article_ids (list[int]): A list of article IDs to process.
     """
-    global sentiment_analyzer
-
     if not article_ids:
         logger.warning("Received empty article_ids list")
         return {"status": "success", "processed": 0, "message": "Empty batch"}
 
+    if (
+        micro_batch_buffer is not None
+        and len(article_ids) < micro_batch_buffer.max_articles
+    ):
+        return buffer_articles(article_ids)
+
+    return score_article_batch(article_ids)
+
+
+@celery_app.task(name="services.sentiment_processor.app.worker.flush_sentiment_buffer")
+def flush_sentiment_buffer():
+    """Celery task that drains the micro-batch buffer into one model pass."""
+    if micro_batch_buffer is None:
+        return {"status": "success", "processed": 0, "message": "Micro-batching disabled"}
+
+    article_ids, remaining = micro_batch_buffer.drain()
+
+    # IDs beyond one full batch get a window (and flush) of their own
+    if remaining and micro_batch_buffer.open_window():
+        flush_sentiment_buffer.apply_async(queue=SENTIMENT_BATCH_QUEUE)
+
+    if not article_ids:
+        return {"status": "success", "processed": 0, "message": "Buffer empty"}
+
+    logger.info(f"Flushing micro-batch of {len(article_ids)} articles")
+    return score_article_batch(article_ids)
+
+
+def buffer_articles(article_ids: list[int]) -> dict:
+    """Add a small batch to the micro-batch buffer, flushing it once full.
+
+    The source task is acknowledged as soon as its IDs are in Redis, not once
+    they are scored: the articles stay ``is_processed = false`` until a flush
+    scores them, scoring errors are handled by the flush, and IDs of a lost
+    flush are picked up by ``sweep_sentiment_buffer``.
+    """
+    if micro_batch_buffer.add(article_ids):
+        # First IDs of a new window: make sure they are flushed within max_wait
+        flush_sentiment_buffer.apply_async(
+            countdown=micro_batch_buffer.max_wait_seconds, queue=SENTIMENT_BATCH_QUEUE
+        )
+
+    if micro_batch_buffer.is_full():
+        return flush_sentiment_buffer()
+
+    logger.info(f"Buffered {len(article_ids)} articles for micro-batching")
+    return {"status": "buffered", "processed": 0, "article_ids": article_ids}
+
+
+def score_article_batch(article_ids: list[int]) -> dict:
+    """Fetch, score and persist a batch of articles.
+
+    Rows are locked with ``FOR UPDATE SKIP LOCKED``, so two tasks that carry
+    the same IDs can never score the same article twice. If scoring fails,
+    only the rows this task locked are flagged as errored.
+
+    Args:
+        article_ids (list[int]): A list of article IDs to process.
+
+    Returns:
+        dict: Task result with the status and number of processed articles.
+    """
     logger.info(
         f"Starting batch processing for {len(article_ids)} articles: {article_ids}"
     )
 
+    fetched_ids: list[int] = []
     try:
         # Step 1: Batch fetch articles from database
         session = create_db_session()
@@ -313,8 +546,10 @@ def process_sentiment_batch(self: Task, article_ids: list[int]):
                         RawArticle.has_error.is_(False),
                     )
                 )
+                .with_for_update(skip_locked=True)
                 .all()
             )
+            fetched_ids = [article.id for article in articles]
 
             if not articles:
                 logger.warning(f"No valid articles found for IDs: {article_ids}")
@@ -325,112 +560,276 @@ def process_sentiment_batch(self: Task, article_ids: list[int]):
                 }
 
             logger.info(f"Fetched {len(articles)} articles from database")
+            return _score_and_save(session, articles)
 
-            # Step 2: Prepare texts for batch analysis
-            article_texts = []
-            article_map = {}  # Map index to article for result matching
-
-            for idx, article in enumerate(articles):
-                # Combine headline and article_text for better sentiment analysis
-                combined_text = f"{article.headline} {article.article_text}"
-                article_texts.append(combined_text)
-                article_map[idx] = article
-
-            # Step 3: Batch sentiment analysis
-            if not sentiment_analyzer:
-                raise Exception("Sentiment analyzer not initialized")
+        finally:
+            session.close()
 
-            logger.info(
-                f"Starting batch sentiment analysis for {len(article_texts)} texts"
-            )
-            sentiment_results = sentiment_analyzer.predict_batch(article_texts)
+    except Exception as e:
+        # Rows skipped as locked or already processed belong to other tasks
+        return _mark_batch_failed(fetched_ids, e)
 
-            # Step 4: Prepare bulk insert data
-            sentiment_records = []
-            processed_article_ids = []
 
-            for idx, (sentiment_score, sentiment_label) in enumerate(sentiment_results):
-                article = article_map[idx]
+def claim_pending_articles(
+    session, limit: int, created_before: datetime | None = None
+) -> list[RawArticle]:
+    """Lock up to ``limit`` pending articles that no other worker holds.
 
-                # Create sentiment score record
-                sentiment_record = SentimentScore(
-                    article_id=article.id,
-                    model_version=sentiment_analyzer.model_version,
-                    sentiment_score=sentiment_score,
-                    sentiment_label=sentiment_label,
-                )
-                sentiment_records.append(sentiment_record)
-                processed_article_ids.append(article.id)
+    ``FOR UPDATE SKIP LOCKED`` lets concurrent workers claim disjoint rows
+    without waiting on each other; the locks are held until the scoring
+    transaction commits or rolls back. SQLite ignores the locking clause.
 
-            # Step 5: Bulk save to database
-            if sentiment_records:
-                # Add all sentiment scores in one transaction
-                session.add_all(sentiment_records)
+    Args:
+        session: Active SQLAlchemy session.
+        limit: Maximum number of rows to claim.
+        created_before: Only claim articles stored before this time.
+    """
+    filters = [RawArticle.is_processed.is_(False), RawArticle.has_error.is_(False)]
+    if created_before is not None:
+        filters.append(RawArticle.created_at < created_before)
+    return (
+        session.query(RawArticle)
+        .filter(and_(*filters))
+        .order_by(RawArticle.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
 
-                # Update processed articles
-                session.query(RawArticle).filter(
-                    RawArticle.id.in_(processed_article_ids)
-                ).update({"is_processed": True}, synchronize_session=False)
 
-                session.commit()
+def claim_and_score_batch(
+    limit: int = PULL_BATCH_SIZE, created_before: datetime | None = None
+) -> dict:
+    """Claim one batch of pending articles, score it and commit.
 
-                logger.info(
-                    f"Successfully processed and saved {len(sentiment_records)} sentiment analyses"
-                )
+    Returns:
+        dict: Task result, with ``claimed`` set to the number of rows locked.
+    """
+    claimed_ids: list[int] = []
+    try:
+        session = create_db_session()
+        try:
+            articles = claim_pending_articles(session, limit, created_before)
+            claimed_ids = [article.id for article in articles]
+            if not articles:
+                return {"status": "success", "processed": 0, "claimed": 0}
 
-                return {
-                    "status": "success",
-                    "processed": len(sentiment_records),
-                    "article_ids": processed_article_ids,
-                }
-            else:
-                logger.warning("No sentiment records to save")
-                return {
-                    "status": "success",
-                    "processed": 0,
-                    "message": "No records to save",
-                }
+            logger.info(f"Claimed {len(articles)} pending articles")
+            return {**_score_and_save(session, articles), "claimed": len(articles)}
 
         finally:
             session.close()
 
     except Exception as e:
-        # Robust error handling - Poison Pill Prevention
-        logger.error(f"Error processing batch {article_ids}: {e!s}", exc_info=True)
+        return {**_mark_batch_failed(claimed_ids, e), "claimed": len(claimed_ids)}
 
-        try:
-            # Mark all articles in this batch as having errors
-            session = create_db_session()
-            try:
-                updated_count = (
-                    session.query(RawArticle)
-                    .filter(RawArticle.id.in_(article_ids))
-                    .update({"has_error": True}, synchronize_session=False)
-                )
-                session.commit()
 
-                logger.info(
-                    f"Marked {updated_count} articles as having errors to prevent reprocessing"
-                )
+@celery_app.task(name="services.sentiment_processor.app.worker.drain_pending_articles")
+def drain_pending_articles(max_batches: int = PULL_MAX_BATCHES):
+    """Celery task that claims and scores pending articles until none are left.
 
-            finally:
-                session.close()
+    This is the pull-mode counterpart of ``process_sentiment_batch``: the task
+    carries no IDs, so any number of workers can run it concurrently and each
+    one works through its own disjoint set of rows.
+
+    Args:
+        max_batches (int): Upper bound on batches claimed by one task run.
+    """
+    processed = 0
+    for _ in range(max_batches):
+        result = claim_and_score_batch(PULL_BATCH_SIZE)
+        processed += result.get("processed", 0)
+        if result["status"] != "success" or result["claimed"] < PULL_BATCH_SIZE:
+            break
+
+    logger.info(f"Pull mode drained {processed} articles")
+    return {"status": "success", "processed": processed}
 
-        except Exception as db_error:
-            logger.error(
-                f"Failed to update error status for articles {article_ids}: {db_error!s}"
-            )
 
-        # Don't raise the exception - this prevents the task from being retried
-        # and becoming a "poison pill" that blocks the queue
+@celery_app.task(name="services.sentiment_processor.app.worker.sweep_sentiment_buffer")
+def sweep_sentiment_buffer(max_batches: int = PULL_MAX_BATCHES):
+    """Celery task that scores articles whose flush or batch task was lost.
+
+    Drains the micro-batch buffer, whose delayed flush may never have run,
+    then claims articles still pending ``PENDING_GRACE_SECONDS`` after they
+    were stored, e.g. because a worker died between draining and committing.
+    Row locks keep this from scoring an article a regular task is scoring.
+
+    Args:
+        max_batches (int): Upper bound on batches scored by each of the two steps.
+    """
+    processed = 0
+    if micro_batch_buffer is not None:
+        for _ in range(max_batches):
+            article_ids, remaining = micro_batch_buffer.drain()
+            if article_ids:
+                processed += score_article_batch(article_ids).get("processed", 0)
+            if not remaining:
+                break
+
+    created_before = datetime.now(timezone.utc) - timedelta(seconds=PENDING_GRACE_SECONDS)
+    for _ in range(max_batches):
+        result = claim_and_score_batch(PULL_BATCH_SIZE, created_before)
+        processed += result.get("processed", 0)
+        if result["status"] != "success" or result["claimed"] < PULL_BATCH_SIZE:
+            break
+
+    if processed:
+        logger.warning(f"Sweep scored {processed} articles left behind by lost tasks")
+    return {"status": "success", "processed": processed}
+
+
+@celery_app.task(name="services.sentiment_processor.app.worker.reconcile_system_counters")
+def reconcile_system_counters():
+    """Celery task that resets the cached system counters to exact counts."""
+    session = create_db_session()
+    try:
+        counters = reconcile_counters(session)
+        session.commit()
+        return {"status": "success", "counters": counters}
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error reconciling system counters: {e!s}")
+        return {"status": "error", "error": str(e)}
+    finally:
+        session.close()
+
+
+@celery_app.task(name="services.sentiment_processor.app.worker.maintain_table_partitions")
+def maintain_table_partitions():
+    """Celery task that creates upcoming monthly partitions and detaches old ones."""
+    session = create_db_session()
+    try:
+        result = maintain_partitions(session)
+        session.commit()
+        return {"status": "success", **result}
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error maintaining table partitions: {e!s}")
+        return {"status": "error", "error": str(e)}
+    finally:
+        session.close()
+
+
+@celery_app.task(name="services.sentiment_processor.app.worker.archive_articles")
+def archive_articles():
+    """Celery task that moves articles past the archive horizon to Parquet."""
+    session = create_db_session()
+    try:
+        archived = archive_old_articles(session)
+        return {"status": "success", "archived": archived}
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error archiving articles: {e!s}")
+        return {"status": "error", "error": str(e)}
+    finally:
+        session.close()
+
+
+def _score_and_save(session, articles: list[RawArticle]) -> dict:
+    """Score already fetched (and locked) articles and commit the results."""
+    # Step 2: Prepare texts for batch analysis
+    article_texts = []
+    article_map = {}  # Map index to article for result matching
+
+    for idx, article in enumerate(articles):
+        # Combine headline and article_text for better sentiment analysis
+        combined_text = f"{article.headline} {article.article_text}"
+        article_texts.append(combined_text)
+        article_map[idx] = article
+
+    # Step 3: Batch sentiment analysis
+    if not sentiment_analyzer:
+        raise Exception("Sentiment analyzer not initialized")
+
+    logger.info(f"Starting batch sentiment analysis for {len(article_texts)} texts")
+    sentiment_results = sentiment_analyzer.predict_batch(article_texts)
+
+    # Step 4: Prepare bulk insert data
+    sentiment_records = []
+    processed_article_ids = []
+
+    for idx, (sentiment_score, sentiment_label) in enumerate(sentiment_results):
+        article = article_map[idx]
+
+        # Plain row dicts, written without the ORM unit of work
+        sentiment_records.append(
+            {
+                "article_id": article.id,
+                "published_at": article.published_at,
+                "model_version": sentiment_analyzer.model_version,
+                "sentiment_score": sentiment_score,
+                "sentiment_label": sentiment_label,
+            }
+        )
+        processed_article_ids.append(article.id)
+
+    # Step 5: Bulk save to database
+    if sentiment_records:
+        # Insert scores, flag articles as processed and update the rollups
+        # in one transaction
+        save_sentiment_scores(
+            session, sentiment_records, {article.id: article for article in articles}
+        )
+        session.commit()
+
+        logger.info(
+            f"Successfully processed and saved {len(sentiment_records)} sentiment analyses"
+        )
+
+        return {
+            "status": "success",
+            "processed": len(sentiment_records),
+            "article_ids": processed_article_ids,
+        }
+    else:
+        logger.warning("No sentiment records to save")
         return {
-            "status": "error",
+            "status": "success",
             "processed": 0,
-            "error": str(e),
-            "article_ids": article_ids,
+            "message": "No records to save",
         }
 
 
+def _mark_batch_failed(article_ids: list[int], error: Exception) -> dict:
+    """Flag a failed batch's articles as errored so they are not retried forever."""
+    # Robust error handling - Poison Pill Prevention
+    logger.error(f"Error processing batch {article_ids}: {error!s}", exc_info=True)
+
+    try:
+        # Mark all articles in this batch as having errors
+        session = create_db_session()
+        try:
+            updated_count = (
+                session.query(RawArticle)
+                .filter(RawArticle.id.in_(article_ids), RawArticle.has_error.is_(False))
+                .update({"has_error": True}, synchronize_session=False)
+            )
+            increment_counters(session, {ERROR_ARTICLES: updated_count})
+            session.commit()
+
+            logger.info(
+                f"Marked {updated_count} articles as having errors to prevent reprocessing"
+            )
+
+        finally:
+            session.close()
+
+    except Exception as db_error:
+        logger.error(
+            f"Failed to update error status for articles {article_ids}: {db_error!s}"
+        )
+
+    # Don't raise the exception - this prevents the task from being retried
+    # and becoming a "poison pill" that blocks the queue
+    return {
+        "status": "error",
+        "processed": 0,
+        "error": str(error),
+        "article_ids": article_ids,
+    }
+
+
 if __name__ == "__main__":
     # Start the Celery worker
     logger.info("Starting Celery worker for sentiment batch processing")
@@ -0,0 +1,168 @@
+"""Time-bucketed sentiment aggregation for the Signals API.
+
+Buckets are computed in SQL so that only one row per ticker and bucket
+leaves the database. Hourly and daily buckets are summed from the hourly
+``sentiment_rollups``; 5 minute buckets are grouped from the fact tables.
+Both count an article under every ticker it has in ``article_tickers``, the
+same rows ``/v1/signals`` returns, and only scores of one model version.
+PostgreSQL uses ``date_trunc`` for hourly and daily buckets and epoch
+arithmetic for 5 minute buckets; SQLite (tests) uses epoch arithmetic for all
+of them.
+"""
+
+from datetime import date, datetime, timezone
+
+from sqlalchemy import Float, Integer, and_, case, cast, func, literal_column, select
+
+from services.common.app.db.models import (
+    ARTICLE_SCORE_JOIN,
+    ARTICLE_TICKER_JOIN,
+    ArticleTicker,
+    RawArticle,
+    SentimentRollup,
+    SentimentScore,
+)
+
+BUCKET_SECONDS = {"5m": 300, "1h": 3600, "1d": 86400}
+
+# Buckets that are whole multiples of the hourly rollups
+ROLLUP_BUCKETS = {"1h", "1d"}
+
+# date_trunc field for buckets that match a PostgreSQL truncation unit
+_DATE_TRUNC_FIELDS = {"1h": "hour", "1d": "day"}
+
+
+def bucket_expression(column, bucket: str, dialect_name: str):
+    """Return a SQL expression truncating a timestamp column to its bucket start.
+
+    Constants are inlined rather than bound, so the expression in the SELECT
+    list and in the GROUP BY clause compile to identical SQL.
+    """
+    seconds = literal_column(str(BUCKET_SECONDS[bucket]))
+    if dialect_name == "postgresql":
+        if bucket in _DATE_TRUNC_FIELDS:
+            # Truncate in UTC rather than in the session time zone
+            field = literal_column(f"'{_DATE_TRUNC_FIELDS[bucket]}'")
+            return func.date_trunc(field, func.timezone(literal_column("'UTC'"), column))
+        epoch = func.extract("epoch", column)
+        return func.to_timestamp(func.floor(epoch / seconds) * seconds)
+
+    epoch = cast(func.strftime(literal_column("'%s'"), column), Integer)
+    bucket_index = cast(epoch / seconds, Integer)  # Truncation == floor after 1970
+    return func.datetime(bucket_index * seconds, literal_column("'unixepoch'"))
+
+
+def aggregate_query(
+    tickers: list[str],
+    bucket: str,
+    start_date: date,
+    end_date: date,
+    dialect_name: str,
+    model_version: str,
+):
+    """Build the per-ticker, per-bucket aggregation query over one model version.
+
+    The query returns ``ticker``, ``bucket_start``, ``mean_score``, ``count``
+    and the ``positive_count``, ``negative_count`` and ``neutral_count``
+    columns, ordered by ticker and bucket.
+    """
+    if bucket in ROLLUP_BUCKETS:
+        bucket_start = bucket_expression(SentimentRollup.hour, bucket, dialect_name)
+        bucket_start = bucket_start.label("bucket_start")
+        return (
+            select(
+                SentimentRollup.ticker,
+                bucket_start,
+                (
+                    cast(func.sum(SentimentRollup.score_sum), Float)
+                    / func.sum(SentimentRollup.score_count)
+                ).label("mean_score"),
+                func.sum(SentimentRollup.score_count).label("count"),
+                func.sum(SentimentRollup.positive_count).label("positive_count"),
+                func.sum(SentimentRollup.negative_count).label("negative_count"),
+                func.sum(SentimentRollup.neutral_count).label("neutral_count"),
+            )
+            .where(
+                and_(
+                    SentimentRollup.ticker.in_(tickers),
+                    SentimentRollup.hour >= start_date,
+                    SentimentRollup.hour <= end_date,
+                    SentimentRollup.model_version == model_version,
+                )
+            )
+            .group_by(SentimentRollup.ticker, bucket_start)
+            .having(func.sum(SentimentRollup.score_count) > 0)
+            .order_by(SentimentRollup.ticker, bucket_start)
+        )
+
+    bucket_start = bucket_expression(ArticleTicker.published_at, bucket, dialect_name)
+    bucket_start = bucket_start.label("bucket_start")
+
+    def label_count(label: str):
+        return func.sum(case((SentimentScore.sentiment_label == label, 1), else_=0))
+
+    return (
+        select(
+            ArticleTicker.ticker,
+            bucket_start,
+            func.avg(SentimentScore.sentiment_score).label("mean_score"),
+            func.count(SentimentScore.id).label("count"),
+            label_count("positive").label("positive_count"),
+            label_count("negative").label("negative_count"),
+            label_count("neutral").label("neutral_count"),
+        )
+        .select_from(ArticleTicker)
+        .join(RawArticle, ARTICLE_TICKER_JOIN)
+        .join(SentimentScore, ARTICLE_SCORE_JOIN)
+        .where(
+            and_(
+                ArticleTicker.ticker.in_(tickers),
+                ArticleTicker.published_at >= start_date,
+                ArticleTicker.published_at <= end_date,
+                # Repeated per table so PostgreSQL prunes each one's partitions
+                RawArticle.published_at >= start_date,
+                RawArticle.published_at <= end_date,
+                SentimentScore.published_at >= start_date,
+                SentimentScore.published_at <= end_date,
+                SentimentScore.model_version == model_version,
+                RawArticle.has_error.is_(False),
+            )
+        )
+        .group_by(ArticleTicker.ticker, bucket_start)
+        .order_by(ArticleTicker.ticker, bucket_start)
+    )
+
+
+def parse_bucket_start(value) -> datetime:
+    """Normalize a bucket start returned by the database to an aware UTC datetime."""
+    if isinstance(value, str):  # SQLite returns 'YYYY-MM-DD HH:MM:SS'
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def apply_decay(buckets: list[dict], bucket_seconds: int, half_life: float) -> None:
+    """Add an exponentially decayed mean score to consecutive buckets in place.
+
+    The decayed score is an exponential moving average of the bucket means.
+    Empty buckets between two rows still count as elapsed time, so an old
+    signal keeps fading while no articles arrive.
+
+    Args:
+        buckets: Bucket dicts of one ticker, sorted by ``bucket_start``.
+        bucket_seconds: Width of one bucket in seconds.
+        half_life: Half-life of the decay, in buckets.
+    """
+    retain = 0.5 ** (1.0 / half_life)  # Weight kept by the average per bucket
+    decayed = None
+    previous_start = None
+    for bucket in buckets:
+        if decayed is None:
+            decayed = bucket["mean_score"]
+        else:
+            elapsed = (bucket["bucket_start"] - previous_start).total_seconds()
+            kept = retain ** (elapsed / bucket_seconds)
+            decayed = kept * decayed + (1.0 - kept) * bucket["mean_score"]
+        bucket["decayed_score"] = decayed
+        previous_start = bucket["bucket_start"]
@@ -0,0 +1,197 @@
+"""TTL cache for API key authentication results.
+
+Every request authenticates its API key, and without a cache that costs a
+database round trip before the actual data query runs. Results are cached
+by key hash in an in-process LRU and, optionally, in Redis so that replicas
+share them:
+
+- Valid keys are cached for ``AUTH_CACHE_TTL_SECONDS``, but never beyond the
+  key's ``expires_at``.
+- Invalid, expired or inactive keys are cached for the shorter
+  ``AUTH_CACHE_NEGATIVE_TTL_SECONDS`` so that repeated bad keys stay cheap.
+- Revoked keys must be invalidated with ``invalidate_api_key``. It clears the
+  local entry and the shared Redis entry; other replicas drop their local
+  copy once its (short) TTL runs out.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+
+from services.common.app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Configuration
+AUTH_CACHE_ENABLED = os.getenv("AUTH_CACHE_ENABLED", "true").lower() == "true"
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_NEGATIVE_TTL_SECONDS = float(
+    os.getenv("AUTH_CACHE_NEGATIVE_TTL_SECONDS", "10")
+)
+AUTH_CACHE_REDIS_URL = os.getenv("AUTH_CACHE_REDIS_URL")  # Unset disables Redis tier
+AUTH_CACHE_KEY_PREFIX = "sentilyzer:auth:"
+
+
+def authenticated_entry(
+    user_id: int, email: str, key_expires_at: float | None = None
+) -> dict[str, Any]:
+    """Build the cache entry for a key that authenticated successfully.
+
+    Args:
+        user_id: ID of the user owning the key.
+        email: Email of the user owning the key.
+        key_expires_at: Key expiration as a UNIX timestamp, if any.
+    """
+    valid_until = time.time() + AUTH_CACHE_TTL_SECONDS
+    if key_expires_at is not None:
+        valid_until = min(valid_until, key_expires_at)
+    return {"user_id": user_id, "email": email, "error": None, "valid_until": valid_until}
+
+
+def rejected_entry(error: str) -> dict[str, Any]:
+    """Build the cache entry for a key that failed authentication."""
+    return {
+        "user_id": None,
+        "email": None,
+        "error": error,
+        "valid_until": time.time() + AUTH_CACHE_NEGATIVE_TTL_SECONDS,
+    }
+
+
+class AuthCache:
+    """Two-tier (in-process LRU + optional Redis) cache of authentication results."""
+
+    def __init__(self, max_size: int = AUTH_CACHE_MAX_SIZE, redis_client=None):
+        self.max_size = max_size
+        self.redis = redis_client
+        self._local: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    def get(self, key_hash: str) -> dict[str, Any] | None:
+        """Return the unexpired cache entry for a key hash, or None."""
+        entry = self._get_local(key_hash)
+        if entry is None and self.redis is not None:
+            entry = self._get_shared(key_hash)
+        return entry
+
+    async def aget(self, key_hash: str) -> dict[str, Any] | None:
+        """Async variant of ``get`` for request handlers.
+
+        Local hits return immediately; the blocking Redis lookup runs in the
+        thread pool so it does not stall the event loop.
+        """
+        entry = self._get_local(key_hash)
+        if entry is None and self.redis is not None:
+            entry = await run_in_threadpool(self._get_shared, key_hash)
+        return entry
+
+    def set(self, key_hash: str, entry: dict[str, Any]) -> None:
+        """Store an entry in both tiers until its ``valid_until`` time."""
+        ttl = entry["valid_until"] - time.time()
+        if ttl <= 0:
+            return
+
+        self._store_local(key_hash, entry)
+        if self.redis is not None:
+            self._set_shared(key_hash, entry, ttl)
+
+    async def aset(self, key_hash: str, entry: dict[str, Any]) -> None:
+        """Async variant of ``set``; the Redis write runs in the thread pool."""
+        ttl = entry["valid_until"] - time.time()
+        if ttl <= 0:
+            return
+
+        self._store_local(key_hash, entry)
+        if self.redis is not None:
+            await run_in_threadpool(self._set_shared, key_hash, entry, ttl)
+
+    def invalidate(self, key_hash: str) -> None:
+        """Drop a key hash from both tiers, e.g. after the key was revoked."""
+        with self._lock:
+            self._local.pop(key_hash, None)
+        if self.redis is not None:
+            try:
+                self.redis.delete(AUTH_CACHE_KEY_PREFIX + key_hash)
+            except Exception as e:
+                logger.warning(f"Redis auth cache invalidation failed: {e!s}")
+
+    def _get_local(self, key_hash: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._local.get(key_hash)
+            if entry is None:
+                return None
+            if entry["valid_until"] > time.time():
+                self._local.move_to_end(key_hash)
+                return entry
+            del self._local[key_hash]
+        return None
+
+    def _get_shared(self, key_hash: str) -> dict[str, Any] | None:
+        try:
+            raw = self.redis.get(AUTH_CACHE_KEY_PREFIX + key_hash)
+            if raw is not None:
+                entry = json.loads(raw)
+                if entry["valid_until"] > time.time():
+                    self._store_local(key_hash, entry)
+                    return entry
+        except Exception as e:
+            logger.warning(f"Redis auth cache lookup failed: {e!s}")
+        return None
+
+    def _set_shared(self, key_hash: str, entry: dict[str, Any], ttl: float) -> None:
+        try:
+            self.redis.setex(
+                AUTH_CACHE_KEY_PREFIX + key_hash, max(int(ttl), 1), json.dumps(entry)
+            )
+        except Exception as e:
+            logger.warning(f"Redis auth cache write failed: {e!s}")
+
+    def _store_local(self, key_hash: str, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._local[key_hash] = entry
+            self._local.move_to_end(key_hash)
+            while len(self._local) > self.max_size:
+                self._local.popitem(last=False)
+
+
+def build_auth_cache() -> AuthCache | None:
+    """Create the authentication cache from environment configuration.
+
+    Returns:
+        AuthCache | None: The cache, or None when caching is disabled.
+    """
+    if not AUTH_CACHE_ENABLED:
+        return None
+
+    redis_client = None
+    if AUTH_CACHE_REDIS_URL:
+        try:
+            import redis
+
+            redis_client = redis.Redis.from_url(AUTH_CACHE_REDIS_URL)
+        except Exception as e:
+            logger.warning(f"Redis auth cache unavailable, using local LRU only: {e!s}")
+
+    return AuthCache(redis_client=redis_client)
+
+
+# Process-wide cache used by the API's authentication dependency
+auth_cache = build_auth_cache()
+
+
+def invalidate_api_key(key_hash: str) -> None:
+    """Invalidation hook for revoked API keys.
+
+    Clears the key from this process and from the shared Redis tier.
+    """
+    if auth_cache is not None:
+        auth_cache.invalidate(key_hash)
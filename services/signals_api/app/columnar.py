@@ -0,0 +1,94 @@
+"""Columnar (Apache Arrow / Parquet) encoding of signals responses.
+
+Clients that load results into pandas or polars can ask for Arrow IPC or
+Parquet through the ``Accept`` header and skip JSON parsing entirely. The
+columns are built straight from the SQL result rows, without going through
+per-row ``SentimentData`` models.
+"""
+
+from services.common.app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    ARROW_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"pyarrow not available: {e}. Columnar responses are disabled.")
+    ARROW_AVAILABLE = False
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+# Accepted media types for each response format, in the order they are checked
+FORMAT_MEDIA_TYPES = {
+    "arrow": (ARROW_STREAM_MEDIA_TYPE,),
+    "parquet": (PARQUET_MEDIA_TYPE, "application/x-parquet"),
+}
+
+SIGNALS_COLUMNS = [
+    "ticker",
+    "article_url",
+    "headline",
+    "published_at",
+    "sentiment_score",
+    "sentiment_label",
+]
+
+
+def negotiate_format(accept: str | None) -> str:
+    """Pick the response format from an ``Accept`` header.
+
+    Returns:
+        str: ``"arrow"``, ``"parquet"`` or ``"json"``. The first columnar media
+            type listed by the client wins; anything else falls back to JSON.
+    """
+    for media_range in (accept or "").split(","):
+        media_type = media_range.split(";", 1)[0].strip().lower()
+        for response_format, media_types in FORMAT_MEDIA_TYPES.items():
+            if media_type in media_types:
+                return response_format
+    return "json"
+
+
+def signals_schema() -> "pa.Schema":
+    """Arrow schema of a signals response."""
+    return pa.schema(
+        [
+            ("ticker", pa.string()),
+            ("article_url", pa.string()),
+            ("headline", pa.string()),
+            ("published_at", pa.timestamp("us", tz="UTC")),
+            ("sentiment_score", pa.float64()),
+            ("sentiment_label", pa.string()),
+        ]
+    )
+
+
+def rows_to_table(rows) -> "pa.Table":
+    """Build an Arrow table from SQL result rows carrying ``SIGNALS_COLUMNS``."""
+    schema = signals_schema()
+    columns = [
+        pa.array([getattr(row, name) for row in rows], type=schema.field(name).type)
+        for name in SIGNALS_COLUMNS
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def encode_table(table: "pa.Table", response_format: str) -> tuple[bytes, str]:
+    """Serialize a table as an Arrow IPC stream or a Parquet file.
+
+    Returns:
+        tuple[bytes, str]: The encoded body and its media type.
+    """
+    sink = pa.BufferOutputStream()
+    if response_format == "parquet":
+        pq.write_table(table, sink, compression="zstd")
+        media_type = PARQUET_MEDIA_TYPE
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        media_type = ARROW_STREAM_MEDIA_TYPE
+    return sink.getvalue().to_pybytes(), media_type
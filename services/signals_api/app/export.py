@@ -0,0 +1,96 @@
+"""Streaming bulk export of sentiment signals.
+
+Rows are read through a server-side cursor in batches of
+``EXPORT_BATCH_SIZE`` and serialized batch by batch, so memory stays
+constant no matter how large the requested range is. Archived rows, read
+from Parquet one month at a time, follow the database rows.
+"""
+
+import csv
+import io
+import json
+import os
+from collections.abc import AsyncIterator, Iterable, Iterator
+from itertools import islice
+
+from starlette.concurrency import iterate_in_threadpool
+
+from services.common.app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+EXPORT_BATCH_SIZE = int(os.getenv("SIGNALS_EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_COLUMNS = [
+    "ticker",
+    "article_url",
+    "headline",
+    "published_at",
+    "sentiment_score",
+    "sentiment_label",
+]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _format_row(row) -> dict:
+    record = {column: getattr(row, column) for column in EXPORT_COLUMNS}
+    record["published_at"] = row.published_at.isoformat()
+    return record
+
+
+def _serialize(rows, export_format: str) -> str:
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+        writer.writerows(_format_row(row) for row in rows)
+        return buffer.getvalue()
+    return "".join(json.dumps(_format_row(row)) + "\n" for row in rows)
+
+
+def _batched(rows: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def stream_signal_rows(
+    session_factory, query, export_format: str, archived_rows: Iterable | None = None
+) -> AsyncIterator[str]:
+    """Execute a signals query and yield it serialized as NDJSON or CSV.
+
+    Args:
+        session_factory: Async sessionmaker. The stream opens its own session,
+            because it keeps running after the request's dependencies closed.
+        query: SELECT returning the ``EXPORT_COLUMNS``.
+        export_format: ``"ndjson"`` or ``"csv"``.
+        archived_rows: Optional blocking iterable of archived rows, streamed
+            after the database rows from a worker thread.
+
+    Yields:
+        str: Serialized chunks, one per fetched batch.
+    """
+    exported = 0
+    async with session_factory() as db:
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+            writer.writeheader()
+            yield buffer.getvalue()
+
+        async for partition in result.partitions():
+            exported += len(partition)
+            yield _serialize(partition, export_format)
+
+    if archived_rows is not None:
+        batches = _batched(archived_rows, EXPORT_BATCH_SIZE)
+        async for batch in iterate_in_threadpool(batches):
+            exported += len(batch)
+            yield _serialize(batch, export_format)
+
+    logger.info(f"Exported {exported} sentiment records as {export_format}")
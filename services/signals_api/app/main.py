@@ -5,28 +5,83 @@ This service provides endpoints for retrieving sentiment signals for stocks.
 
 import hashlib
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timezone
+from itertools import islice
 
 import uvicorn
-from fastapi import Depends, FastAPI, HTTPException, Request, Security, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Security, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
-from sqlalchemy import and_, desc, func
-from sqlalchemy.orm import Session
-
-from services.common.app.db.models import ApiKey, RawArticle, SentimentScore, User
-from services.common.app.db.session import get_db
+from sqlalchemy import and_, desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from services.common.app.archive import (
+    archive_enabled,
+    archive_horizon,
+    as_utc,
+    iter_archived_signals,
+    merge_newest_first,
+)
+from services.common.app.config import CURRENT_MODEL_VERSION
+from services.common.app.db.async_session import (
+    get_async_db,
+    get_async_db_factory,
+)
+from services.common.app.db.counters import (
+    ERROR_ARTICLES,
+    PROCESSED_ARTICLES,
+    TOTAL_ARTICLES,
+    counter_values,
+    counters_query,
+)
+from services.common.app.db.models import (
+    ARTICLE_SCORE_JOIN,
+    ARTICLE_TICKER_JOIN,
+    ApiKey,
+    ArticleTicker,
+    RawArticle,
+    SentimentScore,
+    User,
+)
 from services.common.app.logging_config import get_logger
 from services.common.app.schemas.sentiment import (
+    AggregateRequest,
+    AggregateResponse,
+    GroupedSignalsResponse,
     HealthResponse,
     SentimentData,
     SignalsRequest,
     SignalsResponse,
 )
+from services.signals_api.app.aggregation import (
+    BUCKET_SECONDS,
+    aggregate_query,
+    apply_decay,
+    parse_bucket_start,
+)
+from services.signals_api.app.auth_cache import (
+    auth_cache,
+    authenticated_entry,
+    rejected_entry,
+)
+from services.signals_api.app.columnar import (
+    ARROW_AVAILABLE,
+    encode_table,
+    negotiate_format,
+    rows_to_table,
+)
+from services.signals_api.app.export import EXPORT_MEDIA_TYPES, stream_signal_rows
+from services.signals_api.app.pagination import (
+    after_cursor,
+    decode_cursor,
+    encode_cursor,
+)
 
 # Configure logging for the service
 logger = get_logger(__name__)
@@ -37,6 +92,7 @@ security = HTTPBearer()
 # Environment variables
 API_HOST = os.getenv("API_HOST", "127.0.0.1")  # Default to localhost for security
 API_PORT = int(os.getenv("API_PORT", "8000"))
+MAX_AGGREGATE_BUCKETS = int(os.getenv("SIGNALS_MAX_AGGREGATE_BUCKETS", "100000"))
 
 # Rate limiter setup
 limiter = Limiter(key_func=get_remote_address)
@@ -73,49 +129,77 @@ credentials_exception = HTTPException(
 )
 
 
+async def authenticate_key_hash(db: AsyncSession, key_hash: str) -> dict:
+    """Look up an API key hash and its user in a single query.
+
+    Returns:
+        dict: An auth cache entry, either for the authenticated user or
+            carrying the reason the key was rejected.
+    """
+    record = (
+        await db.execute(
+            select(
+                ApiKey.id,
+                ApiKey.user_id,
+                ApiKey.expires_at,
+                User.email,
+                User.is_active,
+            )
+            .join(User, User.id == ApiKey.user_id)
+            .where(ApiKey.key_hash == key_hash)
+            .where(ApiKey.is_active.is_(True))
+        )
+    ).first()
+
+    if not record:
+        logger.warning(f"Invalid API key used: {key_hash[:8]}...")
+        return rejected_entry("Invalid or expired API key")
+
+    # Check if API key has an expiration date and if it's expired
+    key_expires_at = None
+    if record.expires_at is not None:
+        expires_at = record.expires_at
+        if expires_at.tzinfo is None:  # SQLite returns naive UTC datetimes
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        key_expires_at = expires_at.timestamp()
+        if key_expires_at <= time.time():
+            logger.warning(f"Expired API key used for user: {record.user_id}")
+            return rejected_entry("API key has expired")
+
+    if not record.is_active:
+        logger.warning(
+            f"API key {record.id} belongs to a disabled user: {record.user_id}"
+        )
+        return rejected_entry("User account is inactive")
+
+    return authenticated_entry(record.user_id, record.email, key_expires_at)
+
+
 async def get_current_user(
     request: Request,
     token: HTTPAuthorizationCredentials = Security(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> User:
-    """Authenticate user based on API key."""
+    """Authenticate user based on API key.
+
+    Results are served from the auth cache when possible, so most requests
+    skip the database lookup. The returned user is a detached snapshot that
+    carries ``id`` and ``email``.
+    """
     try:
-        # Extract API key from Bearer token
-        api_key = token.credentials
-
-        # Hash the provided key to find it in the database
-        key_hash = hashlib.sha256(api_key.encode()).hexdigest()
-
-        # Query for the API key
-        api_key_record = (
-            db.query(ApiKey)
-            .filter(ApiKey.key_hash == key_hash)
-            .filter(ApiKey.is_active.is_(True))
-            .first()
-        )
+        # Hash the API key from the Bearer token to find it in cache or database
+        key_hash = hashlib.sha256(token.credentials.encode()).hexdigest()
 
-        if not api_key_record:
-            logger.warning(f"Invalid API key used: {api_key[:8]}...")
-            raise HTTPException(status_code=401, detail="Invalid or expired API key")
-
-        # Check if API key has an expiration date and if it's expired
-        if api_key_record.expires_at is not None and api_key_record.expires_at <= datetime.utcnow():
-            logger.warning(f"Expired API key used for user: {api_key_record.user_id}")
-            raise HTTPException(status_code=401, detail="API key has expired")
-
-        # Get associated user
-        user = (
-            db.query(User)
-            .filter(User.id == api_key_record.user_id)
-            .filter(User.is_active.is_(True))
-            .first()
-        )
+        entry = await auth_cache.aget(key_hash) if auth_cache is not None else None
+        if entry is None:
+            entry = await authenticate_key_hash(db, key_hash)
+            if auth_cache is not None:
+                await auth_cache.aset(key_hash, entry)
 
-        if not user:
-            logger.warning(
-                f"API key {api_key_record.id} belongs to a disabled user: {api_key_record.user_id}"
-            )
-            raise HTTPException(status_code=401, detail="User account is inactive")
+        if entry["error"] is not None:
+            raise HTTPException(status_code=401, detail=entry["error"])
+
+        user = User(id=entry["user_id"], email=entry["email"], is_active=True)
 
         # Store user in request state for rate limiting
         request.state.current_user = user
@@ -137,13 +221,96 @@ async def health_check(request: Request):
     return HealthResponse(status="ok", timestamp=datetime.utcnow(), version="1.0.0")
 
 
-@app.post("/v1/signals", response_model=SignalsResponse)
+def signals_query(signals_request: SignalsRequest):
+    """Build the signals SELECT for a request, newest first.
+
+    Applies the ticker, date range and cursor filters shared by every
+    signals endpoint; callers add their own LIMIT.
+
+    Articles are found through ``article_tickers``, so an article shows up
+    for every ticker it mentions, once per requested ticker.
+
+    Raises:
+        HTTPException: 400 if the request carries a malformed cursor.
+    """
+    filters = [
+        ArticleTicker.ticker.in_(signals_request.ticker_list),
+        ArticleTicker.published_at >= signals_request.start_date,
+        ArticleTicker.published_at <= signals_request.end_date,
+        # Implied by the joins, but PostgreSQL prunes partitions only on
+        # ranges stated per table
+        RawArticle.published_at >= signals_request.start_date,
+        RawArticle.published_at <= signals_request.end_date,
+        SentimentScore.published_at >= signals_request.start_date,
+        SentimentScore.published_at <= signals_request.end_date,
+        RawArticle.has_error.is_(False),
+        RawArticle.archived_at.is_(None),  # Archived rows are read from Parquet
+    ]
+    if signals_request.cursor:
+        try:
+            filters.append(
+                after_cursor(
+                    ArticleTicker.published_at,
+                    ArticleTicker.article_id,
+                    ArticleTicker.ticker,
+                    signals_request.cursor,
+                )
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+    return (
+        select(
+            RawArticle.id,
+            ArticleTicker.ticker,
+            RawArticle.article_url,
+            RawArticle.headline,
+            RawArticle.published_at,
+            SentimentScore.sentiment_score,
+            SentimentScore.sentiment_label,
+        )
+        .select_from(ArticleTicker)
+        .join(RawArticle, ARTICLE_TICKER_JOIN)
+        .join(SentimentScore, ARTICLE_SCORE_JOIN)
+        .where(and_(*filters))
+        .order_by(
+            desc(ArticleTicker.published_at),
+            desc(ArticleTicker.article_id),
+            desc(ArticleTicker.ticker),
+        )
+    )
+
+
+def archived_signals(signals_request: SignalsRequest):
+    """Iterator over the archived rows of a request, or None if none can match.
+
+    Call after ``signals_query``, which rejects malformed cursors.
+    """
+    if not archive_enabled() or as_utc(signals_request.start_date) >= archive_horizon():
+        return None
+    cursor = decode_cursor(signals_request.cursor) if signals_request.cursor else None
+    return iter_archived_signals(
+        signals_request.ticker_list,
+        signals_request.start_date,
+        signals_request.end_date,
+        cursor,
+    )
+
+
+def export_basename(signals_request: SignalsRequest) -> str:
+    """File name (without extension) for downloaded signals."""
+    if signals_request.tickers is not None:
+        return f"signals_{len(signals_request.ticker_list)}_tickers"
+    return f"signals_{signals_request.ticker}"
+
+
+@app.post("/v1/signals", response_model=SignalsResponse | GroupedSignalsResponse)
 @limiter.limit("50/minute")
 async def get_sentiment_signals(
     request: Request,
     signals_request: SignalsRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get sentiment analysis signals for a given time period.
 
@@ -151,43 +318,81 @@ async def get_sentiment_signals(
     published within the specified date range. The data includes sentiment scores
     and labels generated by our analysis models.
 
+    Results are returned newest first in pages of at most ``limit`` records
+    (default 1000). When more records follow, the response has ``has_more``
+    set; pass the returned ``next_cursor`` as ``cursor`` to fetch the next
+    page.
+
+    Pass ``tickers`` instead of ``ticker`` to query up to 200 symbols in one
+    request. The page (and ``limit``) then spans all of them and ``data`` is
+    grouped per ticker.
+
+    Articles older than the archive horizon are served from the Parquet
+    archive and merged into the page transparently.
+
+    Send ``Accept: application/vnd.apache.arrow.stream`` for an Arrow IPC
+    stream or ``Accept: application/vnd.apache.parquet`` for a Parquet file.
+    Columnar responses return the cursor in the ``X-Next-Cursor`` header.
+
     **Important Disclaimer**: This is analytical data only, not investment advice.
     **Authentication**: Requires valid API key in Authorization header.
     """
     try:
         logger.info(
-            f"Processing signals request for user: {current_user.email}, ticker: {signals_request.ticker}, dates: {signals_request.start_date} to {signals_request.end_date}"
+            f"Processing signals request for user: {current_user.email}, tickers: {signals_request.ticker_list}, dates: {signals_request.start_date} to {signals_request.end_date}"
         )
 
-        # Query for articles with sentiment scores in the date range
-        query = (
-            db.query(
-                RawArticle.article_url,
-                RawArticle.headline,
-                RawArticle.published_at,
-                SentimentScore.sentiment_score,
-                SentimentScore.sentiment_label,
-            )
-            .join(SentimentScore, RawArticle.id == SentimentScore.article_id)
-            .filter(
-                and_(
-                    RawArticle.ticker == signals_request.ticker,
-                    RawArticle.published_at >= signals_request.start_date,
-                    RawArticle.published_at <= signals_request.end_date,
-                    RawArticle.has_error.is_(False),
-                )
+        response_format = negotiate_format(request.headers.get("accept"))
+        if response_format != "json" and not ARROW_AVAILABLE:
+            raise HTTPException(
+                status_code=406, detail="Columnar response formats are not available"
             )
-            .order_by(desc(RawArticle.published_at))
-        )
+
+        # Fetch one extra row to find out whether another page follows
+        query = signals_query(signals_request).limit(signals_request.limit + 1)
 
         # Execute query
-        results = query.all()
+        results = (await db.execute(query)).all()
+
+        # Months before the archive horizon are read from Parquet, unless the
+        # page is already full of rows newer than every archived one
+        page_size = signals_request.limit + 1
+        page_is_live = (
+            len(results) == page_size
+            and as_utc(results[-1].published_at) >= archive_horizon()
+        )
+        archived = None if page_is_live else archived_signals(signals_request)
+        if archived is not None:
+            archived_rows = await run_in_threadpool(
+                lambda: list(islice(archived, page_size))
+            )
+            results = merge_newest_first(results, archived_rows, limit=page_size)
+
+        has_more = len(results) > signals_request.limit
+        results = results[: signals_request.limit]
+
+        next_cursor = None
+        if has_more:
+            last = results[-1]
+            next_cursor = encode_cursor(last.published_at, last.id, last.ticker)
+
+        # Columnar formats skip the per-row models; pagination moves to headers
+        if response_format != "json":
+            content, media_type = encode_table(rows_to_table(results), response_format)
+            headers = {"X-Total-Count": str(len(results))}
+            if next_cursor:
+                headers["X-Next-Cursor"] = next_cursor
+            if response_format == "parquet":
+                filename = f"{export_basename(signals_request)}.parquet"
+                headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+            return Response(content=content, media_type=media_type, headers=headers)
 
         # Convert to response format
         sentiment_data = []
         for result in results:
             sentiment_data.append(
                 SentimentData(
+                    ticker=result.ticker,
                     article_url=result.article_url,
                     headline=result.headline,
                     published_at=result.published_at,
@@ -200,7 +405,23 @@ async def get_sentiment_signals(
             f"Returning {len(sentiment_data)} sentiment records for user: {current_user.email}"
         )
 
-        return SignalsResponse(data=sentiment_data, total_count=len(sentiment_data))
+        if signals_request.tickers is not None:
+            grouped_data = {ticker: [] for ticker in signals_request.ticker_list}
+            for item in sentiment_data:
+                grouped_data[item.ticker].append(item)
+            return GroupedSignalsResponse(
+                data=grouped_data,
+                total_count=len(sentiment_data),
+                has_more=has_more,
+                next_cursor=next_cursor,
+            )
+
+        return SignalsResponse(
+            data=sentiment_data,
+            total_count=len(sentiment_data),
+            has_more=has_more,
+            next_cursor=next_cursor,
+        )
 
     except HTTPException:
         raise
@@ -211,39 +432,150 @@ async def get_sentiment_signals(
         ) from e
 
 
-@app.get("/v1/stats")
+@app.post("/v1/signals/aggregate", response_model=AggregateResponse)
 @limiter.limit("30/minute")
-async def get_stats(
+async def get_aggregated_signals(
     request: Request,
+    aggregate_request: AggregateRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get basic statistics about the data in the system.
+    """Get a time-bucketed sentiment series per ticker.
 
-    **Authentication**: Requires valid API key.
+    For every ticker and bucket (5m, 1h or 1d) the mean score, the article
+    count and the count per label are computed in SQL; hourly and daily
+    buckets are read from the hourly sentiment rollups. Like ``/v1/signals``,
+    an article counts under every ticker in ``article_tickers``. Only scores
+    of ``model_version`` (default: the current model) are aggregated, so
+    articles rescored by a new model are not counted twice. With
+    ``decay_half_life`` set, each bucket also carries an exponentially decayed
+    mean score.
+
+    **Important Disclaimer**: This is analytical data only, not investment advice.
+    **Authentication**: Requires valid API key in Authorization header.
     """
     try:
-        logger.info(f"Stats request from user: {current_user.email}")
+        logger.info(
+            f"Aggregate request for user: {current_user.email}, tickers: {aggregate_request.tickers}, bucket: {aggregate_request.bucket}"
+        )
 
-        # Count total articles
-        total_articles = db.query(RawArticle).count()
+        if aggregate_request.end_date < aggregate_request.start_date:
+            raise HTTPException(
+                status_code=400, detail="end_date must not be before start_date"
+            )
 
-        # Count processed articles
-        processed_articles = (
-            db.query(RawArticle).filter(RawArticle.is_processed.is_(True)).count()
+        bucket_seconds = BUCKET_SECONDS[aggregate_request.bucket]
+        range_seconds = (
+            aggregate_request.end_date - aggregate_request.start_date
+        ).total_seconds()
+        bucket_count = (range_seconds // bucket_seconds + 1) * len(
+            aggregate_request.tickers
         )
+        if bucket_count > MAX_AGGREGATE_BUCKETS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Request spans more than {MAX_AGGREGATE_BUCKETS} buckets; "
+                "use a wider bucket or a shorter date range",
+            )
 
-        # Count articles with errors
-        error_articles = (
-            db.query(RawArticle).filter(RawArticle.has_error.is_(True)).count()
+        model_version = aggregate_request.model_version or CURRENT_MODEL_VERSION
+        query = aggregate_query(
+            aggregate_request.tickers,
+            aggregate_request.bucket,
+            aggregate_request.start_date,
+            aggregate_request.end_date,
+            db.get_bind().dialect.name,
+            model_version,
         )
 
-        # Get latest article date
-        latest_article = (
-            db.query(RawArticle).order_by(desc(RawArticle.published_at)).first()
+        series: dict[str, list[dict]] = {
+            ticker: [] for ticker in aggregate_request.tickers
+        }
+        for row in (await db.execute(query)).all():
+            series[row.ticker].append(
+                {
+                    "bucket_start": parse_bucket_start(row.bucket_start),
+                    "mean_score": float(row.mean_score),
+                    "count": row.count,
+                    "positive_count": row.positive_count,
+                    "negative_count": row.negative_count,
+                    "neutral_count": row.neutral_count,
+                }
+            )
+
+        if aggregate_request.decay_half_life is not None:
+            for buckets in series.values():
+                apply_decay(buckets, bucket_seconds, aggregate_request.decay_half_life)
+
+        return AggregateResponse(
+            bucket=aggregate_request.bucket, model_version=model_version, series=series
         )
 
-        latest_article_date = latest_article.published_at if latest_article else None
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing aggregate request: {e!s}")
+        raise HTTPException(
+            status_code=500, detail=f"Internal server error: {e!s}"
+        ) from e
+
+
+@app.post("/v1/signals/export")
+@limiter.limit("10/minute")
+async def export_sentiment_signals(
+    request: Request,
+    signals_request: SignalsRequest,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    current_user: User = Depends(get_current_user),
+    session_factory: async_sessionmaker = Depends(get_async_db_factory),
+):
+    """Stream every sentiment signal matching the request as NDJSON or CSV.
+
+    Accepts the same body as ``/v1/signals``. ``limit`` is ignored: the whole
+    range is streamed from a server-side cursor with constant memory. A
+    ``cursor`` is honored, so an interrupted export can resume after the
+    last record received.
+
+    **Authentication**: Requires valid API key in Authorization header.
+    """
+    logger.info(
+        f"Export request for user: {current_user.email}, tickers: {signals_request.ticker_list}, format: {export_format}"
+    )
+    query = signals_query(signals_request)
+    filename = f"{export_basename(signals_request)}.{export_format}"
+
+    return StreamingResponse(
+        stream_signal_rows(
+            session_factory, query, export_format, archived_signals(signals_request)
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.get("/v1/stats")
+@limiter.limit("30/minute")
+async def get_stats(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get basic statistics about the data in the system.
+
+    **Authentication**: Requires valid API key.
+    """
+    try:
+        logger.info(f"Stats request from user: {current_user.email}")
+
+        # Cached counters, kept current by the ingestor and the sentiment worker
+        counters = counter_values((await db.execute(counters_query())).all())
+        total_articles = counters[TOTAL_ARTICLES]
+        processed_articles = counters[PROCESSED_ARTICLES]
+        error_articles = counters[ERROR_ARTICLES]
+        # Reads the end of the published_at index
+        latest_article_date = (
+            await db.execute(select(func.max(RawArticle.published_at)))
+        ).scalar()
 
         return {
             "total_articles": total_articles,
@@ -267,7 +599,7 @@ async def get_stats(
 async def get_sources(
     request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get available data sources and their article counts.
 
@@ -278,14 +610,14 @@ async def get_sources(
 
         # Get source statistics
         sources_query = (
-            db.query(
-                RawArticle.source,
-                func.count(RawArticle.id).label("article_count"),
-                func.max(RawArticle.published_at).label("latest_article"),
+            await db.execute(
+                select(
+                    RawArticle.source,
+                    func.count(RawArticle.id).label("article_count"),
+                    func.max(RawArticle.published_at).label("latest_article"),
+                ).group_by(RawArticle.source)
             )
-            .group_by(RawArticle.source)
-            .all()
-        )
+        ).all()
 
         sources = []
         for source_data in sources_query:
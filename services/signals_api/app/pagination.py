@@ -0,0 +1,50 @@
+"""Keyset pagination helpers for the Signals API.
+
+Results are ordered by ``(published_at DESC, id DESC, ticker DESC)``; the
+ticker breaks the tie between the rows of an article tagged with several
+requested tickers. A cursor encodes the sort key of the last row of a page,
+and the next page starts strictly after it, so each page costs an index range
+scan no matter how deep the client has paged. Cursors are opaque to clients:
+URL-safe base64 of a small JSON array.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+
+def encode_cursor(published_at: datetime, article_id: int, ticker: str) -> str:
+    """Encode the sort key of the last returned row as an opaque cursor."""
+    key = [published_at.isoformat(), article_id, ticker]
+    payload = json.dumps(key, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int, str]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Returns:
+        tuple[datetime, int, str]: ``(published_at, id, ticker)``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published_at, article_id, ticker = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(ticker, str):
+            raise ValueError("cursor ticker is not a string")
+        return datetime.fromisoformat(published_at), int(article_id), ticker
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def after_cursor(published_at_column, id_column, ticker_column, cursor: str):
+    """Return the WHERE clause selecting rows that sort after the cursor."""
+    published_at, article_id, ticker = decode_cursor(cursor)
+    return tuple_(published_at_column, id_column, ticker_column) < tuple_(
+        published_at, article_id, ticker
+    )
@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from services.common.app.db.counters import TOTAL_ARTICLES, increment_counters
 from services.common.app.db.models import RawArticle
 from services.common.app.db.session import create_db_session
 from services.common.app.logging_config import configure_logging, get_logger
@@ -29,6 +30,7 @@ def main():
             has_error=False,
         )
         db_session.add(dummy_article)
+        increment_counters(db_session, {TOTAL_ARTICLES: 1})
         db_session.commit()
         logger.info("Successfully ingested a placeholder tweet.")
 
@@ -11,9 +11,11 @@ from datetime import datetime, timedelta
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
+from services.common.app.db.async_session import get_async_db, get_async_db_factory
 from services.common.app.db.models import ApiKey, Base, User
 from services.common.app.db.session import get_db
 from services.signals_api.app.main import app
@@ -38,19 +40,37 @@ def _setup_test_environment():
 
 
 @pytest.fixture(scope="session")
-def db_engine():
+def db_path(tmp_path_factory):
     """
-    Session-scoped, in-memory SQLite engine for tests.
+    Path of the session-scoped SQLite database file.
+    A file (rather than :memory:) lets the sync and async engines share data.
+    """
+    return tmp_path_factory.mktemp("db") / "test.db"
+
+
+@pytest.fixture(scope="session")
+def db_engine(db_path):
+    """
+    Session-scoped, file-based SQLite engine for tests.
     """
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{db_path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
     Base.metadata.create_all(bind=engine)
     return engine
 
 
+@pytest.fixture(scope="session")
+def async_db_session_factory(db_engine, db_path):
+    """
+    Returns an async sessionmaker bound to the same SQLite file as db_engine.
+    NullPool avoids reusing aiosqlite connections across TestClient event loops.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    return async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
 @pytest.fixture(scope="session")
 def db_session_factory(db_engine):
     """
@@ -73,7 +93,7 @@ def db_session(db_session_factory):
 
 
 @pytest.fixture(scope="module")
-def api_client(db_session_factory):
+def api_client(db_session_factory, async_db_session_factory):
     """
     Provides a TestClient for making API requests in tests.
     This client uses an overridden database session from our test factory.
@@ -87,7 +107,14 @@ def api_client(db_session_factory):
         finally:
             db.close()
 
+    async def override_get_async_db():
+        """FastAPI dependency override to use the test async database session."""
+        async with async_db_session_factory() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_db_factory] = lambda: async_db_session_factory
     with TestClient(app) as client:
         yield client
     # Clean up dependency override after tests
@@ -7,6 +7,8 @@ and unauthorized API keys, ensuring the security layer works as expected.
 
 from fastapi.testclient import TestClient
 
+from services.signals_api.app.auth_cache import invalidate_api_key
+
 # --- Test Suite for API Authentication ---
 
 
@@ -119,3 +121,24 @@ class TestApiAuthentication:
         assert "data" in data
         assert "total_count" in data
         assert data["total_count"] == 0
+
+    def test_revoked_key_rejected_after_invalidation(
+        self, api_client: TestClient, test_user, api_key_factory, db_session
+    ):
+        """
+        Tests that a key revoked after being cached is rejected once the
+        auth cache invalidation hook has run.
+        """
+        api_key = api_key_factory(user_id=test_user.id)
+        headers = {"Authorization": f"Bearer {api_key.raw_key}"}
+        body = {"ticker": "FAKE", "start_date": "2023-01-01", "end_date": "2023-01-31"}
+        assert api_client.post("/v1/signals", headers=headers, json=body).status_code == 200
+
+        # Revoke the key the way scripts/generate_api_key.py does
+        api_key.is_active = False
+        db_session.commit()
+        invalidate_api_key(api_key.key_hash)
+
+        response = api_client.post("/v1/signals", headers=headers, json=body)
+        assert response.status_code == 401
+        assert "Invalid or expired API key" in response.json()["detail"]
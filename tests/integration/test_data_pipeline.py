@@ -2,13 +2,25 @@
 End-to-end tests for the main data processing pipeline.
 """
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from services.common.app.db.models import RawArticle, SentimentScore
+from services.common.app.db.models import (
+    ArticleTicker,
+    RawArticle,
+    SentimentRollup,
+    SentimentScore,
+)
+from services.common.app.db.rollups import (
+    backfill_rollups,
+    hour_start,
+    hourly_totals_query,
+    label_totals_query,
+)
 from services.sentiment_processor.app.worker import (
     FinBERTBatchAnalyzer,
+    drain_pending_articles,
     process_sentiment_batch,
 )
 
@@ -112,3 +124,140 @@ class TestDataPipeline:
         assert sentiment_score.sentiment_label is not None
         assert sentiment_score.model_version is not None
         assert sentiment_score.processed_at is not None
+
+    def test_pull_mode_claims_pending_articles(self, db_session):
+        """
+        Test that pull mode scores pending articles without being given their IDs,
+        and that already processed articles are not scored a second time.
+        """
+        articles = [
+            RawArticle(
+                headline=f"Pull mode article {idx}",
+                article_text="Profits rose on strong demand.",
+                source="test_source",
+                article_url=f"https://test.com/pull-mode/{idx}",
+                published_at=datetime.now(timezone.utc),
+                is_processed=False,
+            )
+            for idx in range(3)
+        ]
+        db_session.add_all(articles)
+        db_session.commit()
+        article_ids = [article.id for article in articles]
+
+        result = drain_pending_articles.s().apply()
+        assert result.get()["status"] == "success"
+        assert result.get()["processed"] >= len(article_ids)
+
+        # A second drain finds nothing left to claim
+        assert drain_pending_articles.s().apply().get()["processed"] == 0
+
+        db_session.expire_all()
+        for article_id in article_ids:
+            assert db_session.get(RawArticle, article_id).is_processed is True
+            assert (
+                db_session.query(SentimentScore).filter_by(article_id=article_id).count()
+                == 1
+            )
+
+    def test_pipeline_maintains_hourly_rollups(self, db_session):
+        """
+        Test that scoring updates the hourly rollup of the articles' hour, and
+        that a backfill from the fact tables reproduces the same rollup.
+        """
+        hour = datetime(2019, 6, 3, 14, tzinfo=timezone.utc)
+        articles = [
+            RawArticle(
+                headline=f"Rollup article {idx}",
+                article_text="Revenue grew and margins improved.",
+                source="test_source",
+                ticker="ROLLUP",
+                article_url=f"https://test.com/rollup/{idx}",
+                published_at=hour + timedelta(minutes=10 * idx),
+                is_processed=False,
+            )
+            for idx in range(3)
+        ]
+        db_session.add_all(articles)
+        db_session.commit()
+
+        result = process_sentiment_batch.s(
+            article_ids=[article.id for article in articles]
+        ).apply()
+        assert result.get()["processed"] == 3
+
+        def rollups():
+            db_session.expire_all()
+            return [
+                (
+                    hour_start(rollup.hour),
+                    round(rollup.score_sum, 6),
+                    rollup.score_count,
+                    rollup.positive_count + rollup.negative_count + rollup.neutral_count,
+                )
+                for rollup in db_session.query(SentimentRollup).filter_by(
+                    ticker="ROLLUP"
+                )
+            ]
+
+        incremental = rollups()
+        assert len(incremental) == 1
+        assert incremental[0][0] == hour
+        assert incremental[0][2] == incremental[0][3] == 3
+
+        written = backfill_rollups(db_session, start=hour, end=hour + timedelta(hours=1))
+        db_session.commit()
+        assert written >= 1
+        assert rollups() == incremental
+
+    def test_dashboard_totals_count_multi_ticker_articles_once(self, db_session):
+        """
+        Test that an article about two tickers is rolled up under both, but
+        counts once in the totals behind the dashboard's distribution and trend.
+        """
+        hour = datetime(2019, 7, 4, 15, tzinfo=timezone.utc)
+        article = RawArticle(
+            headline="Alpha and Beta announce a merger",
+            article_text="Revenue grew and margins improved.",
+            source="test_source",
+            ticker="TOTA",
+            article_url="https://test.com/rollup/two-tickers",
+            published_at=hour + timedelta(minutes=5),
+            is_processed=False,
+        )
+        db_session.add(article)
+        db_session.flush()
+        db_session.add_all(
+            ArticleTicker(
+                article_id=article.id,
+                ticker=ticker,
+                published_at=article.published_at,
+                weight=0.5,
+            )
+            for ticker in ("TOTA", "TOTB")
+        )
+        db_session.commit()
+        labels_before = sum(db_session.execute(label_totals_query()).one())
+
+        assert (
+            process_sentiment_batch.s(article_ids=[article.id]).apply().get()["processed"]
+            == 1
+        )
+
+        def totals():
+            db_session.expire_all()
+            per_ticker = {
+                rollup.ticker: rollup.score_count
+                for rollup in db_session.query(SentimentRollup).filter(
+                    SentimentRollup.ticker.in_(["TOTA", "TOTB"])
+                )
+            }
+            (trend,) = db_session.execute(hourly_totals_query(hour, hour)).all()
+            labels = sum(db_session.execute(label_totals_query()).one())
+            return per_ticker, trend.score_count, labels - labels_before
+
+        assert totals() == ({"TOTA": 1, "TOTB": 1}, 1, 1)
+
+        backfill_rollups(db_session, start=hour, end=hour + timedelta(hours=1))
+        db_session.commit()
+        assert totals() == ({"TOTA": 1, "TOTB": 1}, 1, 1)
@@ -0,0 +1,668 @@
+"""
+Integration tests for the Signals API data endpoints.
+
+These tests seed scored articles through the sync test session and read them
+back through the API, which queries the same database with an AsyncSession.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.common.app import archive
+from services.common.app.config import CURRENT_MODEL_VERSION
+from services.common.app.db.counters import (
+    TOTAL_ARTICLES,
+    increment_counters,
+    reconcile_counters,
+)
+from services.common.app.db.models import ArticleTicker, RawArticle
+from services.sentiment_processor.app.persistence import save_sentiment_scores
+from services.signals_api.app import main
+
+# --- Test Suite for the Signals API Endpoints ---
+
+
+class TestSignalsEndpoints:
+    """
+    Tests the /v1/signals, /v1/stats and /v1/sources endpoints end to end.
+    """
+
+    @pytest.fixture()
+    def auth_headers(self, test_user, api_key_factory):
+        """Returns Authorization headers carrying a valid API key."""
+        api_key = api_key_factory(user_id=test_user.id)
+        return {"Authorization": f"Bearer {api_key.raw_key}"}
+
+    @pytest.fixture()
+    def scored_articles(self, db_session):
+        """Factory fixture that stores scored articles for a ticker."""
+
+        def _factory(
+            ticker: str,
+            count: int,
+            start: datetime,
+            step: timedelta = timedelta(hours=1),
+            scores: list[tuple[float, str]] | None = None,
+            extra_tickers: tuple[str, ...] = (),
+            model_version: str = CURRENT_MODEL_VERSION,
+        ) -> list[RawArticle]:
+            scores = scores or [(0.5, "positive")] * count
+            articles = [
+                RawArticle(
+                    source="test_source",
+                    ticker=ticker,
+                    article_url=f"https://test.com/{ticker}/{idx}",
+                    headline=f"{ticker} headline {idx}",
+                    article_text="Shares rose after strong results.",
+                    published_at=start + step * idx,
+                )
+                for idx in range(count)
+            ]
+            db_session.add_all(articles)
+            db_session.flush()
+            db_session.add_all(
+                ArticleTicker(
+                    article_id=article.id,
+                    ticker=article_ticker,
+                    published_at=article.published_at,
+                    weight=1.0,
+                )
+                for article in articles
+                for article_ticker in (ticker, *extra_tickers)
+            )
+            db_session.flush()  # The session does not autoflush; rollups read these
+            increment_counters(db_session, {TOTAL_ARTICLES: len(articles)})
+            rows = [
+                {
+                    "article_id": article.id,
+                    "published_at": article.published_at,
+                    "model_version": model_version,
+                    "sentiment_score": score,
+                    "sentiment_label": label,
+                }
+                for article, (score, label) in zip(articles, scores, strict=True)
+            ]
+            # Through the worker's persistence path, so the rollups are kept too
+            save_sentiment_scores(db_session, rows, {a.id: a for a in articles})
+            db_session.commit()
+            return articles
+
+        return _factory
+
+    def test_get_signals_returns_scored_articles(
+        self, api_client: TestClient, auth_headers, scored_articles
+    ):
+        """Tests that scored articles are returned newest first."""
+        start = datetime(2023, 3, 1, tzinfo=timezone.utc)
+        scored_articles("ASYNC", 3, start)
+
+        response = api_client.post(
+            "/v1/signals",
+            headers=auth_headers,
+            json={
+                "ticker": "ASYNC",
+                "start_date": "2023-03-01",
+                "end_date": "2023-03-31",
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_count"] == 3
+        assert [item["headline"] for item in data["data"]] == [
+            "ASYNC headline 2",
+            "ASYNC headline 1",
+            "ASYNC headline 0",
+        ]
+
+    def test_get_signals_pages_with_cursor(
+        self, api_client: TestClient, auth_headers, scored_articles
+    ):
+        """Tests that following next_cursor walks every record exactly once."""
+        scored_articles("PAGED", 5, datetime(2023, 5, 1, tzinfo=timezone.utc))
+        body = {
+            "ticker": "PAGED",
+            "start_date": "2023-05-01",
+            "end_date": "2023-05-31",
+            "limit": 2,
+        }
+
+        headlines, page_sizes, has_more = [], [], []
+        while True:
+            response = api_client.post("/v1/signals", headers=auth_headers, json=body)
+            assert response.status_code == 200
+            data = response.json()
+            headlines += [item["headline"] for item in data["data"]]
+            page_sizes.append(data["total_count"])
+            has_more.append(data["has_more"])
+            if data["next_cursor"] is None:
+                break
+            body["cursor"] = data["next_cursor"]
+
+        assert page_sizes == [2, 2, 1]
+        assert has_more == [True, True, False]
+        assert headlines == [f"PAGED headline {idx}" for idx in range(4, -1, -1)]
+
+    def test_get_signals_flags_truncation_at_default_limit(
+        self, api_client: TestClient, auth_headers, scored_articles
+    ):
+        """Tests that a request without a limit says it was cut at 1000 records."""
+        scored_articles(
+            "TRUNC",
+            1001,
+            datetime(2023, 6, 1, tzinfo=timezone.utc),
+            step=timedelta(minutes=1),
+        )
+
+        response = api_client.post(
+            "/v1/signals",
+            headers=auth_headers,
+            json={
+                "ticker": "TRUNC",
+                "start_date": "2023-06-01",
+                "end_date": "2023-06-30",
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_count"] == 1000
+        assert data["has_more"] is True
+        assert data["next_cursor"] is not None
+
+    def test_get_signals_rejects_invalid_cursor(
+        self, api_client: TestClient, auth_headers
+    ):
+        """Tests that a malformed cursor is a client error."""
+        response = api_client.post(
+            "/v1/signals",
+            headers=auth_headers,
+            json={
+                "ticker": "PAGED",
+                "start_date": "2023-05-01",
+                "end_date": "2023-05-31",
+                "cursor": "garbage",
+            },
+        )
+
+        assert response.status_code == 400
+
+    def test_get_signals_for_multiple_tickers(
+        self, api_client: TestClient, auth_headers, scored_articles
+    ):
+        """Tests that a ticker list is answered in one page grouped per ticker."""
+        start = datetime(2023, 9, 1, tzinfo=timezone.utc)
+        scored_articles("MULTA", 2, start)
+        scored_articles("MULTB", 1, start + timedelta(minutes=30))
+
+        response = api_client.post(
+            "/v1/signals",
+            headers=auth_headers,
+            json={
+                "tickers": ["MULTA", "MULTB", "MULTC"],
+                "start_date": "2023-09-01",
+                "end_date": "2023-09-30",
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_count"] == 3
+        assert data["next_cursor"] is None
+        assert [item["headline"] for item in data["data"]["MULTA"]] == [
+            "MULTA headline 1",
+            "MULTA headline 0",
+        ]
+        assert [item["ticker"] for item in data["data"]["MULTB"]] == ["MULTB"]
+        assert data["data"]["MULTC"] == []
+
+    def test_get_signals_finds_articles_by_secondary_ticker(
+        self, api_client: TestClient, auth_headers, scored_articles, db_session
+    ):
+        """Tests that an article is listed under every ticker it mentions."""
+        start = datetime(2023, 10, 1, tzinfo=timezone.utc)
+        (deal,) = scored_articles("DEALA", 1, start)
+        db_session.add(
+            ArticleTicker(
+                article_id=deal.id,
+                ticker="DEALB",
+                published_at=deal.published_at,
+                weight=0.4,
+            )
+        )
+        db_session.commit()
+        body = {
+            "tickers": ["DEALA", "DEALB"],
+            "start_date": "2023-10-01",
+            "end_date": "2023-10-31",
+            "limit": 1,
+        }
+
+        # Both rows of the article share (published_at, id); paging must not skip one
+        tickers = []
+        while True:
+            response = api_client.post("/v1/signals", headers=auth_headers, json=body)
+            assert response.status_code == 200
+            data = response.json()
+            tickers += [
+                item["ticker"] for items in data["data"].values() for item in items
+            ]
+            if data["next_cursor"] is None:
+                break
+            body["cursor"] = data["next_cursor"]
+
+        assert tickers == ["DEALB", "DEALA"]
+
+    @pytest.mark.parametrize(
+        "ticker_fields",
+        [
+            {},
+            {"ticker": "AAPL", "tickers": ["MSFT"]},
+            {"tickers": []},
+            {"tickers": [f"T{idx}" for idx in range(201)]},
+        ],
+    )
+    def test_get_signals_rejects_invalid_ticker_fields(
+        self, api_client: TestClient, auth_headers, ticker_fields
+    ):
+        """Tests that exactly one of ticker/tickers is required and capped."""
+        response = api_client.post(
+            "/v1/signals",
+            headers=auth_headers,
+            json={"start_date": "2023-09-01", "end_date": "2023-09-30", **ticker_fields},
+        )
+
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize(
+        ("ticker_fields", "message"),
+        [
+            ({}, "Provide either 'ticker' or 'tickers'"),
+            ({"ticker": "AAPL", "tickers": ["MSFT"]}, "not both"),
+        ],
+    )
+    def test_get_signals_names_the_ticker_field_error(
+        self, api_client: TestClient, auth_headers, ticker_fields, message
+    ):
+        """Tests that missing and conflicting ticker fields get their own message."""
+        response = api_client.post(
+            "/v1/signals",
+            headers=auth_headers,
+            json={"start_date": "2023-09-01", "end_date": "2023-09-30", **ticker_fields},
+        )
+
+        assert response.status_code == 422
+        (error,) = response.json()["detail"]
+        assert error["msg"].endswith(message)
+
+    @pytest.mark.parametrize(
+        "accept",
+        ["application/vnd.apache.arrow.stream", "application/vnd.apache.parquet"],
+    )
+    def test_get_signals_columnar_formats(
+        self, api_client: TestClient, auth_headers, scored_articles, accept
+    ):
+        """Tests that Arrow and Parquet responses carry the page and cursor."""
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        ticker = "ARROW" if "arrow" in accept else "PARQ"
+        scored_articles(ticker, 3, datetime(2023, 7, 1, tzinfo=timezone.utc))
+
+        response = api_client.post(
+            "/v1/signals",
+            headers={**auth_headers, "Accept": accept},
+            json={
+                "ticker": ticker,
+                "start_date": "2023-07-01",
+                "end_date": "2023-07-31",
+                "limit": 2,
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == accept
+        assert response.headers["x-total-count"] == "2"
+        assert response.headers["x-next-cursor"]
+        if "arrow" in accept:
+            table = pa.ipc.open_stream(response.content).read_all()
+        else:
+            table = pq.read_table(pa.BufferReader(response.content))
+        assert table.column("headline").to_pylist() == [
+            f"{ticker} headline 2",
+            f"{ticker} headline 1",
+        ]
+
+    @pytest.mark.parametrize(
+        ("bucket", "expected_counts"),
+        [("5m", [1, 1, 1, 1]), ("1h", [3, 1]), ("1d", [4])],
+    )
+    def test_aggregate_buckets(
+        self,
+        api_client: TestClient,
+        auth_headers,
+        scored_articles,
+        bucket,
+        expected_counts,
+    ):
+        """Tests that articles are grouped into buckets with label counts."""
+        ticker = f"AGG{bucket.upper()}"
+        scored_articles(
+            ticker,
+            4,
+            datetime(2023, 8, 1, 10, 0, tzinfo=timezone.utc),
+            step=timedelta(minutes=25),
+            scores=[
+                (0.8, "positive"),
+                (0.4, "positive"),
+                (-0.6, "negative"),
+                (0.0, "neutral"),
+            ],
+        )
+
+        response = api_client.post(
+            "/v1/signals/aggregate",
+            headers=auth_headers,
+            json={
+                "tickers": [ticker, "NODATA"],
+                "bucket": bucket,
+                "start_date": "2023-08-01",
+                "end_date": "2023-08-02",
+                "decay_half_life": 1.0,
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["series"]["NODATA"] == []
+        buckets = data["series"][ticker]
+        assert [item["count"] for item in buckets] == expected_counts
+        assert sum(item["positive_count"] for item in buckets) == 2
+        assert sum(item["negative_count"] for item in buckets) == 1
+        assert sum(item["neutral_count"] for item in buckets) == 1
+        assert buckets[0]["decayed_score"] == pytest.approx(buckets[0]["mean_score"])
+        if bucket == "1h":
+            assert buckets[0]["bucket_start"].startswith("2023-08-01T10:00:00")
+            assert buckets[0]["mean_score"] == pytest.approx(0.2)
+
+    @pytest.mark.parametrize("bucket", ["5m", "1h"])
+    def test_aggregate_counts_every_ticker_of_an_article(
+        self, api_client: TestClient, auth_headers, scored_articles, bucket
+    ):
+        """Tests that rollups and fact-table buckets both use article_tickers."""
+        primary, secondary = f"AGGP{bucket.upper()}", f"AGGS{bucket.upper()}"
+        scored_articles(
+            primary,
+            2,
+            datetime(2023, 9, 1, 10, 0, tzinfo=timezone.utc),
+            step=timedelta(minutes=10),
+            extra_tickers=(secondary,),
+        )
+
+        response = api_client.post(
+            "/v1/signals/aggregate",
+            headers=auth_headers,
+            json={
+                "tickers": [primary, secondary],
+                "bucket": bucket,
+                "start_date": "2023-09-01",
+                "end_date": "2023-09-02",
+            },
+        )
+
+        assert response.status_code == 200
+        series = response.json()["series"]
+        assert sum(item["count"] for item in series[primary]) == 2
+        assert series[secondary] == series[primary]
+
+    @pytest.mark.parametrize("bucket", ["5m", "1h"])
+    def test_aggregate_filters_by_model_version(
+        self, api_client: TestClient, auth_headers, db_session, scored_articles, bucket
+    ):
+        """Tests that articles rescored by another model are not counted twice."""
+        ticker = f"AGGV{bucket.upper()}"
+        articles = scored_articles(
+            ticker,
+            2,
+            datetime(2023, 10, 1, 10, 0, tzinfo=timezone.utc),
+            step=timedelta(minutes=10),
+            scores=[(0.5, "positive"), (0.5, "positive")],
+        )
+        rescored = [
+            {
+                "article_id": article.id,
+                "published_at": article.published_at,
+                "model_version": "finbert-v2.0",
+                "sentiment_score": -0.5,
+                "sentiment_label": "negative",
+            }
+            for article in articles
+        ]
+        save_sentiment_scores(db_session, rescored, {a.id: a for a in articles})
+        db_session.commit()
+        body = {
+            "tickers": [ticker],
+            "bucket": bucket,
+            "start_date": "2023-10-01",
+            "end_date": "2023-10-02",
+        }
+
+        current = api_client.post(
+            "/v1/signals/aggregate", headers=auth_headers, json=body
+        ).json()
+        rescored_series = api_client.post(
+            "/v1/signals/aggregate",
+            headers=auth_headers,
+            json={**body, "model_version": "finbert-v2.0"},
+        ).json()
+
+        assert current["model_version"] == CURRENT_MODEL_VERSION
+        assert sum(item["count"] for item in current["series"][ticker]) == 2
+        assert sum(item["positive_count"] for item in current["series"][ticker]) == 2
+        assert rescored_series["model_version"] == "finbert-v2.0"
+        buckets = rescored_series["series"][ticker]
+        assert sum(item["count"] for item in buckets) == 2
+        assert sum(item["negative_count"] for item in buckets) == 2
+
+    def test_aggregate_rejects_too_many_buckets(
+        self, api_client: TestClient, auth_headers
+    ):
+        """Tests that fine buckets over long ranges are rejected up front."""
+        response = api_client.post(
+            "/v1/signals/aggregate",
+            headers=auth_headers,
+            json={
+                "tickers": ["AAPL"] * 50,
+                "bucket": "5m",
+                "start_date": "2020-01-01",
+                "end_date": "2023-12-31",
+            },
+        )
+
+        assert response.status_code == 400
+
+    def test_aggregate_rejects_reversed_range(self, api_client: TestClient, auth_headers):
+        """Tests that an end date before the start date is a client error."""
+        response = api_client.post(
+            "/v1/signals/aggregate",
+            headers=auth_headers,
+            json={
+                "tickers": ["AAPL"],
+                "bucket": "1h",
+                "start_date": "2023-12-31",
+                "end_date": "2023-01-01",
+            },
+        )
+
+        assert response.status_code == 400
+        assert "end_date" in response.json()["detail"]
+
+    def test_export_streams_ndjson(
+        self, api_client: TestClient, auth_headers, scored_articles
+    ):
+        """Tests that the export streams every record as one JSON line each."""
+        scored_articles("EXPJ", 3, datetime(2023, 6, 1, tzinfo=timezone.utc))
+
+        response = api_client.post(
+            "/v1/signals/export?format=ndjson",
+            headers=auth_headers,
+            json={
+                "ticker": "EXPJ",
+                "start_date": "2023-06-01",
+                "end_date": "2023-06-30",
+                "limit": 1,
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [record["headline"] for record in records] == [
+            "EXPJ headline 2",
+            "EXPJ headline 1",
+            "EXPJ headline 0",
+        ]
+        assert records[0]["ticker"] == "EXPJ"
+
+    def test_export_streams_csv(
+        self, api_client: TestClient, auth_headers, scored_articles
+    ):
+        """Tests that the CSV export has a header row followed by the records."""
+        scored_articles("EXPC", 2, datetime(2023, 6, 1, tzinfo=timezone.utc))
+
+        response = api_client.post(
+            "/v1/signals/export?format=csv",
+            headers=auth_headers,
+            json={"ticker": "EXPC", "start_date": "2023-06-01", "end_date": "2023-06-30"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 2
+        assert rows[0]["sentiment_label"] == "positive"
+
+    def test_signals_read_archived_months(
+        self,
+        api_client: TestClient,
+        auth_headers,
+        scored_articles,
+        db_session,
+        tmp_path,
+        monkeypatch,
+    ):
+        """Tests that pages and exports merge archived months with live rows."""
+        monkeypatch.setattr(archive, "ARCHIVE_URI", str(tmp_path))
+        # Three articles in October 2022, two in November
+        articles = scored_articles(
+            "ARCHV", 5, datetime(2022, 10, 31, 21, tzinfo=timezone.utc)
+        )
+
+        archived = archive.archive_month(
+            db_session, datetime(2022, 10, 1, tzinfo=timezone.utc)
+        )
+        db_session.commit()
+
+        assert archived == 3
+        for article in articles[:3]:
+            db_session.refresh(article)
+            assert article.headline == ""
+            assert article.archived_at is not None
+        body = {
+            "ticker": "ARCHV",
+            "start_date": "2022-10-01",
+            "end_date": "2022-11-30",
+            "limit": 2,
+        }
+        headlines = []
+        while True:
+            response = api_client.post("/v1/signals", headers=auth_headers, json=body)
+            assert response.status_code == 200
+            data = response.json()
+            headlines += [item["headline"] for item in data["data"]]
+            if data["next_cursor"] is None:
+                break
+            body["cursor"] = data["next_cursor"]
+        assert headlines == [f"ARCHV headline {idx}" for idx in range(4, -1, -1)]
+
+        del body["cursor"]
+        response = api_client.post(
+            "/v1/signals/export?format=ndjson", headers=auth_headers, json=body
+        )
+        assert response.status_code == 200
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [record["headline"] for record in records] == headlines
+
+    def test_signals_skip_archive_when_live_rows_fill_the_page(
+        self, api_client: TestClient, auth_headers, scored_articles, tmp_path, monkeypatch
+    ):
+        """Tests that no Parquet is read when the page ends after the horizon."""
+        monkeypatch.setattr(archive, "ARCHIVE_URI", str(tmp_path))
+        now = datetime.now(timezone.utc)
+        scored_articles("ARCHSKIP", 3, now - timedelta(hours=3))
+
+        def fail(*args):
+            raise AssertionError("archive read for a page of live rows")
+
+        monkeypatch.setattr(main, "iter_archived_signals", fail)
+
+        response = api_client.post(
+            "/v1/signals",
+            headers=auth_headers,
+            json={
+                "ticker": "ARCHSKIP",
+                "start_date": "2020-01-01",
+                "end_date": (now + timedelta(days=1)).date().isoformat(),
+                "limit": 2,
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_count"] == 2
+        assert data["has_more"] is True
+
+    def test_export_rejects_unknown_format(self, api_client: TestClient, auth_headers):
+        """Tests that unsupported export formats fail validation."""
+        response = api_client.post(
+            "/v1/signals/export?format=xml",
+            headers=auth_headers,
+            json={"ticker": "EXPC", "start_date": "2023-06-01", "end_date": "2023-06-30"},
+        )
+
+        assert response.status_code == 422
+
+    def test_get_stats_and_sources(
+        self, api_client: TestClient, auth_headers, scored_articles, db_session
+    ):
+        """Tests that stats and sources aggregate the stored articles."""
+        scored_articles("STATS", 2, datetime(2023, 4, 1, tzinfo=timezone.utc))
+
+        stats = api_client.get("/v1/stats", headers=auth_headers)
+        assert stats.status_code == 200
+        stats_data = stats.json()
+        assert stats_data["total_articles"] >= 2
+        assert stats_data["processed_articles"] >= 2
+        assert "database_pool" not in stats_data  # Names the database host and user
+
+        # After a reconciliation the counters match exact counts, and new
+        # articles keep them current without another reconciliation
+        exact = reconcile_counters(db_session)
+        db_session.commit()
+        scored_articles("STATS2", 3, datetime(2023, 4, 2, tzinfo=timezone.utc))
+
+        stats_data = api_client.get("/v1/stats", headers=auth_headers).json()
+        assert stats_data["total_articles"] == exact[TOTAL_ARTICLES] + 3
+        assert stats_data["processed_articles"] == exact["processed_articles"] + 3
+        assert stats_data["error_articles"] == exact["error_articles"]
+        assert reconcile_counters(db_session)[TOTAL_ARTICLES] == exact[TOTAL_ARTICLES] + 3
+        db_session.rollback()
+
+        sources = api_client.get("/v1/sources", headers=auth_headers)
+        assert sources.status_code == 200
+        source_names = [source["source"] for source in sources.json()["sources"]]
+        assert "test_source" in source_names
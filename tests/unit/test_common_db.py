@@ -0,0 +1,336 @@
+"""Unit tests for the shared database session utilities."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from services.common.app import archive
+from services.common.app.db import (
+    async_session,
+    partitions,
+    rollups,
+    session as db_session,
+)
+
+# --- Test Suite for the Engine Registry ---
+
+
+class TestEngineRegistry:
+    """
+    Tests that engines and session factories are created once per process
+    and reused, so every session shares the same connection pool.
+    """
+
+    @pytest.fixture()
+    def database_url(self, tmp_path):
+        """Returns a file-based SQLite URL unique to each test."""
+        return f"sqlite:///{tmp_path / 'registry.db'}"
+
+    def test_engine_is_cached_per_url(self, database_url, tmp_path):
+        """Tests that the same URL returns the same engine, a new URL a new one."""
+        engine = db_session.get_engine(database_url)
+
+        assert db_session.get_engine(database_url) is engine
+        assert db_session.get_engine(f"sqlite:///{tmp_path / 'other.db'}") is not engine
+
+    def test_session_factory_is_cached_per_engine(self, database_url):
+        """Tests that sessions for one engine come from a single factory."""
+        engine = db_session.get_engine(database_url)
+        factory = db_session.get_session_factory(engine)
+
+        assert db_session.get_session_factory(engine) is factory
+        session = db_session.create_db_session(SessionLocal=factory)
+        try:
+            assert session.get_bind() is engine
+        finally:
+            session.close()
+
+    def test_pool_metrics_and_dispose(self, database_url):
+        """Tests that cached engines report pool metrics and can be disposed."""
+        engine = db_session.get_engine(database_url)
+        with engine.connect():
+            pass
+
+        metrics = db_session.get_pool_metrics()
+        assert any(database_url in url for url in metrics)
+        assert all("pool_class" in stats for stats in metrics.values())
+
+        db_session.dispose_engines()
+        assert db_session.get_engine(database_url) is engine
+
+
+# --- Test Suite for the Async Session Helpers ---
+
+
+class TestAsyncSession:
+    """
+    Tests that database URLs are mapped onto their asyncio drivers.
+    """
+
+    @pytest.mark.parametrize(
+        ("database_url", "expected_driver"),
+        [
+            ("postgresql://user:pass@db:5432/app", "postgresql+asyncpg"),
+            ("postgresql+psycopg2://user:pass@db:5432/app", "postgresql+asyncpg"),
+            ("sqlite:///local.db", "sqlite+aiosqlite"),
+        ],
+    )
+    def test_to_async_url(self, database_url, expected_driver):
+        """Tests that the sync driver is replaced and the rest of the URL kept."""
+        async_url = async_session.to_async_url(database_url)
+
+        assert async_url.drivername == expected_driver
+        assert async_url.database == database_url.rsplit("/", 1)[-1]
+
+    def test_to_async_url_rejects_unknown_backend(self):
+        """Tests that backends without an asyncio driver are rejected."""
+        with pytest.raises(ValueError, match="No asyncio driver"):
+            async_session.to_async_url("mysql://user:pass@db/app")
+
+
+# --- Test Suite for the Sentiment Rollups ---
+
+
+class TestRollupDeltas:
+    """
+    Tests that scored rows are folded into one increment per rollup key.
+    """
+
+    def test_hour_start_truncates_in_utc(self):
+        """Tests that aware and naive timestamps truncate to the UTC hour."""
+        plus_two = timezone(timedelta(hours=2))
+
+        assert rollups.hour_start(datetime(2024, 5, 1, 12, 45, 10, tzinfo=plus_two)) == (
+            datetime(2024, 5, 1, 10, tzinfo=timezone.utc)
+        )
+        assert rollups.hour_start(datetime(2024, 5, 1, 12, 45)) == (
+            datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+        )
+
+    def test_rollup_deltas_group_by_key(self):
+        """Tests that rows of the same ticker, source and hour are summed."""
+        base = datetime(2024, 5, 1, 9, tzinfo=timezone.utc)
+        articles = {
+            1: SimpleNamespace(ticker="AAPL", source="rss", published_at=base),
+            2: SimpleNamespace(
+                ticker="AAPL", source="rss", published_at=base + timedelta(minutes=30)
+            ),
+            3: SimpleNamespace(ticker=None, source="rss", published_at=base),
+        }
+        rows = [
+            {
+                "article_id": article_id,
+                "model_version": "v1",
+                "sentiment_score": score,
+                "sentiment_label": label,
+            }
+            for article_id, score, label in [
+                (1, 0.5, "positive"),
+                (2, -0.25, "negative"),
+                (3, 0.0, "neutral"),
+            ]
+        ]
+
+        deltas = rollups.rollup_deltas(rows, articles)
+
+        assert [delta["ticker"] for delta in deltas] == [
+            rollups.UNTAGGED_TICKER,
+            rollups.ALL_TICKERS,
+            "AAPL",
+        ]
+        assert deltas[1]["score_count"] == 3
+        aapl = deltas[2]
+        assert aapl["hour"] == base
+        assert aapl["score_sum"] == pytest.approx(0.25)
+        assert aapl["score_count"] == 2
+        assert (
+            aapl["positive_count"],
+            aapl["negative_count"],
+            aapl["neutral_count"],
+        ) == (
+            1,
+            1,
+            0,
+        )
+
+    def test_rollup_deltas_count_every_article_ticker(self):
+        """Tests that a row counts under each ticker found in article_tickers."""
+        base = datetime(2024, 5, 1, 9, tzinfo=timezone.utc)
+        articles = {
+            1: SimpleNamespace(ticker="AAPL", source="rss", published_at=base),
+            2: SimpleNamespace(ticker="MSFT", source="rss", published_at=base),
+        }
+        rows = [
+            {
+                "article_id": article_id,
+                "model_version": "v1",
+                "sentiment_score": 0.5,
+                "sentiment_label": "positive",
+            }
+            for article_id in (1, 2)
+        ]
+
+        deltas = rollups.rollup_deltas(rows, articles, {1: ["AAPL", "GOOG"]})
+
+        assert [(d["ticker"], d["score_count"]) for d in deltas] == [
+            (rollups.ALL_TICKERS, 2),  # Each article once
+            ("AAPL", 1),
+            ("GOOG", 1),
+            ("MSFT", 1),
+        ]
+
+
+# --- Test Suite for the Monthly Partitions ---
+
+
+class TestPartitions:
+    """
+    Tests the month arithmetic and DDL behind the partition maintenance task.
+    """
+
+    def test_add_months_crosses_years(self):
+        """Tests that months roll over year boundaries in both directions."""
+        january = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        assert partitions.add_months(january, -1) == datetime(
+            2023, 12, 1, tzinfo=timezone.utc
+        )
+        assert partitions.add_months(january, 13) == datetime(
+            2025, 2, 1, tzinfo=timezone.utc
+        )
+
+    def test_month_start_uses_utc(self):
+        """Tests that an aware timestamp is assigned to its UTC month."""
+        new_year_in_tokyo = datetime(2024, 1, 1, 5, tzinfo=timezone(timedelta(hours=9)))
+
+        assert partitions.month_start(new_year_in_tokyo) == datetime(
+            2023, 12, 1, tzinfo=timezone.utc
+        )
+
+    def test_partition_name_round_trips(self):
+        """Tests that the month is parsed back out of a partition name."""
+        month = datetime(2024, 3, 1, tzinfo=timezone.utc)
+        name = partitions.partition_name("raw_articles", month)
+
+        assert name == "raw_articles_p2024_03"
+        assert partitions.partition_month(name) == month
+        assert partitions.partition_month("raw_articles_default") is None
+
+    def test_create_partition_sql_bounds_one_month(self):
+        """Tests that a partition spans exactly its month."""
+        sql = partitions.create_partition_sql(
+            "sentiment_scores", datetime(2024, 12, 1, tzinfo=timezone.utc)
+        )
+
+        assert "sentiment_scores_p2024_12 PARTITION OF sentiment_scores" in sql
+        assert (
+            "FROM ('2024-12-01T00:00:00+00:00') TO ('2025-01-01T00:00:00+00:00')" in sql
+        )
+
+    def test_ensure_partitions_skips_months_held_by_default(self, monkeypatch, caplog):
+        """Tests that a month with rows in DEFAULT is logged, not fatal."""
+        now = datetime(2024, 3, 10, tzinfo=timezone.utc)
+        stuck = ("raw_articles", datetime(2024, 4, 1, tzinfo=timezone.utc))
+        executed = []
+        session = SimpleNamespace(
+            execute=lambda statement: executed.append(str(statement))
+        )
+        monkeypatch.setattr(partitions, "list_partitions", lambda session, table: {})
+        monkeypatch.setattr(
+            partitions,
+            "default_holds_month",
+            lambda session, table, month: (table, month) == stuck,
+        )
+
+        created = partitions.ensure_partitions(session, months_ahead=1, now=now)
+
+        assert "raw_articles_p2024_04" not in created
+        assert "sentiment_scores_p2024_04" in created
+        assert len(created) == len(executed) == 5
+        assert "raw_articles_p2024_04" in caplog.text
+        assert "2024-04" in caplog.text
+
+    def test_maintenance_skips_unpartitioned_databases(self, db_session):
+        """Tests that maintenance does nothing on SQLite."""
+        assert partitions.maintain_partitions(db_session) == {
+            "created": [],
+            "detached": [],
+        }
+
+
+# --- Test Suite for the Parquet Archive ---
+
+
+class TestArchive:
+    """
+    Tests the archive horizon and the merging of archived and live rows.
+    """
+
+    def test_horizon_is_a_month_start(self, monkeypatch):
+        """Tests that whole months are archived, never part of one."""
+        monkeypatch.setattr(archive, "ARCHIVE_AFTER_DAYS", 90)
+
+        horizon = archive.archive_horizon(datetime(2024, 6, 15, 12, tzinfo=timezone.utc))
+
+        assert horizon == datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+    def test_merge_orders_newest_first_and_drops_duplicates(self):
+        """Tests that a row archived by a failed run is returned once."""
+
+        def row(article_id: int, hour: int):
+            return SimpleNamespace(
+                id=article_id,
+                ticker="DUP",
+                published_at=datetime(2024, 1, 1, hour),
+                sentiment_score=0.5,
+                sentiment_label="positive",
+            )
+
+        live = [row(3, 3), row(2, 2)]
+        archived = [
+            archive.ArchivedSignal(
+                id=2,
+                ticker="DUP",
+                article_url="https://test.com/2",
+                headline="Headline",
+                published_at=datetime(2024, 1, 1, 2, tzinfo=timezone.utc),
+                sentiment_score=0.5,
+                sentiment_label="positive",
+            ),
+            row(1, 1),
+        ]
+
+        merged = archive.merge_newest_first(live, archived, limit=10)
+
+        assert [r.id for r in merged] == [3, 2, 1]
+        assert merged[1] is live[1]
+
+    def test_merge_keeps_each_ticker_of_an_article(self):
+        """Tests that the rows of one article under two tickers both stay."""
+        rows = [
+            SimpleNamespace(
+                id=7,
+                ticker=ticker,
+                published_at=datetime(2024, 1, 1),
+                sentiment_score=0.5,
+                sentiment_label="positive",
+            )
+            for ticker in ("AAA", "BBB")
+        ]
+
+        merged = archive.merge_newest_first(rows[:1], rows[1:], limit=10)
+
+        assert [r.ticker for r in merged] == ["BBB", "AAA"]
+
+    def test_archive_disabled_without_uri(self, db_session, monkeypatch):
+        """Tests that archival is a no-op while ARCHIVE_URI is unset."""
+        monkeypatch.setattr(archive, "ARCHIVE_URI", "")
+
+        rows = archive.iter_archived_signals(
+            ["X"], datetime(2000, 1, 1), datetime(2000, 2, 1)
+        )
+
+        assert not archive.archive_enabled()
+        assert archive.archive_old_articles(db_session) == {}
+        assert list(rows) == []
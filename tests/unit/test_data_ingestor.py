@@ -1,8 +1,49 @@
 """Unit tests for the Data Ingestor tasks."""
 
+import asyncio
+from collections import Counter
+from datetime import datetime
+
+import httpx
 import pytest
+from sqlalchemy import event, select
 
+from services.common.app.db.models import (
+    ARTICLE_TICKER_JOIN,
+    ArticleTicker,
+    ArticleUrl,
+    FeedState,
+    RawArticle,
+)
+from services.data_ingestor.app import feed_cache, feed_fetcher, tasks
+from services.data_ingestor.app.feed_fetcher import FeedFetch
+from services.data_ingestor.app.seen_urls import SeenUrlCache
 from services.data_ingestor.app.tasks import TickerExtractor
+from services.data_ingestor.app.ticker_matcher import TickerMatcher
+
+
+def feed_body(link: str) -> bytes:
+    """Returns an RSS document with one Apple article linking to ``link``."""
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Markets</title>
+<item>
+  <title>Apple shares rise after earnings</title>
+  <link>{link}</link>
+  <description>&lt;p&gt;Apple beat estimates.&lt;/p&gt;</description>
+  <pubDate>Mon, 06 May 2024 14:30:00 GMT</pubDate>
+</item>
+</channel></rss>""".encode()
+
+
+SAMPLE_FEED = feed_body("https://news.test/apple-earnings")
+
+
+@pytest.fixture()
+def ingestor(db_session, monkeypatch):
+    """Returns a DataIngestor working on the test session with its own URL cache."""
+    monkeypatch.setattr(tasks, "create_db_session", lambda: db_session)
+    return tasks.DataIngestor(seen_urls=SeenUrlCache(max_size=100))
+
 
 # --- Test Suite for TickerExtractor ---
 
@@ -88,3 +129,421 @@ class TestTickerExtractor:
         text = "A story about the economy with no company names or symbols."
         ticker = extractor.extract_ticker_from_text(text)
         assert ticker is None
+
+    def test_extracts_all_tickers_in_text_order(self, extractor):
+        """Tests that every company and symbol is returned once, in order."""
+        text = "Microsoft and Apple rally while $TSLA slips; Apple leads."
+        tickers = extractor.extract_tickers_from_text(text)
+        assert tickers == ["MSFT", "AAPL", "TSLA"]
+
+    def test_first_mentioned_company_wins(self, extractor):
+        """Tests that the single-ticker API returns the first company named."""
+        text = "Tesla supplier wins a contract with Apple."
+        assert extractor.extract_ticker_from_text(text) == "TSLA"
+
+    def test_weighted_tickers_favor_the_headline(self, extractor):
+        """Tests that weights sum to 1 and headline mentions count more."""
+        weights = extractor.extract_weighted_tickers(
+            "Apple signs cloud deal with Microsoft",
+            "Microsoft will host Apple services. Microsoft shares rose.",
+        )
+
+        assert list(weights) == ["MSFT", "AAPL"]
+        assert weights["MSFT"] == pytest.approx(5 / 9)
+        assert weights["AAPL"] == pytest.approx(4 / 9)
+
+    def test_weighted_tickers_without_mentions(self, extractor):
+        """Tests that an article without tickers has no weights."""
+        assert extractor.extract_weighted_tickers("Markets drift", "") == {}
+
+
+# --- Test Suite for the TickerMatcher ---
+
+
+class TestTickerMatcher:
+    """
+    Tests the token-level Aho-Corasick automaton behind company name matching.
+    """
+
+    def test_matches_whole_words_only(self):
+        """Tests that a name does not match inside a longer word."""
+        matcher = TickerMatcher({"meta": "META"})
+        assert matcher.find("Metal prices rise") == []
+        assert matcher.find("Meta's new headset") == [(0, "META")]
+
+    def test_multi_word_and_punctuated_names(self):
+        """Tests names with apostrophes and ampersands, typographic or not."""
+        matcher = TickerMatcher({"mcdonald's": "MCD", "johnson & johnson": "JNJ"})
+        matches = matcher.find("McDonald\u2019s and Johnson & Johnson report")
+        assert matches == [(0, "MCD"), (3, "JNJ")]
+
+    def test_overlapping_names_are_all_found(self):
+        """Tests that a name nested in a longer one is reported as well."""
+        matcher = TickerMatcher({"bank of america": "BAC", "america": "AMX"})
+        assert matcher.find("Bank of America earnings") == [(0, "BAC"), (2, "AMX")]
+
+    def test_failure_links_recover_partial_matches(self):
+        """Tests that a match starting inside a failed longer prefix is found."""
+        matcher = TickerMatcher({"a b c": "ABC", "b d": "BD"})
+        assert matcher.find("a b d") == [(1, "BD")]
+
+
+# --- Test Suite for the Feed Fetcher ---
+
+
+class TestFeedFetcher:
+    """
+    Tests that feeds are downloaded concurrently within the per-host limit
+    and that one failing feed does not affect the others.
+    """
+
+    def test_fetches_feeds_concurrently_per_host(self, monkeypatch):
+        """Tests that hosts are fetched in parallel, each within its own limit."""
+        monkeypatch.setattr(feed_fetcher, "FEED_PER_HOST_CONCURRENCY", 2)
+        in_flight, peak = Counter(), Counter()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            host = request.url.host
+            in_flight[host] += 1
+            in_flight["all"] += 1
+            peak[host] = max(peak[host], in_flight[host])
+            peak["all"] = max(peak["all"], in_flight["all"])
+            await asyncio.sleep(0.02)
+            in_flight[host] -= 1
+            in_flight["all"] -= 1
+            return httpx.Response(200, content=SAMPLE_FEED)
+
+        feeds = [
+            {"name": f"{host}_{idx}", "url": f"https://{host}/rss/{idx}"}
+            for host in ("a.test", "b.test")
+            for idx in range(5)
+        ]
+
+        results = feed_fetcher.fetch_feeds(feeds, transport=httpx.MockTransport(handler))
+
+        assert [result.feed_config for result in results] == feeds
+        assert all(result.content == SAMPLE_FEED for result in results)
+        assert peak["a.test"] == 2
+        assert peak["b.test"] == 2
+        assert peak["all"] == 4
+
+    def test_failed_feed_does_not_stop_the_others(self):
+        """Tests that a client error is returned per feed and not retried."""
+        calls = Counter()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls[request.url.path] += 1
+            if request.url.path == "/missing":
+                return httpx.Response(404)
+            return httpx.Response(200, content=SAMPLE_FEED)
+
+        feeds = [
+            {"name": "missing", "url": "https://a.test/missing"},
+            {"name": "ok", "url": "https://a.test/ok"},
+        ]
+
+        missing, ok = feed_fetcher.fetch_feeds(
+            feeds, transport=httpx.MockTransport(handler)
+        )
+
+        assert isinstance(missing.error, httpx.HTTPStatusError)
+        assert missing.content is None
+        assert ok.error is None
+        assert ok.content == SAMPLE_FEED
+        assert calls["/missing"] == 1
+
+    def test_sends_validators_and_reports_not_modified(self):
+        """Tests that stored validators are sent and a 304 carries no body."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                content=SAMPLE_FEED,
+                headers={
+                    "ETag": '"v1"',
+                    "Last-Modified": "Mon, 06 May 2024 14:30:00 GMT",
+                },
+            )
+
+        feeds = [
+            {"name": "cached", "url": "https://a.test/cached"},
+            {"name": "fresh", "url": "https://a.test/fresh"},
+        ]
+
+        cached, fresh = feed_fetcher.fetch_feeds(
+            feeds,
+            transport=httpx.MockTransport(handler),
+            request_headers={"https://a.test/cached": {"If-None-Match": '"v1"'}},
+        )
+
+        assert cached.not_modified
+        assert cached.error is None
+        assert cached.content is None
+        assert not fresh.not_modified
+        assert fresh.etag == '"v1"'
+        assert fresh.last_modified == "Mon, 06 May 2024 14:30:00 GMT"
+
+    def test_parses_downloaded_feed(self, ingestor):
+        """Tests that articles are parsed from the downloaded bytes."""
+        articles = ingestor.parse_rss_feed(
+            {"name": "markets", "source": "test"}, SAMPLE_FEED
+        )
+
+        assert len(articles) == 1
+        assert articles[0]["ticker"] == "AAPL"
+        assert articles[0]["article_url"] == "https://news.test/apple-earnings"
+        assert articles[0]["article_text"] == "Apple beat estimates."
+
+
+# --- Test Suite for the Feed Cache ---
+
+
+class TestFeedCache:
+    """
+    Tests that feeds are skipped when their validators or body hash show
+    they did not change since they were last ingested.
+    """
+
+    FEED_URL = "https://a.test/feed-cache"
+
+    def test_conditional_headers(self):
+        """Tests that only the stored validators become request headers."""
+        state = FeedState(
+            feed_url=self.FEED_URL,
+            etag='"abc"',
+            last_modified="Mon, 06 May 2024 14:30:00 GMT",
+        )
+
+        assert feed_cache.conditional_headers(None) == {}
+        assert feed_cache.conditional_headers(state) == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 06 May 2024 14:30:00 GMT",
+        }
+
+    def test_ingested_feed_is_skipped_until_it_changes(
+        self, ingestor, db_session, monkeypatch
+    ):
+        """Tests that a feed with the same body is not parsed again."""
+        feed_config = {"name": "cache", "url": self.FEED_URL, "source": "test"}
+        body = feed_body("https://news.test/feed-cache/1")
+
+        saved_ids = ingestor.ingest_feed(
+            FeedFetch(feed_config, body, etag='"v1"'), state=None
+        )
+        state = feed_cache.load_feed_states(db_session, [self.FEED_URL])[self.FEED_URL]
+
+        assert len(saved_ids) == 1
+        assert state.etag == '"v1"'
+        assert state.content_hash == feed_cache.content_hash(body)
+
+        parsed = []
+        original_parse = ingestor.parse_rss_feed
+        monkeypatch.setattr(
+            ingestor,
+            "parse_rss_feed",
+            lambda *args: parsed.append(args) or original_parse(*args),
+        )
+
+        not_modified = FeedFetch(feed_config, None, not_modified=True)
+
+        assert ingestor.ingest_feed(FeedFetch(feed_config, body), state) == []
+        assert ingestor.ingest_feed(not_modified, state) == []
+        assert parsed == []
+        assert ingestor.stats["unchanged_feeds"] == 2
+
+        changed = feed_body("https://news.test/feed-cache/2")
+        assert len(ingestor.ingest_feed(FeedFetch(feed_config, changed), state)) == 1
+        assert len(parsed) == 1
+
+
+# --- Test Suite for Saving Articles ---
+
+
+class TestSaveArticles:
+    """
+    Tests that articles are deduplicated against the database with set-based
+    queries and that one bad article does not lose the rest of the batch.
+    """
+
+    @staticmethod
+    def article(url: str, **overrides) -> dict:
+        """Returns article data as parsed from a feed."""
+        article_data = {
+            "source": "test",
+            "ticker": "AAPL",
+            "article_url": url,
+            "headline": "Apple shares rise",
+            "article_text": "Apple beat estimates.",
+            "published_at": datetime(2024, 5, 6, 14, 30),
+        }
+        return {**article_data, **overrides}
+
+    def test_skips_stored_and_repeated_urls_with_one_lookup(self, ingestor, db_engine):
+        """Tests that stored URLs are found with a single query."""
+        base = "https://news.test/save-dedupe"
+        stored_ids = ingestor.save_articles([self.article(f"{base}/1")])
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", record)
+        try:
+            new_ids = ingestor.save_articles(
+                [
+                    self.article(f"{base}/1"),
+                    self.article(f"{base}/2"),
+                    self.article(f"{base}/2", headline="Repeated in the feed"),
+                    self.article(f"{base}/3"),
+                ]
+            )
+        finally:
+            event.remove(db_engine, "before_cursor_execute", record)
+
+        lookups = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        assert len(stored_ids) == 1
+        assert len(new_ids) == 2
+        assert stored_ids[0] not in new_ids
+        assert len(lookups) == 1
+
+    def test_bad_article_does_not_roll_back_the_batch(self, ingestor, db_session):
+        """Tests that an article failing to insert is skipped on its own."""
+        base = "https://news.test/save-bad-row"
+
+        new_ids = ingestor.save_articles(
+            [
+                self.article(f"{base}/1"),
+                self.article(f"{base}/2", article_text=None),
+                self.article(f"{base}/3"),
+                self.article(f"{base}/4", headline=""),
+            ]
+        )
+
+        saved_urls = db_session.scalars(
+            select(RawArticle.article_url).where(RawArticle.id.in_(new_ids))
+        ).all()
+        assert sorted(saved_urls) == [f"{base}/1", f"{base}/3"]
+        assert ingestor.stats["errors"] == 2
+
+    def test_saves_every_ticker_of_new_articles(self, ingestor, db_session):
+        """Tests that each ticker of an article gets a weighted article_tickers row."""
+        base = "https://news.test/save-tickers"
+        ingestor.save_articles([self.article(f"{base}/1")])
+
+        new_ids = ingestor.save_articles(
+            [
+                self.article(f"{base}/1", tickers={"MSFT": 1.0}),
+                self.article(f"{base}/2", tickers={"AAPL": 0.75, "MSFT": 0.25}),
+                self.article(f"{base}/3", ticker=None, tickers={}),
+            ]
+        )
+
+        rows = db_session.execute(
+            select(ArticleTicker.article_id, ArticleTicker.ticker, ArticleTicker.weight)
+            .join(RawArticle, ARTICLE_TICKER_JOIN)
+            .where(RawArticle.article_url.like(f"{base}/%"))
+        ).all()
+        by_url = dict(
+            db_session.execute(
+                select(RawArticle.article_url, RawArticle.id).where(
+                    RawArticle.article_url.like(f"{base}/%")
+                )
+            ).all()
+        )
+        assert len(new_ids) == 2
+        assert sorted(rows) == [
+            (by_url[f"{base}/1"], "AAPL", 1.0),
+            (by_url[f"{base}/2"], "AAPL", 0.75),
+            (by_url[f"{base}/2"], "MSFT", 0.25),
+        ]
+
+    def test_refetched_url_with_another_date_is_not_stored_again(
+        self, ingestor, db_session
+    ):
+        """Tests that URLs stay unique although articles are partitioned by date."""
+        url = "https://news.test/save-redated"
+        first_ids = ingestor.save_articles([self.article(url)])
+        redated = self.article(url, published_at=datetime(2024, 7, 1, 9, 0))
+
+        # Once through the stored URL lookup, once as an ingestor that looked
+        # before the first one committed
+        assert ingestor.save_articles([redated]) == []
+        assert ingestor._insert_articles([redated]) == ([], set())
+
+        stored = db_session.scalars(
+            select(RawArticle.id).where(RawArticle.article_url == url)
+        ).all()
+        claims = db_session.scalars(
+            select(ArticleUrl.article_url).where(ArticleUrl.article_url == url)
+        ).all()
+        assert stored == first_ids
+        assert claims == [url]
+
+
+# --- Test Suite for the Seen URL Cache ---
+
+
+class TestSeenUrlCache:
+    """
+    Tests the bounded LRU of stored article URLs and that the ingestor skips
+    the entries it already knows before doing any work on them.
+    """
+
+    def test_evicts_least_recently_used(self):
+        """Tests that a looked-up URL survives eviction of older ones."""
+        cache = SeenUrlCache(max_size=2)
+        cache.update(["a", "b"])
+
+        assert "a" in cache  # Now the most recently used
+        cache.add("c")
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert len(cache) == 2
+
+    def test_zero_size_disables_the_cache(self, db_session):
+        """Tests that a cache of size 0 never remembers anything."""
+        cache = SeenUrlCache(max_size=0)
+        cache.add("a")
+
+        assert "a" not in cache
+        assert cache.hydrate(db_session) == 0
+
+    def test_hydrates_from_newest_articles(self, ingestor, db_session):
+        """Tests that warm start loads the most recently published URLs."""
+        base = "https://news.test/seen-hydrate"
+        ingestor.save_articles(
+            [
+                TestSaveArticles.article(
+                    f"{base}/{idx}", published_at=datetime(2099, 1, 1, idx)
+                )
+                for idx in range(3)
+            ]
+        )
+        cache = SeenUrlCache(max_size=2)
+
+        assert cache.hydrate(db_session) == 2
+        assert f"{base}/2" in cache
+        assert f"{base}/1" in cache
+        assert f"{base}/0" not in cache
+
+    def test_seen_entries_skip_extraction(self, ingestor, monkeypatch):
+        """Tests that stored articles are not cleaned up or extracted again."""
+        url = "https://news.test/seen-skip"
+        body = feed_body(url)
+        feed_config = {"name": "seen", "url": "https://a.test/seen", "source": "test"}
+        assert (
+            len(ingestor.save_articles(ingestor.parse_rss_feed(feed_config, body))) == 1
+        )
+        assert url in ingestor.seen_urls
+
+        def fail(*args):
+            raise AssertionError("extraction ran for a seen article")
+
+        monkeypatch.setattr(ingestor, "extract_article_content", fail)
+
+        assert ingestor.parse_rss_feed(feed_config, body) == []
+        assert ingestor.stats["already_seen"] == 1
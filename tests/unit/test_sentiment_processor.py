@@ -1,6 +1,31 @@
 """Unit tests for the Sentiment Processor worker."""
 
-from services.sentiment_processor.app.worker import FinBERTBatchAnalyzer
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from services.common.app.db.counters import PROCESSED_ARTICLES
+from services.common.app.db.models import RawArticle, SentimentScore, SystemCounter
+from services.sentiment_processor.app import (
+    micro_batching,
+    onnx_backend,
+    persistence,
+    worker,
+)
+from services.sentiment_processor.app.micro_batching import MicroBatchBuffer
+from services.sentiment_processor.app.onnx_backend import check_backend_parity
+from services.sentiment_processor.app.result_cache import (
+    SentimentResultCache,
+    result_cache_key,
+)
+from services.sentiment_processor.app.worker import (
+    FinBERTBatchAnalyzer,
+    build_token_budget_batches,
+)
 
 # --- Test Suite for FinBERTBatchAnalyzer ---
 
@@ -44,3 +69,432 @@ class TestFinBERTBatchAnalyzer:
         score, label = analyzer._predict_single("The company is performing exceptionally well.")
         assert isinstance(score, float)
         assert label in ["positive", "negative", "neutral"]
+
+
+# --- Test Suite for length-aware batching ---
+
+
+class TestTokenBudgetBatching:
+    """
+    Tests the grouping of texts into token-budget batches, which is independent
+    of the model and can run without ML dependencies.
+    """
+
+    def test_every_index_is_batched_exactly_once(self):
+        lengths = [512, 40, 38, 45, 300, 41, 12]
+        batches = build_token_budget_batches(lengths, max_batch_tokens=1024)
+        flattened = sorted(idx for batch in batches for idx in batch)
+        assert flattened == list(range(len(lengths)))
+
+    def test_batches_respect_token_budget(self):
+        lengths = [512, 40, 38, 45, 300, 41, 12, 200, 90]
+        budget = 600
+        for batch in build_token_budget_batches(lengths, max_batch_tokens=budget):
+            longest = max(lengths[idx] for idx in batch)
+            assert len(batch) == 1 or longest * len(batch) <= budget
+
+    def test_long_text_does_not_pad_short_texts(self):
+        """A single long article should not share a batch with short headlines."""
+        lengths = [40] * 15 + [512]
+        batches = build_token_budget_batches(lengths, max_batch_tokens=1024)
+        assert [15] in batches
+        assert all(15 not in batch for batch in batches if len(batch) > 1)
+
+    def test_text_longer_than_budget_gets_own_batch(self):
+        batches = build_token_budget_batches([900, 10], max_batch_tokens=512)
+        assert [0] in batches
+
+    def test_empty_input(self):
+        assert build_token_budget_batches([], max_batch_tokens=512) == []
+
+    def test_bucketed_results_keep_input_order(self, monkeypatch):
+        """Texts regrouped by length still get their own result, in input order."""
+
+        class FakeTokenizer:
+            """Tokenizes on whitespace and pads with zeros."""
+
+            def __call__(self, texts, truncation=True, max_length=512):
+                input_ids = [[1] * min(len(text.split()), max_length) for text in texts]
+                return {
+                    "input_ids": input_ids,
+                    "attention_mask": [[1] * len(ids) for ids in input_ids],
+                }
+
+            def pad(self, features, padding=True, return_tensors=None):
+                width = max(len(feature["input_ids"]) for feature in features)
+                return {
+                    key: [f[key] + [0] * (width - len(f[key])) for f in features]
+                    for key in ("input_ids", "attention_mask")
+                }
+
+        batches = []
+
+        def fake_run_model(inputs):
+            # The score identifies the text: its unpadded token count
+            batches.append(len(inputs["input_ids"]))
+            return [(float(sum(mask)), "neutral") for mask in inputs["attention_mask"]]
+
+        monkeypatch.setattr(FinBERTBatchAnalyzer, "_load_model", lambda self: None)
+        analyzer = FinBERTBatchAnalyzer()
+        analyzer.tokenizer = FakeTokenizer()
+        analyzer.max_batch_tokens = 64
+        monkeypatch.setattr(analyzer, "_run_model", fake_run_model)
+        word_counts = [50, 3, 40, 5, 2, 30, 4, 1]
+        texts = [" ".join(["word"] * count) for count in word_counts]
+
+        results = analyzer._process_length_bucketed(texts)
+
+        assert [score for score, _ in results] == [float(c) for c in word_counts]
+        assert len(batches) > 1  # The texts were really regrouped
+
+
+# --- Test Suite for the ONNX backend ---
+
+
+class _StaticAnalyzer:
+    """Minimal analyzer stub returning fixed predictions."""
+
+    def __init__(self, results):
+        self.results = results
+
+    def predict_batch(self, texts):
+        return self.results[: len(texts)]
+
+
+class TestOnnxBackendParity:
+    """
+    Tests the parity check used to validate the ONNX backend against torch.
+    """
+
+    def test_parity_passes_within_tolerance(self):
+        reference = _StaticAnalyzer([(0.9, "positive"), (-0.8, "negative")])
+        candidate = _StaticAnalyzer([(0.85, "positive"), (-0.82, "negative")])
+        report = check_backend_parity(reference, candidate, ["a", "b"])
+        assert report["passed"] is True
+        assert report["label_agreement"] == 1.0
+
+    def test_parity_fails_on_label_mismatch(self):
+        reference = _StaticAnalyzer([(0.9, "positive"), (0.0, "neutral")])
+        candidate = _StaticAnalyzer([(0.9, "positive"), (-0.4, "negative")])
+        report = check_backend_parity(reference, candidate, ["a", "b"])
+        assert report["passed"] is False
+        assert report["label_mismatches"] == [1]
+
+    def test_parity_fails_on_score_drift(self):
+        reference = _StaticAnalyzer([(0.9, "positive")])
+        candidate = _StaticAnalyzer([(0.3, "positive")])
+        report = check_backend_parity(reference, candidate, ["a"], score_tolerance=0.1)
+        assert report["passed"] is False
+
+    @pytest.mark.parametrize(
+        ("backend", "quantize", "expected_version"),
+        [
+            ("torch", True, "finbert-v1.0"),
+            ("onnx", True, "finbert-v1.0-onnx-int8"),
+            ("onnx", False, "finbert-v1.0-onnx"),
+        ],
+    )
+    def test_model_version_names_the_served_model(
+        self, monkeypatch, backend, quantize, expected_version
+    ):
+        """Scores of the fp32 and int8 ONNX models must not share a version."""
+        monkeypatch.setattr(FinBERTBatchAnalyzer, "_load_model", lambda self: None)
+
+        analyzer = FinBERTBatchAnalyzer(backend=backend, quantize=quantize)
+
+        assert analyzer.model_version == expected_version
+
+    def test_onnx_matches_torch_backend(self, tmp_path, monkeypatch):
+        """Exports the real model to ONNX and compares it with the torch path."""
+        pytest.importorskip("onnxruntime")
+        monkeypatch.setattr(onnx_backend, "ONNX_MODEL_DIR", str(tmp_path))
+        texts = [
+            "The company reported record profits and raised guidance.",
+            "Shares collapsed after the firm disclosed heavy losses.",
+            "The board will meet next Tuesday.",
+        ]
+        torch_analyzer = FinBERTBatchAnalyzer(backend="torch")
+        if torch_analyzer.model is None:
+            pytest.skip("FinBERT model could not be loaded")
+        onnx_analyzer = FinBERTBatchAnalyzer(backend="onnx")
+        # Both sides must run a model, not the keyword fallback
+        assert isinstance(onnx_analyzer.model, onnx_backend.OnnxFinBERTModel)
+        assert onnx_analyzer.model.session is not None
+        report = check_backend_parity(torch_analyzer, onnx_analyzer, texts)
+        assert report["passed"], report
+
+
+# --- Test Suite for the sentiment result cache ---
+
+
+class TestSentimentResultCache:
+    """
+    Tests the content-hash result cache and how predict_batch uses it to
+    skip inference for texts that were already scored.
+    """
+
+    def test_key_ignores_case_and_whitespace(self):
+        assert result_cache_key("v1", "Apple  beats\nestimates ") == result_cache_key(
+            "v1", "apple beats estimates"
+        )
+
+    def test_key_depends_on_model_version(self):
+        assert result_cache_key("v1", "same text") != result_cache_key("v2", "same text")
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = SentimentResultCache(max_size=2)
+        cache.set_many({"a": (0.5, "positive"), "b": (-0.5, "negative")})
+        cache.get_many(["a"])
+        cache.set_many({"c": (0.0, "neutral")})
+        assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+    def test_redis_tier_is_shared_between_caches(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        redis_client = fakeredis.FakeRedis()
+        SentimentResultCache(redis_client=redis_client).set_many({"k": (0.7, "positive")})
+        assert SentimentResultCache(redis_client=redis_client).get_many(["k"]) == {
+            "k": (0.7, "positive")
+        }
+
+    def test_predict_batch_scores_only_distinct_misses(self, monkeypatch):
+        analyzer = FinBERTBatchAnalyzer()
+        analyzer.model = analyzer.tokenizer = object()  # Pretend the model is loaded
+        analyzer.result_cache = SentimentResultCache()
+        scored_batches = []
+
+        def fake_predict(texts):
+            scored_batches.append(list(texts))
+            return [(0.5, "positive") for _ in texts]
+
+        monkeypatch.setattr(analyzer, "_predict_with_model", fake_predict)
+
+        story = "Reuters: Apple beats estimates"
+        assert len(analyzer.predict_batch([story, story.upper(), "Other story"])) == 3
+        assert analyzer.predict_batch([story, "Other story"]) == [(0.5, "positive")] * 2
+        assert scored_batches == [[story, "Other story"]]
+
+
+# --- Test Suite for cross-task micro-batching ---
+
+
+class TestMicroBatchBuffer:
+    """
+    Tests the Redis buffer that aggregates article IDs from small tasks.
+    """
+
+    @pytest.fixture()
+    def buffer(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        return MicroBatchBuffer(fakeredis.FakeRedis(), max_articles=4)
+
+    def test_first_add_opens_window(self, buffer):
+        assert buffer.add([1, 2]) is True
+        assert buffer.add([3]) is False
+        assert buffer.is_full() is False
+
+    def test_buffer_fills_across_tasks(self, buffer):
+        buffer.add([1, 2])
+        buffer.add([3, 4])
+        assert buffer.is_full() is True
+
+    def test_drain_takes_one_batch_and_reports_remaining(self, buffer):
+        buffer.add([1, 2, 3])
+        buffer.add([4, 5, 6])
+        article_ids, remaining = buffer.drain()
+        assert article_ids == [1, 2, 3, 4]
+        assert remaining == 2
+        # The window is closed, so the next add opens a new one
+        assert buffer.add([7]) is True
+
+    def test_drain_removes_duplicate_ids(self, buffer):
+        buffer.add([1, 2])
+        buffer.add([2, 1])
+        assert buffer.drain() == ([1, 2], 0)
+
+    def test_window_marker_expires(self, buffer):
+        """A lost delayed flush must not keep the window open for good."""
+        buffer.add([1])
+        ttl_ms = buffer.redis.pttl(buffer.window_key)
+        assert 0 < ttl_ms <= buffer.window_ttl_ms
+        assert buffer.window_ttl_ms >= buffer.max_wait_seconds * 1000
+
+        buffer.redis.delete(buffer.window_key)  # As if the marker expired
+        assert buffer.add([2]) is True
+
+    def test_unreachable_redis_disables_buffer(self, monkeypatch):
+        pytest.importorskip("redis")
+        monkeypatch.setattr(micro_batching, "MICRO_BATCH_ENABLED", True)
+        assert micro_batching.build_micro_batch_buffer("redis://127.0.0.1:1/0") is None
+
+    def test_sweep_drains_orphaned_buffer_and_stale_articles(self, buffer, monkeypatch):
+        """The periodic sweep scores what a lost flush or batch left behind."""
+        buffer.add([1, 2, 3])
+        buffer.add([4, 5])
+        scored, claims = [], []
+
+        def fake_score(article_ids):
+            scored.append(article_ids)
+            return {"status": "success", "processed": len(article_ids)}
+
+        def fake_claim(limit, created_before):
+            claims.append(created_before)
+            return {"status": "success", "processed": 1, "claimed": 1}
+
+        monkeypatch.setattr(worker, "micro_batch_buffer", buffer)
+        monkeypatch.setattr(worker, "score_article_batch", fake_score)
+        monkeypatch.setattr(worker, "claim_and_score_batch", fake_claim)
+
+        result = worker.sweep_sentiment_buffer()
+
+        assert scored == [[1, 2, 3, 4], [5]]
+        assert len(claims) == 1
+        assert result == {"status": "success", "processed": 6}
+        assert buffer.drain() == ([], 0)
+
+
+# --- Test Suite for push-mode batch scoring ---
+
+
+class TestScoreArticleBatch:
+    """
+    Tests that a failed batch only flags the articles the task had locked.
+    """
+
+    def test_failure_flags_only_fetched_articles(
+        self, db_session, db_session_factory, monkeypatch
+    ):
+        """An article another task already scored keeps its state."""
+        published_at = datetime(2024, 5, 2, 9, tzinfo=timezone.utc)
+        pending, processed = (
+            RawArticle(
+                source="test",
+                article_url=f"https://test.com/failed-batch/{uuid4()}",
+                headline="Headline",
+                article_text="Text",
+                published_at=published_at,
+                is_processed=is_processed,
+            )
+            for is_processed in (False, True)
+        )
+        db_session.add_all([pending, processed])
+        db_session.commit()
+
+        def fail(session, articles):
+            raise RuntimeError("model crashed")
+
+        monkeypatch.setattr(worker, "create_db_session", db_session_factory)
+        monkeypatch.setattr(worker, "_score_and_save", fail)
+
+        result = worker.score_article_batch([pending.id, processed.id])
+        db_session.expire_all()
+
+        assert result["status"] == "error"
+        assert result["article_ids"] == [pending.id]
+        assert pending.has_error is True
+        assert processed.has_error is False
+
+
+# --- Test Suite for bulk score persistence ---
+
+
+class TestSaveSentimentScores:
+    """
+    Tests the set-based score writer: the executemany path on SQLite and the
+    shape of the single-statement CTE used on PostgreSQL.
+    """
+
+    @pytest.fixture()
+    def articles(self, db_session):
+        """Creates four unprocessed articles with unique URLs."""
+        published_at = datetime(2024, 5, 1, 9, tzinfo=timezone.utc)
+        articles = [
+            RawArticle(
+                source="test",
+                article_url=f"https://test.com/persist/{uuid4()}",
+                headline="Headline",
+                article_text="Text",
+                published_at=published_at,
+            )
+            for _ in range(4)
+        ]
+        db_session.add_all(articles)
+        db_session.flush()
+        return articles
+
+    @staticmethod
+    def score_rows(articles):
+        return [
+            {
+                "article_id": article.id,
+                "published_at": article.published_at,
+                "model_version": "test-v1",
+                "sentiment_score": 0.5,
+                "sentiment_label": "positive",
+            }
+            for article in articles
+        ]
+
+    @staticmethod
+    def processed_counter(session) -> int:
+        value = session.scalar(
+            select(SystemCounter.value).where(SystemCounter.name == PROCESSED_ARTICLES)
+        )
+        return value or 0
+
+    def test_inserts_scores_across_chunks_and_flags_only_scored(
+        self, db_session, articles, monkeypatch
+    ):
+        """Three rows with a chunk size of two take two chunks; the fourth stays."""
+        monkeypatch.setattr(persistence, "INSERT_CHUNK_SIZE", 2)
+        scored, unscored = articles[:3], articles[3]
+        counter_before = self.processed_counter(db_session)
+
+        written = persistence.save_sentiment_scores(db_session, self.score_rows(scored))
+        db_session.expire_all()
+
+        assert written == 3
+        score_ids = db_session.scalars(
+            select(SentimentScore.article_id).where(
+                SentimentScore.article_id.in_([a.id for a in articles])
+            )
+        ).all()
+        assert sorted(score_ids) == sorted(a.id for a in scored)
+        assert all(article.is_processed for article in scored)
+        assert unscored.is_processed is False
+        assert self.processed_counter(db_session) == counter_before + 3
+
+    def test_empty_input_writes_nothing(self, db_session):
+        counter_before = self.processed_counter(db_session)
+
+        assert persistence.save_sentiment_scores(db_session, []) == 0
+        assert self.processed_counter(db_session) == counter_before
+
+    def test_postgresql_uses_one_cte_statement_per_chunk(self, monkeypatch):
+        """Scores are inserted and their articles flagged by a single statement."""
+        monkeypatch.setattr(persistence, "INSERT_CHUNK_SIZE", 2)
+        statements = []
+
+        class RecordingSession:
+            def get_bind(self):
+                return SimpleNamespace(dialect=postgresql.dialect())
+
+            def execute(self, statement, params=None):
+                statements.append(statement)
+                return SimpleNamespace(rowcount=2)
+
+        rows = self.score_rows(
+            SimpleNamespace(id=i, published_at=datetime(2024, 5, 1)) for i in range(3)
+        )
+        persistence.save_sentiment_scores(RecordingSession(), rows)
+
+        chunk_statements = statements[:2]  # The last one bumps the counter
+        assert len(statements) == 3
+        for statement in chunk_statements:
+            sql = " ".join(str(statement.compile(dialect=postgresql.dialect())).split())
+            assert sql.startswith("WITH inserted_scores AS (INSERT INTO sentiment_scores")
+            assert "RETURNING sentiment_scores.article_id)" in sql
+            assert "UPDATE raw_articles SET is_processed=" in sql
+            assert (
+                "WHERE raw_articles.id IN (SELECT inserted_scores.article_id "
+                "FROM inserted_scores) AND raw_articles.is_processed IS false"
+            ) in sql
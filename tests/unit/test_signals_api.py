@@ -0,0 +1,208 @@
+"""Unit tests for the Signals API helpers."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import fakeredis
+import pytest
+
+from services.signals_api.app.aggregation import apply_decay
+from services.signals_api.app.auth_cache import (
+    AuthCache,
+    authenticated_entry,
+    rejected_entry,
+)
+from services.signals_api.app.columnar import negotiate_format
+from services.signals_api.app.pagination import decode_cursor, encode_cursor
+
+# --- Test Suite for AuthCache ---
+
+
+class TestAuthCache:
+    """
+    Tests the TTL cache of API key authentication results,
+    including negative caching, key expiry and invalidation.
+    """
+
+    def test_authenticated_entry_is_cached(self):
+        """Tests that a valid key is served from the cache."""
+        cache = AuthCache()
+        cache.set("hash-1", authenticated_entry(1, "user@example.com"))
+
+        entry = cache.get("hash-1")
+        assert entry["user_id"] == 1
+        assert entry["email"] == "user@example.com"
+        assert entry["error"] is None
+
+    def test_rejected_entry_is_cached(self):
+        """Tests that invalid keys are cached with their rejection reason."""
+        cache = AuthCache()
+        cache.set("bad-hash", rejected_entry("Invalid or expired API key"))
+
+        assert cache.get("bad-hash")["error"] == "Invalid or expired API key"
+
+    def test_entry_never_outlives_key_expiry(self):
+        """Tests that a cached key stops being served once the key expires."""
+        cache = AuthCache()
+        entry = authenticated_entry(
+            1, "user@example.com", key_expires_at=time.time() + 0.05
+        )
+        cache.set("hash-1", entry)
+
+        assert cache.get("hash-1") is not None
+        time.sleep(0.1)
+        assert cache.get("hash-1") is None
+
+    def test_already_expired_entry_is_not_stored(self):
+        """Tests that entries whose validity already ended are ignored."""
+        cache = AuthCache()
+        cache.set(
+            "hash-1", authenticated_entry(1, "a@b.c", key_expires_at=time.time() - 1)
+        )
+
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """Tests that the least recently used entry is evicted first."""
+        cache = AuthCache(max_size=2)
+        cache.set("a", authenticated_entry(1, "a@example.com"))
+        cache.set("b", authenticated_entry(2, "b@example.com"))
+        cache.get("a")
+        cache.set("c", authenticated_entry(3, "c@example.com"))
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+    @pytest.fixture()
+    def redis_client(self):
+        """Returns an in-memory Redis client."""
+        return fakeredis.FakeRedis()
+
+    def test_redis_tier_is_shared_and_invalidated(self, redis_client):
+        """Tests that replicas share entries and invalidation clears Redis."""
+        replica_a = AuthCache(redis_client=redis_client)
+        replica_b = AuthCache(redis_client=redis_client)
+        replica_a.set("hash-1", authenticated_entry(1, "user@example.com"))
+
+        assert replica_b.get("hash-1")["user_id"] == 1
+
+        replica_a.invalidate("hash-1")
+        assert replica_a.get("hash-1") is None
+        assert AuthCache(redis_client=redis_client).get("hash-1") is None
+
+    def test_async_access_runs_redis_off_the_event_loop(self, redis_client):
+        """Tests that aget/aset call Redis from a worker thread, not the loop."""
+        redis_threads = []
+
+        class RecordingRedis:
+            def get(self, key):
+                redis_threads.append(threading.get_ident())
+                return redis_client.get(key)
+
+            def setex(self, key, ttl, value):
+                redis_threads.append(threading.get_ident())
+                return redis_client.setex(key, ttl, value)
+
+        async def authenticate():
+            writer = AuthCache(redis_client=RecordingRedis())
+            await writer.aset("hash-1", authenticated_entry(1, "user@example.com"))
+            reader = AuthCache(redis_client=RecordingRedis())
+            return threading.get_ident(), await reader.aget("hash-1")
+
+        loop_thread, entry = asyncio.run(authenticate())
+
+        assert entry["user_id"] == 1
+        assert len(redis_threads) == 2
+        assert loop_thread not in redis_threads
+
+
+# --- Test Suite for Keyset Pagination Cursors ---
+
+
+class TestPaginationCursor:
+    """
+    Tests encoding and decoding of the opaque (published_at, id, ticker) cursors.
+    """
+
+    def test_cursor_round_trip(self):
+        """Tests that a cursor decodes to the sort key it was built from."""
+        published_at = datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+        cursor = encode_cursor(published_at, 42, "AAPL")
+
+        assert decode_cursor(cursor) == (published_at, 42, "AAPL")
+
+    @pytest.mark.parametrize(
+        "cursor",
+        # The last one holds no ticker
+        ["not-a-cursor", "", "W10", "e30", "WyIyMDI0LTAxLTE1VDEwOjMwOjAwIiw0Ml0"],
+    )
+    def test_invalid_cursor_raises(self, cursor):
+        """Tests that malformed cursors raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor)
+
+
+# --- Test Suite for Response Format Negotiation ---
+
+
+class TestNegotiateFormat:
+    """
+    Tests that the Accept header selects the columnar response formats.
+    """
+
+    @pytest.mark.parametrize(
+        ("accept", "expected_format"),
+        [
+            (None, "json"),
+            ("*/*", "json"),
+            ("application/json", "json"),
+            ("application/vnd.apache.arrow.stream", "arrow"),
+            ("application/vnd.apache.parquet", "parquet"),
+            ("application/x-parquet;q=0.9, application/json", "parquet"),
+            ("application/json, application/vnd.apache.arrow.stream", "arrow"),
+        ],
+    )
+    def test_negotiate_format(self, accept, expected_format):
+        """Tests the format chosen for common Accept headers."""
+        assert negotiate_format(accept) == expected_format
+
+
+# --- Test Suite for Sentiment Aggregation ---
+
+
+class TestApplyDecay:
+    """
+    Tests the exponentially decayed score added to aggregated buckets.
+    """
+
+    @staticmethod
+    def _buckets(offsets_and_means):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        return [
+            {"bucket_start": start + timedelta(hours=offset), "mean_score": mean}
+            for offset, mean in offsets_and_means
+        ]
+
+    def test_first_bucket_starts_at_its_mean(self):
+        """Tests that the decayed score is seeded with the first bucket mean."""
+        buckets = self._buckets([(0, 0.6)])
+        apply_decay(buckets, 3600, half_life=2.0)
+
+        assert buckets[0]["decayed_score"] == pytest.approx(0.6)
+
+    def test_half_life_weights_previous_value(self):
+        """Tests that after one half-life the old value keeps half its weight."""
+        buckets = self._buckets([(0, 1.0), (1, 0.0)])
+        apply_decay(buckets, 3600, half_life=1.0)
+
+        assert buckets[1]["decayed_score"] == pytest.approx(0.5)
+
+    def test_empty_buckets_count_as_elapsed_time(self):
+        """Tests that gaps between buckets decay the old value further."""
+        buckets = self._buckets([(0, 1.0), (3, 0.0)])
+        apply_decay(buckets, 3600, half_life=1.0)
+
+        assert buckets[1]["decayed_score"] == pytest.approx(0.125)